@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Blueprint Payload Codec Benchmark
+
+Stores the same blueprints in fresh SQLite databases with each payload codec
+and reports database size, save latency and get_blueprint latency, so the
+codec settings can be compared before and after compression.
+
+Usage:
+    python benchmark_blueprint_payloads.py --count 300
+    python benchmark_blueprint_payloads.py --source-url sqlite:///serp_strategist.db
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from sqlalchemy.orm import undefer_group
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from src.models.blueprint import Blueprint, DatabaseManager
+from src.services.blueprint_storage import BlueprintStorageService
+from src.utils.payload_codec import PayloadCodec, train_dictionary, zstd_available
+
+WORDS = ('content marketing strategy seo keyword search intent backlink audit guide tutorial '
+         'best tools pricing comparison examples checklist template analytics conversion ranking').split()
+
+
+def synthetic_blueprint(index):
+    """Build a blueprint shaped like generator output, with entity lists and per-competitor metrics."""
+    rng = random.Random(index)
+    phrase = lambda n: ' '.join(rng.choice(WORDS) for _ in range(n))
+    competitors = [{
+        'url': f"https://site{rng.randint(1, 500)}.com/{phrase(3).replace(' ', '-')}",
+        'title': phrase(8).title(),
+        'position': position,
+        'word_count': rng.randint(800, 4000),
+        'readability_score': round(rng.uniform(30, 80), 2),
+        'headings': {'h2': [phrase(5).title() for _ in range(8)], 'h3': [phrase(6) for _ in range(12)]},
+        'entities': [{'name': phrase(2), 'type': rng.choice(['ORG', 'PRODUCT', 'CONCEPT']),
+                      'salience': round(rng.random(), 4)} for _ in range(40)],
+        'keywords': [{'keyword': phrase(2), 'count': rng.randint(1, 30)} for _ in range(25)]
+    } for position in range(1, 11)]
+    return {
+        'keyword': f"{phrase(3)} {index}",
+        'competitor_analysis': {'top_competitors': competitors, 'insights': {'common_topics': [phrase(3) for _ in range(20)]}},
+        'heading_structure': {'h1': phrase(6).title(), 'h2_sections': [
+            {'title': phrase(5).title(), 'h3_subsections': [phrase(6) for _ in range(4)]} for _ in range(8)]},
+        'topic_clusters': {'primary_cluster': [phrase(2) for _ in range(10)],
+                           'secondary_clusters': {phrase(1): [phrase(2) for _ in range(6)] for _ in range(5)}},
+        'serp_features': {'featured_snippet': {'present': True, 'type': 'paragraph'},
+                          'people_also_ask': [phrase(8) + '?' for _ in range(6)]},
+        'content_insights': {'avg_word_count': 2200, 'recommendations': [phrase(12) for _ in range(10)]},
+        'generation_metadata': {'generation_time': rng.randint(10, 60)}
+    }
+
+
+def source_blueprints(url, count):
+    """Load up to count stored blueprints (decoded) from an existing database."""
+    db_manager = DatabaseManager(url)
+    session = db_manager.get_session()
+    reader = PayloadCodec('none')
+    try:
+        rows = session.query(Blueprint).options(undefer_group('payload')).limit(count).all()
+        blueprints = []
+        for row in rows:
+            data = {field: reader.decode(getattr(row, field)) for field in Blueprint.PAYLOAD_FIELDS}
+            data['keyword'] = row.keyword
+            data['generation_metadata'] = {'generation_time': row.generation_time}
+            blueprints.append(data)
+        return blueprints
+    finally:
+        session.close()
+        db_manager.close_engine()
+
+
+def percentile(samples, pct):
+    """Percentile of a list of latencies, in milliseconds."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+
+def run_codec(name, codec, blueprints, reads):
+    """Store the blueprints with one codec and time writes and reads."""
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    db_manager = DatabaseManager(f"sqlite:///{path}")
+    db_manager.init_tables()
+    session = db_manager.get_session()
+    try:
+        storage = BlueprintStorageService(session, codec=codec)
+        ids, writes = [], []
+        for blueprint in blueprints:
+            start = time.perf_counter()
+            ids.append(storage.save_blueprint(blueprint, 'bench-user'))
+            writes.append(time.perf_counter() - start)
+
+        read_times = []
+        for _ in range(reads):
+            blueprint_id = random.choice(ids)
+            session.expire_all()
+            start = time.perf_counter()
+            storage.get_blueprint(blueprint_id, 'bench-user')
+            read_times.append(time.perf_counter() - start)
+
+        session.close()
+        db_manager.close_engine()
+        size = os.path.getsize(path)
+        return {
+            'codec': name,
+            'size_kb': size / 1024,
+            'write_ms': statistics.mean(writes) * 1000,
+            'read_p50_ms': percentile(read_times, 0.5),
+            'read_p95_ms': percentile(read_times, 0.95)
+        }
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark blueprint payload codecs')
+    parser.add_argument('--count', type=int, default=200, help='Blueprints to store per codec')
+    parser.add_argument('--reads', type=int, default=500, help='get_blueprint calls per codec')
+    parser.add_argument('--source-url', help='Sample real blueprints from this database instead of synthetic ones')
+    args = parser.parse_args()
+
+    blueprints = source_blueprints(args.source_url, args.count) if args.source_url else \
+        [synthetic_blueprint(i) for i in range(args.count)]
+    if not blueprints:
+        print("❌ No blueprints to benchmark")
+        return
+
+    codecs = [('none', PayloadCodec('none')), ('gzip', PayloadCodec('gzip'))]
+    if zstd_available():
+        codecs.append(('zstd', PayloadCodec('zstd')))
+        samples = [bp.get(field) for bp in blueprints for field in Blueprint.PAYLOAD_FIELDS]
+        try:
+            codecs.append(('zstd+dict', PayloadCodec('zstd', dictionary=train_dictionary(samples))))
+        except Exception as e:
+            print(f"⚠️ Skipping zstd dictionary: {str(e)}")
+    else:
+        print("⚠️ zstandard not installed, skipping zstd codecs")
+
+    print(f"📊 {len(blueprints)} blueprints, {args.reads} reads per codec")
+    print(f"{'codec':<10} {'db size (KB)':>13} {'ratio':>7} {'save (ms)':>10} {'get p50 (ms)':>13} {'get p95 (ms)':>13}")
+    baseline = None
+    for name, codec in codecs:
+        result = run_codec(name, codec, blueprints, args.reads)
+        baseline = baseline or result['size_kb']
+        print(f"{result['codec']:<10} {result['size_kb']:>13.1f} {baseline / result['size_kb']:>6.2f}x "
+              f"{result['write_ms']:>10.2f} {result['read_p50_ms']:>13.2f} {result['read_p95_ms']:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
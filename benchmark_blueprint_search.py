@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Blueprint Search Benchmark
+
+Fills a fresh SQLite database with synthetic blueprints and compares the
+keyword LIKE scan that search_blueprints used to run with the full-text
+index, reporting index build time and per-query latency.
+
+Usage:
+    python benchmark_blueprint_search.py --count 100000
+"""
+
+import os
+import sys
+import time
+import random
+import itertools
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from src.models.blueprint import Blueprint, DatabaseManager
+from src.services.blueprint_storage import BlueprintStorageService
+from src.services.blueprint_search import build_search_index
+from src.utils.payload_codec import PayloadCodec
+
+TOPIC_WORDS = ('content marketing strategy seo keyword search intent backlink audit guide tutorial best tools '
+               'pricing comparison examples checklist template analytics conversion ranking local ecommerce '
+               'email social video podcast newsletter outreach schema crawl speed mobile voice b2b saas').split()
+
+QUERIES = ['email', 'crawl budget', 'saas pricing', 'local seo tools', 'podcast', 'zzz no match']
+
+
+def vocabulary(rng, size=20000):
+    """Pseudo-words plus topic words, sampled with Zipf-like frequencies like real text."""
+    syllables = ['ka', 'lo', 'mi', 'ne', 'ru', 'ta', 'vo', 'shi', 'den', 'mar', 'pex', 'qua', 'ber', 'tor']
+    pseudo = set()
+    while len(pseudo) < size:
+        pseudo.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    pseudo = sorted(pseudo)
+    rng.shuffle(pseudo)
+    # Topic words are fairly common, but far from the most frequent terms
+    words = pseudo[:200] + list(TOPIC_WORDS) + ['budget'] + pseudo[200:]
+    return words, list(itertools.accumulate(1.0 / (rank + 20) for rank in range(len(words))))
+
+
+def synthetic_rows(count, users):
+    """Yield blueprint rows with headings and topic clusters."""
+    rng = random.Random(42)
+    words, cum_weights = vocabulary(rng)
+    phrase = lambda n: ' '.join(rng.choices(words, cum_weights=cum_weights, k=n))
+    start = datetime(2024, 1, 1)
+    for index in range(count):
+        keyword = phrase(rng.randint(2, 3))
+        yield {
+            'id': f"{index:08d}-0000-4000-8000-000000000000",
+            'keyword': keyword,
+            'user_id': f"user-{index % users}",
+            'status': 'completed',
+            'created_at': start + timedelta(minutes=index),
+            'heading_structure': {
+                'h1': f"Complete Guide to {keyword.title()}",
+                'h2_sections': [{'title': phrase(4).title(), 'h3_subsections': []} for _ in range(5)]
+            },
+            'topic_clusters': {
+                'primary_cluster': [keyword, phrase(3)],
+                'secondary_clusters': {phrase(1): [] for _ in range(3)}
+            }
+        }
+
+
+def timed(fn, repeat):
+    """Run fn repeat times, returning latencies in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark blueprint search')
+    parser.add_argument('--count', type=int, default=100000, help='Blueprints to generate')
+    parser.add_argument('--users', type=int, default=1, help='Users owning the blueprints (1 = one heavy user)')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per query')
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    db_manager = DatabaseManager(f"sqlite:///{path}")
+    try:
+        db_manager.init_tables()
+        print(f"📦 Inserting {args.count} blueprints...")
+        rows = list(synthetic_rows(args.count, args.users))
+        with db_manager.engine.begin() as connection:
+            for offset in range(0, len(rows), 5000):
+                connection.execute(Blueprint.__table__.insert(), rows[offset:offset + 5000])
+
+        start = time.perf_counter()
+        if not build_search_index(db_manager.engine, codec=PayloadCodec('none')):
+            print("❌ Full-text search is not available in this SQLite build")
+            return
+        print(f"🔨 Search index built in {time.perf_counter() - start:.1f}s")
+        session = db_manager.get_session()
+        storage = BlueprintStorageService(session, codec=PayloadCodec('none'))
+
+        print(f"{'query':<18} {'LIKE p50 (ms)':>14} {'LIKE hits':>10} {'FTS p50 (ms)':>13} {'FTS p95 (ms)':>13} {'FTS hits':>9}")
+        for query in QUERIES:
+            like = lambda: storage._summary_query('user-0').filter(
+                Blueprint.keyword.contains(query)
+            ).order_by(Blueprint.created_at.desc()).limit(10).all()
+            like_times = timed(like, args.repeat)
+            fts_times = timed(lambda: storage.search_blueprints('user-0', query, 10), args.repeat)
+            print(f"{query:<18} {statistics.median(like_times):>14.2f} {len(like()):>10} "
+                  f"{statistics.median(fts_times):>13.2f} {sorted(fts_times)[int(len(fts_times) * 0.95) - 1]:>13.2f} "
+                  f"{len(storage.search_blueprints('user-0', query, 10)):>9}")
+        session.close()
+    finally:
+        db_manager.close_engine()
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
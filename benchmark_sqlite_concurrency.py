@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+SQLite Concurrency Benchmark
+
+Runs writer threads (blueprint status changes plus API usage counters, as
+job workers and rate-limited routes produce them) alongside reader threads
+(blueprint listings and stats) against fresh SQLite files (blueprints and
+users, as separate databases like in the app), and reports throughput and
+lock errors for:
+
+  baseline      SQLite defaults (rollback journal, synchronous=FULL), one commit per write
+  profile       WAL and the tuned pragmas from create_database_engine, one commit per write
+  write-behind  the tuned profile with writes batched by WriteBehindQueue
+
+Usage:
+    python benchmark_sqlite_concurrency.py --writers 8 --readers 8 --duration 10
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+from threading import Event, Lock, Thread
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from sqlalchemy import update
+
+from src.models.blueprint import DatabaseManager
+from src.models.user import User
+from src.services.blueprint_storage import BlueprintStorageService
+from src.services.write_behind import WriteBehindQueue
+from src.utils.payload_codec import PayloadCodec
+
+SCENARIOS = ('baseline', 'profile', 'write-behind')
+STATUSES = ('generating', 'completed', 'failed')
+
+
+class Counters:
+    """Thread-safe operation and error counters."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.values = {'writes': 0, 'reads': 0, 'errors': 0}
+
+    def add(self, name, amount=1):
+        with self.lock:
+            self.values[name] += amount
+
+
+def seed(db_manager, users_manager, users, blueprints_per_user):
+    """Create the tables, users and blueprints a scenario works on."""
+    db_manager.init_tables()
+    User.__table__.create(bind=users_manager.engine)
+    users_session = users_manager.get_session()
+    users_session.execute(User.__table__.insert(), [
+        {'id': index, 'username': f"user{index}", 'email': f"user{index}@example.com", 'password_hash': 'x',
+         'is_active': True, 'is_verified': True, 'subscription_tier': 'pro',
+         'api_calls_used': 0, 'api_calls_limit': 10 ** 9}
+        for index in range(users)
+    ])
+    users_session.commit()
+    users_session.close()
+    session = db_manager.get_session()
+    storage = BlueprintStorageService(session, codec=PayloadCodec('none'))
+    ids = {}
+    for index in range(users):
+        keywords = [f"keyword {index} {n}" for n in range(blueprints_per_user)]
+        ids[index] = storage.create_pending_blueprints(keywords, f"user-{index}")
+    session.close()
+    return ids
+
+
+def writer(db_manager, users_manager, ids, queue, counters, stop, seed_value, think):
+    """Change a blueprint status and count an API call, like a job worker plus a limited route."""
+    rng = random.Random(seed_value)
+    session = db_manager.get_session()
+    users_session = users_manager.get_session()
+    storage = BlueprintStorageService(session, codec=PayloadCodec('none'))
+    users = User.__table__
+    while not stop.is_set():
+        time.sleep(think)  # The request or job work around each write
+        user = rng.randrange(len(ids))
+        blueprint_id, status = rng.choice(ids[user]), rng.choice(STATUSES)
+        if queue:
+            queue.update_blueprint_status(blueprint_id, f"user-{user}", status)
+            queue.increment_api_usage(user)
+            counters.add('writes')
+            continue
+        try:
+            ok = storage.update_blueprint_status(blueprint_id, f"user-{user}", status)
+            users_session.execute(
+                update(users).where(users.c.id == user).values(api_calls_used=users.c.api_calls_used + 1)
+            )
+            users_session.commit()
+            counters.add('writes' if ok else 'errors')
+        except Exception:
+            session.rollback()
+            users_session.rollback()
+            counters.add('errors')
+    session.close()
+    users_session.close()
+
+
+def reader(db_manager, users, counters, stop, seed_value):
+    """List a user's latest blueprints and read their stats, like the dashboard."""
+    rng = random.Random(seed_value)
+    session = db_manager.get_session()
+    storage = BlueprintStorageService(session, codec=PayloadCodec('none'))
+    while not stop.is_set():
+        user_id = f"user-{rng.randrange(users)}"
+        try:
+            storage.list_user_blueprints_page(user_id, limit=20)
+            storage.get_user_stats(user_id)
+            session.rollback()  # End the read transaction, as request teardown would
+            counters.add('reads')
+        except Exception:
+            session.rollback()
+            counters.add('errors')
+    session.close()
+
+
+def run_scenario(name, args):
+    """Run one scenario on fresh database files and return its results."""
+    os.environ['SQLITE_PERFORMANCE_PROFILE'] = 'false' if name == 'baseline' else 'true'
+    directory = tempfile.mkdtemp()
+    paths = [os.path.join(directory, 'bench.db'), os.path.join(directory, 'users.db')]
+    db_manager, users_manager = (DatabaseManager(f"sqlite:///{path}") for path in paths)
+    queue = None
+    try:
+        ids = seed(db_manager, users_manager, args.users, args.blueprints)
+        if name == 'write-behind':
+            queue = WriteBehindQueue(db_manager.get_session, users_manager.get_session)
+
+        counters, stop = Counters(), Event()
+        threads = [Thread(target=writer, args=(db_manager, users_manager, ids, queue, counters, stop, n,
+                                               args.think_ms / 1000))
+                   for n in range(args.writers)]
+        threads += [Thread(target=reader, args=(db_manager, args.users, counters, stop, 1000 + n))
+                    for n in range(args.readers)]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        if queue:
+            # Only count writes once they are committed
+            queue.close()
+        elapsed = time.perf_counter() - start
+
+        return {name: value / elapsed for name, value in counters.values.items()} | {
+            'errors': counters.values['errors']
+        }
+    finally:
+        db_manager.close_engine()
+        users_manager.close_engine()
+        for path in paths:
+            for suffix in ('', '-wal', '-shm', '-journal'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        os.rmdir(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent SQLite reads and writes')
+    parser.add_argument('--writers', type=int, default=8, help='Writer threads')
+    parser.add_argument('--readers', type=int, default=8, help='Reader threads')
+    parser.add_argument('--users', type=int, default=50, help='Users owning blueprints')
+    parser.add_argument('--blueprints', type=int, default=200, help='Blueprints per user')
+    parser.add_argument('--think-ms', type=float, default=1.0, help='Work each writer does between writes')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per scenario')
+    parser.add_argument('--scenario', choices=SCENARIOS, action='append', help='Scenario to run (default: all)')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # Per-write log lines would dominate the timings
+
+    print(f"⚙️  {args.writers} writers, {args.readers} readers, {args.users} users x {args.blueprints} blueprints, "
+          f"{args.duration:.0f}s per scenario")
+    print(f"{'scenario':<14} {'writes/s':>10} {'reads/s':>10} {'errors':>8}")
+    for name in args.scenario or SCENARIOS:
+        result = run_scenario(name, args)
+        print(f"{name:<14} {result['writes']:>10.0f} {result['reads']:>10.0f} {result['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
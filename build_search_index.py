@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Blueprint Search Index Builder
+
+Creates the full-text search tables (see migrations/003_blueprint_search.sql)
+and indexes every blueprint that is missing from them. Batches commit as
+they go, so an interrupted run resumes where it stopped and re-running is
+safe. The application runs the same step at startup; run this after
+restoring a database or to rebuild the index after changing what is indexed.
+
+Usage:
+    python build_search_index.py
+    python build_search_index.py --rebuild
+"""
+
+import os
+import sys
+import time
+import argparse
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from src.models.blueprint import DatabaseManager
+from src.services.blueprint_search import build_search_index
+
+# Load environment variables
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the blueprint full-text search index')
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL', 'sqlite:///serp_strategist.db'))
+    parser.add_argument('--rebuild', action='store_true', help='Drop and re-index every blueprint')
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(args.database_url)
+    try:
+        db_manager.init_tables()
+        print(f"🔄 {'Rebuilding' if args.rebuild else 'Building'} blueprint search index")
+        start = time.perf_counter()
+        if not build_search_index(db_manager.engine, rebuild=args.rebuild):
+            print("❌ Search index not available (unsupported database or build failed, see log)")
+            sys.exit(1)
+        print(f"✅ Search index ready in {time.perf_counter() - start:.1f}s")
+    finally:
+        db_manager.close_engine()
+
+
+if __name__ == '__main__':
+    main()
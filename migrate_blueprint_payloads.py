@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Blueprint Payload Migration
+
+Re-encodes the stored payload sections of existing blueprints with the
+configured payload codec (see src/utils/payload_codec.py). Rows are
+processed in batches and only rewritten when their encoding changes, so the
+tool can be re-run safely; migrating to 'none' decodes everything back to
+plain JSON.
+
+Rows are only written with a zstd dictionary that BLUEPRINT_PAYLOAD_DICTIONARY
+also points at, since the application could not read them otherwise. To move
+to a new dictionary, train it, configure it (and restart the app), then
+migrate:
+
+Usage:
+    python migrate_blueprint_payloads.py --codec zstd --train-dictionary blueprint_payloads.dict
+    BLUEPRINT_PAYLOAD_DICTIONARY=blueprint_payloads.dict python migrate_blueprint_payloads.py --codec zstd
+    python migrate_blueprint_payloads.py --codec gzip --vacuum
+    python migrate_blueprint_payloads.py --codec none --dry-run
+"""
+
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+from sqlalchemy.orm import undefer_group
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from src.models.blueprint import Blueprint, DatabaseManager
+from src.utils.payload_codec import PayloadCodec, train_dictionary
+
+# Load environment variables
+load_dotenv()
+
+
+def iter_batches(session, batch_size):
+    """Yield blueprints with their payloads loaded, in id order."""
+    last_id = ''
+    while True:
+        batch = session.query(Blueprint).options(undefer_group('payload')).filter(
+            Blueprint.id > last_id
+        ).order_by(Blueprint.id).limit(batch_size).all()
+        if not batch:
+            return
+        last_id = batch[-1].id
+        yield batch
+
+
+def load_dictionary(args, session, reader):
+    """Read, or train and save, the zstd dictionary."""
+    if args.train_dictionary:
+        samples = []
+        for batch in iter_batches(session, args.batch_size):
+            for blueprint in batch:
+                samples.extend(reader.decode(getattr(blueprint, field)) for field in Blueprint.PAYLOAD_FIELDS)
+            session.expunge_all()
+            if len(samples) >= args.sample_limit:
+                break
+        dictionary = train_dictionary(samples[:args.sample_limit])
+        with open(args.train_dictionary, 'wb') as f:
+            f.write(dictionary)
+        print(f"📚 Trained {len(dictionary)}-byte dictionary on {len(samples[:args.sample_limit])} sections "
+              f"-> {args.train_dictionary} (set BLUEPRINT_PAYLOAD_DICTIONARY to use it)")
+        return dictionary
+
+    if args.dictionary:
+        with open(args.dictionary, 'rb') as f:
+            return f.read()
+    return None
+
+
+def migrate(args):
+    """Re-encode every blueprint payload with the target codec."""
+    db_manager = DatabaseManager(args.database_url)
+    session = db_manager.get_session()
+
+    # Existing rows may use the current dictionary, so decode with it as well
+    current_dictionary = None
+    if os.getenv('BLUEPRINT_PAYLOAD_DICTIONARY'):
+        with open(os.getenv('BLUEPRINT_PAYLOAD_DICTIONARY'), 'rb') as f:
+            current_dictionary = f.read()
+    reader = PayloadCodec('none', dictionary=current_dictionary)
+
+    try:
+        dictionary = load_dictionary(args, session, reader) if args.codec == 'zstd' else None
+        if dictionary is not None and dictionary != current_dictionary and not args.dry_run:
+            if args.train_dictionary:
+                print("⏸️  Rows not re-encoded: configure the new dictionary (and restart the app), then re-run")
+                return
+            print("❌ Refusing to write rows the application cannot decode: BLUEPRINT_PAYLOAD_DICTIONARY "
+                  "does not point at this dictionary")
+            sys.exit(1)
+        writer = PayloadCodec(args.codec, level=args.level, dictionary=dictionary)
+        print(f"🔄 Re-encoding blueprint payloads as {writer.tag}{' (dry run)' if args.dry_run else ''}")
+
+        scanned = rewritten = 0
+        for batch in iter_batches(session, args.batch_size):
+            for blueprint in batch:
+                scanned += 1
+                changed = False
+                for field in Blueprint.PAYLOAD_FIELDS:
+                    stored = getattr(blueprint, field)
+                    encoded = writer.encode(reader.decode(stored))
+                    if encoded != stored:
+                        setattr(blueprint, field, encoded)
+                        changed = True
+                rewritten += changed
+
+            if args.dry_run:
+                session.rollback()
+            else:
+                session.commit()
+            session.expunge_all()
+            print(f"   {scanned} blueprints scanned, {rewritten} re-encoded")
+
+        print(f"✅ Done: {rewritten}/{scanned} blueprints re-encoded")
+
+        # SQLite keeps freed pages in the file until it is rebuilt
+        if args.vacuum and not args.dry_run and db_manager.engine.dialect.name == 'sqlite':
+            session.close()
+            with db_manager.engine.connect() as connection:
+                connection.exec_driver_sql('VACUUM')
+            print("🧹 Database file compacted")
+    finally:
+        session.close()
+        db_manager.close_engine()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Re-encode stored blueprint payloads')
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL', 'sqlite:///serp_strategist.db'))
+    parser.add_argument('--codec', default=os.getenv('BLUEPRINT_PAYLOAD_CODEC', 'none'),
+                        choices=['none', 'gzip', 'zstd'])
+    parser.add_argument('--level', type=int, default=None, help='Compression level')
+    parser.add_argument('--dictionary', default=os.getenv('BLUEPRINT_PAYLOAD_DICTIONARY'),
+                        help='Existing zstd dictionary to encode with')
+    parser.add_argument('--train-dictionary', metavar='PATH',
+                        help='Train a zstd dictionary on existing payloads and save it to PATH')
+    parser.add_argument('--sample-limit', type=int, default=5000, help='Sections used for dictionary training')
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--dry-run', action='store_true', help='Report without writing changes')
+    parser.add_argument('--vacuum', action='store_true', help='Compact a SQLite database file afterwards')
+    migrate(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
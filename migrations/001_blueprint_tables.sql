@@ -34,6 +34,8 @@ CREATE INDEX IF NOT EXISTS idx_blueprints_user_id ON blueprints(user_id);
 CREATE INDEX IF NOT EXISTS idx_blueprints_keyword ON blueprints(keyword);
 CREATE INDEX IF NOT EXISTS idx_blueprints_created_at ON blueprints(created_at);
 CREATE INDEX IF NOT EXISTS idx_blueprints_status ON blueprints(status);
+-- Per-user listing order (keyset pagination on created_at, id)
+CREATE INDEX IF NOT EXISTS idx_blueprints_user_created_id ON blueprints(user_id, created_at, id);
 CREATE INDEX IF NOT EXISTS idx_projects_user_id ON projects(user_id);
 
 -- Insert sample data for testing (optional)
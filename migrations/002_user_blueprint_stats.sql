@@ -0,0 +1,20 @@
+-- User Blueprint Stats Migration
+-- Per-user counters maintained incrementally by BlueprintStorageService
+
+CREATE TABLE IF NOT EXISTS user_blueprint_stats (
+    user_id VARCHAR(36) PRIMARY KEY,
+    total_blueprints INTEGER NOT NULL DEFAULT 0,
+    completed_blueprints INTEGER NOT NULL DEFAULT 0,
+    latest_blueprint_at TIMESTAMP NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Backfill from existing blueprints (rows missing later are rebuilt on first read)
+INSERT INTO user_blueprint_stats (user_id, total_blueprints, completed_blueprints, latest_blueprint_at)
+SELECT user_id,
+       COUNT(*),
+       SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+       MAX(created_at)
+FROM blueprints
+WHERE user_id NOT IN (SELECT user_id FROM user_blueprint_stats)
+GROUP BY user_id;
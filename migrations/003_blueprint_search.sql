@@ -0,0 +1,28 @@
+-- Blueprint Search Migration
+-- Full-text index over blueprint keywords, H1/H2 headings, cluster names and
+-- common topics. Documents are extracted from the (possibly compressed) payload
+-- columns, so the backfill cannot be plain SQL: after applying this file run
+--     python build_search_index.py
+-- to index existing blueprints. The application also runs it at startup
+-- (build_search_index in src/services/blueprint_search.py), indexing only
+-- blueprints that are still missing, and creates these tables if needed.
+
+-- SQLite (FTS5): docid maps each blueprint to its FTS rowid
+CREATE TABLE IF NOT EXISTS blueprint_search_docs (
+    docid INTEGER PRIMARY KEY AUTOINCREMENT,
+    blueprint_id VARCHAR(36) NOT NULL UNIQUE,
+    user_id VARCHAR(36) NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS blueprint_search USING fts5(
+    keyword, headings, topics, tokenize = 'porter unicode61'
+);
+
+-- PostgreSQL (tsvector): use instead of the SQLite statements above
+-- CREATE TABLE IF NOT EXISTS blueprint_search (
+--     blueprint_id VARCHAR(36) PRIMARY KEY,
+--     user_id VARCHAR(36) NOT NULL,
+--     document TSVECTOR NOT NULL
+-- );
+-- CREATE INDEX IF NOT EXISTS idx_blueprint_search_document ON blueprint_search USING GIN (document);
+-- CREATE INDEX IF NOT EXISTS idx_blueprint_search_user_id ON blueprint_search (user_id);
@@ -2,10 +2,13 @@
 import logging
 import json
 import os
+import sys
 from flask import Flask, request, jsonify, render_template
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # Utilities import as src.utils
+
 # Import enhanced modules
 from input_handler import InputHandler
 from serp_collector import SerpCollector
@@ -24,6 +24,9 @@ from .export_integration import ExportIntegration
 # Import new blueprint modules
 from .models.blueprint import DatabaseManager
 from .routes.blueprints import blueprint_routes
+from .services.blueprint_jobs import BlueprintJobManager
+from .services.blueprint_generator import get_blueprint_generator
+from .services.blueprint_search import build_search_index
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -50,12 +53,23 @@ def create_app():
     try:
         db_manager.init_tables()
         logger.info("Database tables initialized successfully")
+        build_search_index(db_manager.engine)
     except Exception as e:
         logger.error(f"Database initialization failed: {str(e)}")
     
     # Add database session to app context
     app.db_session = db_manager.get_session()
     
+    # Worker pool for async blueprint generation
+    app.config['BLUEPRINT_JOB_MANAGER'] = BlueprintJobManager(db_manager.get_session)
+    
+    # Shared blueprint generator (and its Gemini client) reused by every request and job
+    try:
+        app.config['BLUEPRINT_GENERATOR'] = get_blueprint_generator()
+    except Exception as e:
+        logger.warning(f"Blueprint generator not initialized: {str(e)}")
+        app.config['BLUEPRINT_GENERATOR'] = None
+    
     # Register blueprint routes
     app.register_blueprint(blueprint_routes)
     
@@ -5,13 +5,14 @@ This module provides competitor analysis functionality using real data sources
 instead of mock data, with Gemini API integration for content analysis.
 """
 
+import os
 import logging
 import re
 from typing import Dict, Any, List, Optional
 
-from utils.serpapi_client import SerpAPIClient
-from utils.browser_content_scraper import BrowserContentScraper
-from utils.gemini_nlp_client import GeminiNLPClient
+from src.utils.serpapi_client import SerpAPIClient
+from src.utils.browser_content_scraper import BrowserContentScraper
+from src.utils.gemini_nlp_client import GeminiNLPClient, get_gemini_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,19 +26,25 @@ class CompetitorAnalysisReal:
     instead of mock data, with Gemini API integration for content analysis.
     """
     
-    def __init__(self, serpapi_key: Optional[str] = None, gemini_api_key: Optional[str] = None):
+    def __init__(self, serpapi_key: Optional[str] = None, gemini_api_key: Optional[str] = None,
+                 max_concurrency: Optional[int] = None, nlp_client: Optional[GeminiNLPClient] = None):
         """
         Initialize the competitor analysis module.
         
         Args:
             serpapi_key: SerpAPI key for real data integration
             gemini_api_key: Gemini API key for content analysis
+            max_concurrency: Maximum number of competitors analyzed at once
+                (defaults to COMPETITOR_MAX_CONCURRENCY or 5; 1 disables concurrency)
+            nlp_client: Shared Gemini client (defaults to the registry's client for the key)
         """
         self.serp_client = SerpAPIClient(api_key=serpapi_key)
         self.content_scraper = BrowserContentScraper()
-        self.nlp_client = GeminiNLPClient(api_key=gemini_api_key)
+        self.nlp_client = nlp_client or get_gemini_client(gemini_api_key)
+        self.max_concurrency = max_concurrency or int(os.getenv('COMPETITOR_MAX_CONCURRENCY', 5))
     
-    def analyze_competitors(self, keyword: str, limit: int = 20, num_competitors: int = None) -> Dict[str, Any]:
+    def analyze_competitors(self, keyword: str, limit: int = 20, num_competitors: int = None,
+                            serp_snapshot=None, max_concurrency: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze competitors for a keyword.
         
@@ -45,6 +52,9 @@ class CompetitorAnalysisReal:
             keyword: Target keyword
             limit: Maximum number of competitors to analyze
             num_competitors: Alternative parameter name for limit (for compatibility)
+            serp_snapshot: Optional shared SerpSnapshot to read results from instead of
+                issuing a new SerpAPI request
+            max_concurrency: Override of the instance-level concurrency limit
             
         Returns:
             Dictionary containing competitor analysis
@@ -56,14 +66,13 @@ class CompetitorAnalysisReal:
             limit = num_competitors
         
         # Get competitors from SERP
-        competitors = self.serp_client.get_competitors(keyword, limit)
+        competitors = self.serp_client.get_competitors(keyword, limit, snapshot=serp_snapshot)
         logger.info(f"Found {len(competitors)} competitors for keyword: {keyword}")
         
         # Analyze each competitor
-        competitor_analysis = []
-        for competitor in competitors:
-            analysis = self._analyze_competitor(competitor, keyword)
-            competitor_analysis.append(analysis)
+        competitor_analysis = self._analyze_competitors_concurrently(
+            competitors, keyword, max_concurrency or self.max_concurrency
+        )
         
         # Generate insights
         insights = self._generate_insights(competitor_analysis, keyword)
@@ -77,13 +86,73 @@ class CompetitorAnalysisReal:
         
         return result
     
-    def _analyze_competitor(self, competitor: Dict[str, Any], keyword: str) -> Dict[str, Any]:
+    def _analyze_competitors_concurrently(self, competitors: List[Dict[str, Any]], keyword: str,
+                                          max_concurrency: int) -> List[Dict[str, Any]]:
+        """
+        Analyze competitors with concurrent scraping and batched NLP.
+        
+        Pages are scraped on a bounded thread pool (rate limited per domain
+        by the content scraper), then every usable page goes to Gemini in
+        as few batched requests as possible instead of one round-trip per
+        competitor. Results are returned in SERP position order.
+        
+        Args:
+            competitors: Competitor data in SERP order
+            keyword: Target keyword
+            max_concurrency: Maximum number of pages scraped at once
+            
+        Returns:
+            List of competitor analyses ordered by SERP position
+        """
+        if not competitors:
+            return []
+        
+        workers = max(1, min(max_concurrency, len(competitors)))
+        logger.info(f"Scraping {len(competitors)} competitors with {workers} workers")
+        
+        contents = self.content_scraper.scrape_many(
+            [competitor.get("url", "") for competitor in competitors], max_workers=workers
+        )
+        
+        # Analyze every usable page's content in batched NLP requests
+        usable = [index for index, content in enumerate(contents) if self._has_usable_content(content)]
+        content_analyses = {}
+        if usable:
+            try:
+                batch_results = self.nlp_client.analyze_content_batch(
+                    [contents[index]["main_content"] for index in usable]
+                )
+                content_analyses = dict(zip(usable, batch_results))
+            except Exception as nlp_error:
+                logger.warning(f"Batched NLP analysis failed for '{keyword}': {str(nlp_error)}")
+                content_analyses = {index: {"sentiment": {"score": 0}, "entities": []} for index in usable}
+        
+        competitor_analysis = [
+            self._analyze_competitor(competitor, keyword, content=contents[index],
+                                     content_analysis=content_analyses.get(index))
+            for index, competitor in enumerate(competitors)
+        ]
+        
+        # Results follow input order; sort defensively by SERP position
+        return sorted(competitor_analysis, key=lambda analysis: analysis.get("position") or 0)
+    
+    def _has_usable_content(self, content: Dict[str, Any]) -> bool:
+        """Whether a scrape result has enough main content to analyze."""
+        if content.get("failed", False) or content.get("error"):
+            return False
+        return len((content.get("main_content") or "").strip()) >= 100
+    
+    def _analyze_competitor(self, competitor: Dict[str, Any], keyword: str,
+                            content: Optional[Dict[str, Any]] = None,
+                            content_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Analyze a single competitor with robust error handling.
         
         Args:
             competitor: Competitor data
             keyword: Target keyword
+            content: Already scraped page content (scraped here if omitted)
+            content_analysis: Already computed NLP analysis (computed here if omitted)
             
         Returns:
             Dictionary containing competitor analysis
@@ -93,7 +162,8 @@ class CompetitorAnalysisReal:
         
         try:
             # Scrape content with error handling
-            content = self.content_scraper.scrape_content(url)
+            if content is None:
+                content = self.content_scraper.scrape_content(url)
             
             # Check if scraping failed
             if content.get("failed", False) or content.get("error"):
@@ -107,11 +177,12 @@ class CompetitorAnalysisReal:
                 return self._get_failed_competitor_analysis(competitor, "Insufficient content extracted")
             
             # Analyze content with NLP (with error handling)
-            try:
-                content_analysis = self.nlp_client.analyze_content(main_content)
-            except Exception as nlp_error:
-                logger.warning(f"NLP analysis failed for {url}: {str(nlp_error)}")
-                content_analysis = {"sentiment": {"score": 0}, "entities": []}
+            if content_analysis is None:
+                try:
+                    content_analysis = self.nlp_client.analyze_content(main_content)
+                except Exception as nlp_error:
+                    logger.warning(f"NLP analysis failed for {url}: {str(nlp_error)}")
+                    content_analysis = {"sentiment": {"score": 0}, "entities": []}
             
             # Calculate keyword usage
             keyword_usage = self._calculate_keyword_usage(content, keyword)
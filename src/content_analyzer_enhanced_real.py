@@ -10,8 +10,8 @@ import re
 from typing import Dict, Any, List, Optional
 from urllib.parse import urlparse
 
-from utils.browser_content_scraper import BrowserContentScraper
-from utils.gemini_nlp_client import GeminiNLPClient
+from src.utils.browser_content_scraper import BrowserContentScraper
+from src.utils.gemini_nlp_client import GeminiNLPClient, get_gemini_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,14 +25,15 @@ class ContentAnalyzerEnhancedReal:
     real browser-based scraping and Gemini API for NLP analysis.
     """
     
-    def __init__(self, gemini_api_key: Optional[str] = None):
+    def __init__(self, gemini_api_key: Optional[str] = None, nlp_client: Optional[GeminiNLPClient] = None):
         """
         Initialize the enhanced content analyzer.
         
         Args:
             gemini_api_key: Gemini API key
+            nlp_client: Shared Gemini client (defaults to the registry's client for the key)
         """
-        self.nlp_client = GeminiNLPClient(api_key=gemini_api_key)
+        self.nlp_client = nlp_client or get_gemini_client(gemini_api_key)
     
     def analyze_url(self, url: str) -> Dict[str, Any]:
         """
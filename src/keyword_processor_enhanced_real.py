@@ -10,8 +10,8 @@ import re
 import random
 from typing import Dict, Any, List, Optional
 
-from utils.keyword_planner_api import KeywordPlannerAPI
-from utils.serpapi_keyword_analyzer import SerpAPIKeywordAnalyzer
+from src.utils.keyword_planner_api import KeywordPlannerAPI
+from src.utils.serpapi_keyword_analyzer import SerpAPIKeywordAnalyzer
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -1,8 +1,9 @@
 import sys
 import os
+import atexit
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))  # DON'T CHANGE THIS !!!
 
-from flask import Flask, jsonify, g
+from flask import Flask, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 
@@ -16,63 +17,60 @@ from src.routes.api import api_bp
 from src.routes.blueprints import blueprint_routes
 
 # Import database setup
-from src.models.blueprint import DatabaseManager
+from src.models.blueprint import get_database_manager
+
+# Import background job manager for async blueprint generation
+from src.services.blueprint_jobs import BlueprintJobManager
+from src.services.write_behind import WriteBehindQueue, users_session_factory
+from src.services.blueprint_generator import get_blueprint_generator
+from src.services.blueprint_search import build_search_index
 
 app = Flask(__name__)
 CORS(app, origins=["http://localhost:3000"])
 
+# Shared blueprint generator (and its Gemini client) reused by every request and job
+try:
+    app.config['BLUEPRINT_GENERATOR'] = get_blueprint_generator()
+    print("✅ Blueprint generator initialized")
+except Exception as e:
+    print(f"⚠️  Blueprint generator not initialized: {str(e)}")
+    app.config['BLUEPRINT_GENERATOR'] = None
+
 # Database setup for blueprints
 database_url = os.getenv('DATABASE_URL', 'sqlite:///serp_strategist.db')
 print(f"📊 Initializing database: {database_url}")
 
 try:
-    db_manager = DatabaseManager(database_url)
+    db_manager = get_database_manager(database_url)
     db_manager.init_tables()
     print("✅ Database tables initialized successfully")
     
+    # Create the full-text index and index any blueprints missing from it
+    if build_search_index(db_manager.engine):
+        print("✅ Blueprint search index ready")
+    
     # Store db_manager in app config for later use
     app.config['DB_MANAGER'] = db_manager
     
+    # app.db_session is a scoped session: opened lazily by the first route that
+    # queries, committed/rolled back and removed when the request ends
+    db_manager.init_app(app)
+    
+    # Batched background writes for status changes and usage counters (flushed on exit);
+    # usage counters go to the users database, when the app has one
+    write_queue = WriteBehindQueue(db_manager.get_session, users_session_factory(app))
+    atexit.register(write_queue.close)
+    app.config['WRITE_BEHIND_QUEUE'] = write_queue
+    
+    # Worker pool for async blueprint generation (POST /api/blueprints/generate with "async": true)
+    app.config['BLUEPRINT_JOB_MANAGER'] = BlueprintJobManager(db_manager.get_session)
+    
 except Exception as e:
     print(f"⚠️  Database initialization failed: {str(e)}")
     app.config['DB_MANAGER'] = None
-
-# Database session management
-@app.before_request
-def before_request():
-    """Create database session before each request"""
-    db_manager = app.config.get('DB_MANAGER')
-    if db_manager:
-        try:
-            g.db_session = db_manager.get_session()
-            # Also store in current_app for backward compatibility
-            app.db_session = g.db_session
-            print(f"✅ Database session created successfully")
-        except Exception as e:
-            print(f"❌ Failed to create database session: {str(e)}")
-            g.db_session = None
-            app.db_session = None
-    else:
-        g.db_session = None
-        app.db_session = None
-
-@app.teardown_appcontext
-def close_db_session(error):
-    """Close database session after each request"""
-    db_session = getattr(g, 'db_session', None)
-    if db_session:
-        try:
-            if error:
-                db_session.rollback()
-            else:
-                db_session.commit()
-            db_session.close()
-        except Exception as e:
-            print(f"⚠️ Database session cleanup error: {str(e)}")
-    
-    # Clean up app attribute
-    if hasattr(app, 'db_session'):
-        app.db_session = None
+    app.config['BLUEPRINT_JOB_MANAGER'] = None
+    app.config['WRITE_BEHIND_QUEUE'] = None
+    app.db_session = None
 
 # Register blueprints
 app.register_blueprint(api_bp, url_prefix='/api')  # Legacy API routes
@@ -160,13 +158,12 @@ def debug_database():
     """Debug endpoint to check database status"""
     try:
         db_manager = app.config.get('DB_MANAGER')
-        has_session = hasattr(app, 'db_session') and app.db_session is not None
-        g_session = hasattr(g, 'db_session') and g.db_session is not None
+        has_session = getattr(app, 'db_session', None) is not None
         
         return jsonify({
             "database_manager_available": db_manager is not None,
             "app_db_session_available": has_session,
-            "g_db_session_available": g_session,
+            "request_session_open": bool(db_manager and db_manager.Session.registry.has()),
             "database_url": os.getenv('DATABASE_URL', 'sqlite:///serp_strategist.db'),
             "config_keys": list(app.config.keys())
         })
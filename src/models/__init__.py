@@ -19,7 +19,7 @@ Base = declarative_base()
 
 # Import all models to ensure they're registered
 from .user import User
-from .blueprint import Blueprint, Project, DatabaseManager
+from .blueprint import Blueprint, Project, UserBlueprintStats, DatabaseManager, get_database_manager
 
 def init_database(app=None, database_url=None):
     """
@@ -46,8 +46,7 @@ def init_database(app=None, database_url=None):
         return db
     else:
         # Standalone mode
-        db_url = database_url or os.getenv('DATABASE_URL', 'sqlite:///serp_strategist.db')
-        db_manager = DatabaseManager(db_url)
+        db_manager = get_database_manager(database_url)
         db_manager.init_tables()
         return db_manager.SessionLocal
 
@@ -65,10 +64,8 @@ def get_database_session(app=None):
         # Use Flask-SQLAlchemy session
         return db.session
     else:
-        # Use standalone session
-        db_url = os.getenv('DATABASE_URL', 'sqlite:///serp_strategist.db')
-        db_manager = DatabaseManager(db_url)
-        return db_manager.get_session()
+        # Use standalone session (from the shared engine for DATABASE_URL)
+        return get_database_manager().get_session()
 
 # Database utilities
 class DatabaseUtils:
@@ -147,7 +144,7 @@ def check_database_health(session):
 
 # Export commonly used items
 __all__ = [
-    'db', 'Base', 'User', 'Blueprint', 'Project', 
+    'db', 'Base', 'User', 'Blueprint', 'Project', 'UserBlueprintStats',
     'init_database', 'get_database_session', 
-    'DatabaseManager', 'DatabaseUtils', 'check_database_health'
+    'DatabaseManager', 'get_database_manager', 'DatabaseUtils', 'check_database_health'
 ]
@@ -5,12 +5,14 @@ This module defines the database models for blueprints and projects,
 providing the data structure for AI-generated content blueprints.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, create_engine
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index, create_engine, make_url, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import relationship, sessionmaker, deferred, scoped_session
 from datetime import datetime
+from threading import Lock
 import uuid
 import json
+import os
 
 Base = declarative_base()
 
@@ -29,12 +31,16 @@ class Blueprint(Base):
     user_id = Column(String(36), nullable=False, index=True)  # Removed FK constraint temporarily
     project_id = Column(String(36), nullable=True)  # Removed FK constraint temporarily
     
-    # Blueprint content (stored as JSON)
-    competitor_analysis = Column(JSON, nullable=True)
-    heading_structure = Column(JSON, nullable=True)
-    topic_clusters = Column(JSON, nullable=True)
-    serp_features = Column(JSON, nullable=True)
-    content_insights = Column(JSON, nullable=True)
+    # Blueprint content (stored as JSON). Deferred, so queries only load the
+    # payloads they ask for (see PAYLOAD_FIELDS and undefer/undefer_group)
+    competitor_analysis = deferred(Column(JSON, nullable=True), group='payload')
+    heading_structure = deferred(Column(JSON, nullable=True), group='payload')
+    topic_clusters = deferred(Column(JSON, nullable=True), group='payload')
+    serp_features = deferred(Column(JSON, nullable=True), group='payload')
+    content_insights = deferred(Column(JSON, nullable=True), group='payload')
+    
+    PAYLOAD_FIELDS = ('competitor_analysis', 'heading_structure', 'topic_clusters',
+                      'serp_features', 'content_insights')
     
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -46,23 +52,31 @@ class Blueprint(Base):
     # user = relationship("User", back_populates="blueprints")
     # project = relationship("Project", back_populates="blueprints")
     
-    def to_dict(self):
-        """Convert blueprint to dictionary for API responses."""
-        return {
+    # Covers the per-user listing order, so keyset pages are index range scans
+    __table_args__ = (
+        Index('idx_blueprints_user_created_id', 'user_id', 'created_at', 'id'),
+    )
+    
+    def to_dict(self, sections=None):
+        """
+        Convert blueprint to dictionary for API responses.
+        
+        Args:
+            sections: Optional payload fields to include (default: all of them)
+        """
+        data = {
             'id': self.id,
             'keyword': self.keyword,
             'user_id': self.user_id,
             'project_id': self.project_id,
-            'competitor_analysis': self.competitor_analysis,
-            'heading_structure': self.heading_structure,
-            'topic_clusters': self.topic_clusters,
-            'serp_features': self.serp_features,
-            'content_insights': self.content_insights,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'status': self.status,
             'generation_time': self.generation_time
         }
+        for field in (self.PAYLOAD_FIELDS if sections is None else sections):
+            data[field] = getattr(self, field)
+        return data
     
     def to_summary(self):
         """Convert blueprint to summary format for listing views."""
@@ -73,6 +87,22 @@ class Blueprint(Base):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'generation_time': self.generation_time
         }
+    
+    @classmethod
+    def summary_columns(cls):
+        """Columns needed by to_summary/row_to_summary (no JSON payloads)."""
+        return (cls.id, cls.keyword, cls.status, cls.created_at, cls.generation_time)
+    
+    @staticmethod
+    def row_to_summary(row):
+        """Convert a row selected with summary_columns() to summary format."""
+        return {
+            'id': row.id,
+            'keyword': row.keyword,
+            'status': row.status,
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'generation_time': row.generation_time
+        }
 
 class Project(Base):
     """
@@ -109,15 +139,107 @@ class Project(Base):
             'blueprint_count': 0  # Temporarily disabled due to relationship being commented out
         }
 
+class UserBlueprintStats(Base):
+    """
+    Per-user blueprint counters for the stats endpoint.
+    
+    Maintained incrementally by BlueprintStorageService in the same transaction
+    as each blueprint change, so reading a user's stats is a primary-key lookup.
+    """
+    __tablename__ = 'user_blueprint_stats'
+    
+    user_id = Column(String(36), primary_key=True)
+    total_blueprints = Column(Integer, nullable=False, default=0)
+    completed_blueprints = Column(Integer, nullable=False, default=0)
+    latest_blueprint_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 # Helper functions for database operations
 def create_database_engine(database_url: str):
-    """Create SQLAlchemy engine for the given database URL."""
-    engine = create_engine(
-        database_url,
-        echo=False,  # Set to True for SQL query logging
-        pool_pre_ping=True,  # Verify connections before use
-        pool_recycle=300  # Recycle connections every 5 minutes
-    )
+    """
+    Create SQLAlchemy engine for the given database URL.
+    
+    Prefer get_engine, which reuses one engine (and connection pool) per URL.
+    
+    Environment variables:
+        DB_POOL_SIZE: Connections kept open in the pool (default: 10)
+        DB_MAX_OVERFLOW: Extra connections allowed under load (default: 20)
+        DB_POOL_TIMEOUT: Seconds to wait for a free connection (default: 30)
+        DB_POOL_RECYCLE: Seconds before a connection is replaced (default: 300)
+        DB_POOL_PRE_PING: Check connections on checkout (default: true, except SQLite)
+        SQLITE_PERFORMANCE_PROFILE: Apply the SQLite pragmas below (default: true)
+        SQLITE_JOURNAL_MODE: Journal mode for SQLite files (default: WAL)
+        SQLITE_SYNCHRONOUS: Sync level (default: NORMAL, safe with WAL)
+        SQLITE_MMAP_SIZE: Bytes of the database file to memory-map (default: 256 MiB)
+        SQLITE_CACHE_SIZE: Page cache size, negative for KiB (default: -65536, 64 MiB)
+        SQLITE_BUSY_TIMEOUT: Milliseconds to wait for a lock before failing (default: 5000)
+    """
+    url = make_url(database_url)
+    is_sqlite = url.get_backend_name() == 'sqlite'
+    options = {
+        'echo': False,  # Set to True for SQL query logging
+        # A local SQLite file cannot drop connections, so skip the per-checkout ping there
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'false' if is_sqlite else 'true').lower() == 'true',
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 300))  # Recycle connections every 5 minutes
+    }
+    
+    # In-memory SQLite uses a single connection per thread, not a QueuePool
+    if not (is_sqlite and url.database in (None, '', ':memory:')):
+        options.update(
+            pool_size=int(os.getenv('DB_POOL_SIZE', 10)),
+            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 20)),
+            pool_timeout=int(os.getenv('DB_POOL_TIMEOUT', 30))
+        )
+    
+    engine = create_engine(database_url, **options)
+    if is_sqlite and os.getenv('SQLITE_PERFORMANCE_PROFILE', 'true').lower() == 'true':
+        apply_sqlite_profile(engine, in_memory=url.database in (None, '', ':memory:'))
+    return engine
+
+def sqlite_pragmas(in_memory: bool = False) -> dict:
+    """
+    Pragmas of the SQLite performance profile, from the environment.
+    
+    WAL lets readers run alongside the single writer instead of blocking on
+    it, and synchronous=NORMAL only syncs at checkpoints (a power loss can
+    drop the last commits, but never corrupts the database).
+    """
+    pragmas = {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 268435456)),
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -65536)),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))
+    }
+    if in_memory:
+        # In-memory databases have no journal file or pages to map
+        del pragmas['journal_mode'], pragmas['mmap_size']
+    return pragmas
+
+def apply_sqlite_profile(engine, in_memory: bool = False):
+    """Set the SQLite performance pragmas on every new connection of an engine."""
+    pragmas = sqlite_pragmas(in_memory)
+    
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+_engines = {}
+_engines_lock = Lock()
+
+def get_engine(database_url: str):
+    """Get the process-wide engine for a database URL, creating it on first use."""
+    engine = _engines.get(database_url)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(database_url)
+            if engine is None:
+                engine = _engines[database_url] = create_database_engine(database_url)
     return engine
 
 def create_session_factory(engine):
@@ -133,8 +255,11 @@ class DatabaseManager:
     """Helper class for managing database connections and sessions."""
     
     def __init__(self, database_url: str):
-        self.engine = create_database_engine(database_url)
+        self.database_url = database_url
+        self.engine = get_engine(database_url)
         self.SessionLocal = create_session_factory(self.engine)
+        # One session per thread, opened on first use and ended by remove_session
+        self.Session = scoped_session(self.SessionLocal)
         
     def init_tables(self):
         """Initialize all database tables."""
@@ -144,9 +269,58 @@ class DatabaseManager:
         """Get a new database session."""
         return self.SessionLocal()
     
+    def remove_session(self, error=None):
+        """
+        End the current thread's scoped session, if one was opened.
+        
+        Args:
+            error: Exception that ended the unit of work (rolls back instead of committing)
+        """
+        if not self.Session.registry.has():
+            return
+        try:
+            session = self.Session()
+            if error is None:
+                session.commit()
+            else:
+                session.rollback()
+        finally:
+            self.Session.remove()
+    
+    def init_app(self, app):
+        """
+        Expose the scoped session to a Flask app as app.db_session.
+        
+        Nothing is opened per request: the session is created by the first
+        route that uses it, and committed (or rolled back) and removed when
+        the app context ends.
+        """
+        app.db_session = self.Session
+        app.teardown_appcontext(self.remove_session)
+    
     def close_engine(self):
         """Close the database engine."""
+        self.Session.remove()
         self.engine.dispose()
+        with _engines_lock:
+            if _engines.get(self.database_url) is self.engine:
+                del _engines[self.database_url]
+
+_managers = {}
+_managers_lock = Lock()
+
+def get_database_manager(database_url: str = None) -> DatabaseManager:
+    """
+    Get the process-wide DatabaseManager for a URL (default: DATABASE_URL).
+    """
+    database_url = database_url or os.getenv('DATABASE_URL', 'sqlite:///serp_strategist.db')
+    manager = _managers.get(database_url)
+    if manager is None or manager.engine is not _engines.get(database_url):
+        with _managers_lock:
+            manager = _managers.get(database_url)
+            if manager is None or manager.engine is not _engines.get(database_url):
+                manager = _managers[database_url] = DatabaseManager(database_url)
+    return manager
 
 # Validation helpers
 def validate_blueprint_data(data: dict) -> bool:
@@ -66,6 +66,11 @@ class User(db.Model):
         self.api_calls_used = 0
         db.session.commit()
 
+    def deactivate(self) -> None:
+        """Deactivate the account (its cached identity is dropped on commit)."""
+        self.is_active = False
+        db.session.commit()
+
     def can_make_api_call(self) -> bool:
         """Check if user can make an API call within their limit."""
         return self.is_active and self.api_calls_used < self.api_calls_limit
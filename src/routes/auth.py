@@ -12,7 +12,7 @@ from typing import Dict, Any, Tuple
 from src.models.user import User, db
 from src.utils.auth import (
     TokenManager, PasswordValidator, SecurityUtils, AuthError,
-    token_required, get_current_user, create_auth_response
+    token_required, get_current_user, create_auth_response, invalidate_cached_user
 )
 
 # Create authentication blueprint
@@ -337,7 +337,7 @@ def update_current_user():
         # Update timestamp
         user.updated_at = datetime.now(timezone.utc)
         
-        # Save changes
+        # Save changes (the commit also invalidates the cached user)
         db.session.commit()
         
         return jsonify({
@@ -391,7 +391,7 @@ def change_password():
                 'code': 'INVALID_NEW_PASSWORD'
             }), 400
         
-        # Update password
+        # Update password (the commit also invalidates the cached user)
         user.set_password(new_password)
         user.updated_at = datetime.now(timezone.utc)
         db.session.commit()
@@ -567,6 +567,9 @@ def logout():
         user = get_current_user()
         current_app.logger.info(f"User {user.id} logged out")
         
+        # Drop the cached identity, so the next request re-reads the account
+        invalidate_cached_user(user.id)
+        
         # In a production system, you might want to maintain a token blacklist
         # For now, we'll just return a success response
         return jsonify({
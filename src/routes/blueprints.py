@@ -6,13 +6,14 @@ content blueprints through the Flask application.
 """
 
 import logging
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from functools import wraps
 import os
 import time
+import json
 
 # Import services
-from ..services.blueprint_generator import BlueprintGeneratorService
+from ..services.blueprint_generator import BlueprintGeneratorService, get_blueprint_generator
 from ..services.blueprint_storage import BlueprintStorageService, ProjectStorageService
 
 # Configure logging
@@ -35,6 +36,12 @@ def require_auth(f):
         return f(user_id, *args, **kwargs)
     return decorated_function
 
+def _is_true(value) -> bool:
+    """Interpret a flag given as a JSON boolean/number or as a string such as 'true' or 'false'."""
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes')
+    return bool(value)
+
 @blueprint_routes.route('/api/blueprints/generate', methods=['POST'])
 @require_auth
 def generate_blueprint(user_id):
@@ -44,7 +51,8 @@ def generate_blueprint(user_id):
     Request JSON:
     {
         "keyword": "content marketing",
-        "project_id": "optional-project-id"
+        "project_id": "optional-project-id",
+        "async": false
     }
     
     Response:
@@ -55,6 +63,15 @@ def generate_blueprint(user_id):
         "generation_time": 25,
         "data": { ... blueprint data ... }
     }
+    
+    With "async": true (or ?async=true) the blueprint is generated in the
+    background and the endpoint returns 202 immediately:
+    {
+        "blueprint_id": "uuid",
+        "keyword": "content marketing",
+        "status": "generating",
+        "status_url": "/api/blueprints/uuid"
+    }
     """
     try:
         # Get request data
@@ -72,17 +89,33 @@ def generate_blueprint(user_id):
         if len(keyword) > 255:
             return jsonify({'error': 'Keyword too long (max 255 characters)'}), 400
         
-        logger.info(f"Generating blueprint for keyword: '{keyword}' (user: {user_id})")
+        # Job mode: persist a pending blueprint and generate it in the background
+        async_mode = _is_true(data.get('async', False)) or _is_true(request.args.get('async', ''))
+        if async_mode:
+            job_manager = current_app.config.get('BLUEPRINT_JOB_MANAGER')
+            if not job_manager:
+                return jsonify({'error': 'Background generation not available'}), 503
+            
+            if not os.getenv('SERPAPI_KEY') or not os.getenv('GEMINI_API_KEY'):
+                return jsonify({'error': 'API configuration incomplete'}), 500
+            
+            logger.info(f"Queueing blueprint for keyword: '{keyword}' (user: {user_id})")
+            blueprint_id = job_manager.submit(keyword, user_id, project_id)
+            
+            return jsonify({
+                'blueprint_id': blueprint_id,
+                'keyword': keyword,
+                'status': 'generating',
+                'status_url': f'/api/blueprints/{blueprint_id}'
+            }), 202
         
-        # Get API keys from environment
-        serpapi_key = os.getenv('SERPAPI_KEY')
-        gemini_key = os.getenv('GEMINI_API_KEY')
+        logger.info(f"Generating blueprint for keyword: '{keyword}' (user: {user_id})")
         
-        if not serpapi_key or not gemini_key:
+        if not os.getenv('SERPAPI_KEY') or not os.getenv('GEMINI_API_KEY'):
             return jsonify({'error': 'API configuration incomplete'}), 500
         
-        # Initialize blueprint generator
-        generator = BlueprintGeneratorService(serpapi_key, gemini_key)
+        # Reuse the generator created at app startup (built on first use otherwise)
+        generator = current_app.config.get('BLUEPRINT_GENERATOR') or get_blueprint_generator()
         
         # Generate blueprint
         blueprint_data = generator.generate_blueprint(keyword, user_id, project_id)
@@ -116,6 +149,110 @@ def generate_blueprint(user_id):
         logger.error(f"Error generating blueprint: {str(e)}")
         return jsonify({'error': f'Blueprint generation failed: {str(e)}'}), 500
 
+@blueprint_routes.route('/api/blueprints/batch', methods=['POST'])
+@require_auth
+def generate_blueprint_batch(user_id):
+    """
+    Queue blueprint generation for many keywords at once.
+    
+    Request JSON:
+    {
+        "keywords": ["content marketing", "seo tips", ...],  (or one keyword per line)
+        "project_id": "optional-project-id"
+    }
+    
+    Response (202):
+    {
+        "batch_id": "uuid",
+        "total": 2,
+        "items": [{"keyword": "content marketing", "blueprint_id": "uuid"}, ...],
+        "status_url": "/api/blueprints/batch/uuid"
+    }
+    
+    Keywords that normalize to the same value are generated once.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'Request body required'}), 400
+        
+        keywords = data.get('keywords') or []
+        if isinstance(keywords, str):
+            keywords = keywords.splitlines()
+        if not isinstance(keywords, list) or not all(isinstance(keyword, str) for keyword in keywords):
+            return jsonify({'error': 'Keywords must be a list of strings'}), 400
+        
+        keywords = [keyword.strip() for keyword in keywords if keyword.strip()]
+        project_id = data.get('project_id')
+        max_keywords = int(os.getenv('BLUEPRINT_BATCH_MAX_KEYWORDS', 500))
+        
+        if not keywords:
+            return jsonify({'error': 'At least one keyword is required'}), 400
+        
+        if len(keywords) > max_keywords:
+            return jsonify({'error': f'Too many keywords (max {max_keywords} per batch)'}), 400
+        
+        too_long = [keyword for keyword in keywords if len(keyword) > 255]
+        if too_long:
+            return jsonify({'error': 'Keyword too long (max 255 characters)', 'keywords': too_long[:5]}), 400
+        
+        job_manager = current_app.config.get('BLUEPRINT_JOB_MANAGER')
+        if not job_manager:
+            return jsonify({'error': 'Background generation not available'}), 503
+        
+        if not os.getenv('SERPAPI_KEY') or not os.getenv('GEMINI_API_KEY'):
+            return jsonify({'error': 'API configuration incomplete'}), 500
+        
+        logger.info(f"Queueing blueprint batch of {len(keywords)} keywords (user: {user_id})")
+        batch = job_manager.submit_batch(keywords, user_id, project_id)
+        
+        return jsonify({
+            'batch_id': batch['batch_id'],
+            'total': len(batch['items']),
+            'items': batch['items'],
+            'status_url': f"/api/blueprints/batch/{batch['batch_id']}"
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error queueing blueprint batch: {str(e)}")
+        return jsonify({'error': f'Batch generation failed: {str(e)}'}), 500
+
+@blueprint_routes.route('/api/blueprints/batch/<batch_id>', methods=['GET'])
+@require_auth
+def get_blueprint_batch(user_id, batch_id):
+    """
+    Get the progress of a blueprint batch and the result of each keyword.
+    
+    Response:
+    {
+        "batch_id": "uuid",
+        "status": "running",  (then "completed" or "completed_with_errors")
+        "total": 50,
+        "counts": {"queued": 30, "generating": 4, "completed": 15, "failed": 1},
+        "progress": 34,
+        "items": [
+            {"keyword": "seo tips", "blueprint_id": "uuid", "status": "completed",
+             "step": "completed", "progress": 100, "result_url": "/api/blueprints/uuid"},
+            ...
+        ]
+    }
+    """
+    try:
+        job_manager = current_app.config.get('BLUEPRINT_JOB_MANAGER')
+        batch = job_manager.get_batch(batch_id) if job_manager else None
+        
+        if not batch or batch['user_id'] != user_id:
+            return jsonify({'error': 'Batch not found'}), 404
+        
+        for item in batch['items']:
+            item['result_url'] = f"/api/blueprints/{item['blueprint_id']}"
+        
+        return jsonify(batch), 200
+        
+    except Exception as e:
+        logger.error(f"Error retrieving blueprint batch: {str(e)}")
+        return jsonify({'error': f'Failed to retrieve batch: {str(e)}'}), 500
+
 @blueprint_routes.route('/api/blueprints/<blueprint_id>', methods=['GET'])
 @require_auth
 def get_blueprint(user_id, blueprint_id):
@@ -133,38 +270,154 @@ def get_blueprint(user_id, blueprint_id):
         "created_at": "2025-01-01T12:00:00",
         "status": "completed"
     }
+    
+    While a background job is running, "status" is "generating" and a
+    "progress" object reports the current step:
+    {
+        "progress": {"status": "generating", "step": "heading_structure", "progress": 60}
+    }
+    
+    Query Parameters:
+    - sections: Comma-separated payload fields to return (optional, default: all),
+      e.g. ?sections=heading_structure,topic_clusters; an empty value returns
+      the metadata only
     """
     try:
         logger.info(f"Retrieving blueprint: {blueprint_id} for user: {user_id}")
         
+        sections = request.args.get('sections')
+        if sections is not None:
+            sections = [field.strip() for field in sections.split(',') if field.strip()]
+        
         # Get database session
         db_session = getattr(current_app, 'db_session', None)
         if not db_session:
             return jsonify({'error': 'Database session not available'}), 500
         
         storage = BlueprintStorageService(db_session)
-        blueprint = storage.get_blueprint(blueprint_id, user_id)
+        try:
+            blueprint = storage.get_blueprint(blueprint_id, user_id, sections)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         if not blueprint:
             return jsonify({'error': 'Blueprint not found'}), 404
         
+        # Attach job progress for blueprints still being generated (or just failed)
+        if blueprint.get('status') in ('generating', 'failed'):
+            job_manager = current_app.config.get('BLUEPRINT_JOB_MANAGER')
+            progress = job_manager.get_progress(blueprint_id) if job_manager else None
+            if progress:
+                blueprint['progress'] = progress
+        
         return jsonify(blueprint), 200
         
     except Exception as e:
         logger.error(f"Error retrieving blueprint: {str(e)}")
         return jsonify({'error': f'Failed to retrieve blueprint: {str(e)}'}), 500
 
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@blueprint_routes.route('/api/blueprints/<blueprint_id>/stream', methods=['GET'])
+@require_auth
+def stream_blueprint(user_id, blueprint_id):
+    """
+    Stream a blueprint's sections over Server-Sent Events.
+    
+    While a background job runs, each section is pushed as soon as the
+    pipeline computes it, read from the job's progress store:
+    
+        event: section
+        data: {"section": "competitors", "field": "competitor_analysis", "data": { ... }}
+        
+        event: progress
+        data: {"status": "generating", "step": "heading_structure", "progress": 58}
+        
+        event: done
+        data: {"status": "completed", "blueprint_id": "uuid"}
+    
+    Sections are competitors, serp_features, content_insights,
+    heading_structure and topic_clusters. For finished blueprints (or jobs
+    running in another process) the stored sections are sent at once,
+    followed by "done".
+    """
+    try:
+        db_session = getattr(current_app, 'db_session', None)
+        if not db_session:
+            return jsonify({'error': 'Database session not available'}), 500
+        
+        # Metadata first: a live stream reads its sections from the job, not the row
+        storage = BlueprintStorageService(db_session)
+        blueprint = storage.get_blueprint(blueprint_id, user_id, sections=[])
+        if not blueprint:
+            return jsonify({'error': 'Blueprint not found'}), 404
+        
+        job_manager = current_app.config.get('BLUEPRINT_JOB_MANAGER')
+        live = (blueprint.get('status') == 'generating' and job_manager is not None
+                and job_manager.get_progress(blueprint_id) is not None)
+        if not live:
+            blueprint = storage.get_blueprint(blueprint_id, user_id,
+                                              sections=list(BlueprintGeneratorService.SECTION_FIELDS.values()))
+            if not blueprint:
+                return jsonify({'error': 'Blueprint not found'}), 404
+        
+        # End the transaction now, so the stream holds no connection while it runs
+        db_session.commit()
+        
+        def stored_events():
+            for section, field in BlueprintGeneratorService.SECTION_FIELDS.items():
+                if blueprint.get(field) is not None:
+                    yield _sse_event('section', {'section': section, 'field': field, 'data': blueprint[field]})
+            yield _sse_event('done', {'status': blueprint.get('status'), 'blueprint_id': blueprint_id})
+        
+        def live_events():
+            for event, payload in job_manager.stream_events(blueprint_id):
+                if event == 'section':
+                    section, data = payload
+                    yield _sse_event('section', {
+                        'section': section,
+                        'field': BlueprintGeneratorService.SECTION_FIELDS.get(section, section),
+                        'data': data
+                    })
+                elif event == 'heartbeat':
+                    yield ": keep-alive\n\n"
+                elif event == 'done':
+                    yield _sse_event('done', {
+                        'status': payload.get('status'),
+                        'blueprint_id': blueprint_id,
+                        'error': payload.get('error')
+                    })
+                else:
+                    yield _sse_event(event, payload)
+        
+        return Response(
+            stream_with_context(live_events() if live else stored_events()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+        
+    except Exception as e:
+        logger.error(f"Error streaming blueprint: {str(e)}")
+        return jsonify({'error': f'Failed to stream blueprint: {str(e)}'}), 500
+
 @blueprint_routes.route('/api/blueprints', methods=['GET'])
 @require_auth
 def list_blueprints(user_id):
     """
     List user's blueprints with pagination.
     
+    Pages are ordered newest first. Pass the returned next_cursor as cursor
+    to fetch the following page; offset is still accepted for older clients
+    but gets slower the further it pages.
+    
     Query Parameters:
     - limit: Number of results (default: 20, max: 100)
-    - offset: Results to skip (default: 0)
+    - cursor: next_cursor of the previous page (optional)
+    - offset: Results to skip (deprecated, ignored when cursor is given)
     - project_id: Filter by project (optional)
-    - search: Search keywords (optional)
+    - search: Search keywords, headings and topics, best matches first (optional)
     
     Response:
     {
@@ -177,19 +430,21 @@ def list_blueprints(user_id):
                 "generation_time": 25
             }
         ],
-        "total": 50,
+        "total": 20,
         "limit": 20,
-        "offset": 0
+        "offset": 0,
+        "next_cursor": "WyIyMDI1LTAxLTAxVDEyOjAwOjAwIiwidXVpZCJd"
     }
     """
     try:
         # Get query parameters
-        limit = min(int(request.args.get('limit', 20)), 100)
+        limit = max(min(int(request.args.get('limit', 20)), 100), 1)
         offset = max(int(request.args.get('offset', 0)), 0)
+        cursor = request.args.get('cursor', '').strip() or None
         project_id = request.args.get('project_id')
         search = request.args.get('search', '').strip()
         
-        logger.info(f"Listing blueprints for user: {user_id} (limit: {limit}, offset: {offset})")
+        logger.info(f"Listing blueprints for user: {user_id} (limit: {limit}, offset: {offset}, cursor: {cursor})")
         
         # Get database session
         db_session = getattr(current_app, 'db_session', None)
@@ -197,21 +452,25 @@ def list_blueprints(user_id):
             return jsonify({'error': 'Database session not available'}), 500
         
         storage = BlueprintStorageService(db_session)
+        next_cursor = None
         
         # Search or list blueprints
         if search:
             blueprints = storage.search_blueprints(user_id, search, limit)
-            total = len(blueprints)  # Simplified for search
-        else:
+        elif offset and not cursor:
             blueprints = storage.list_user_blueprints(user_id, limit, offset, project_id)
-            # TODO: Implement proper total count query
-            total = len(blueprints)  # Simplified for now
+        else:
+            page = storage.list_user_blueprints_page(user_id, limit, cursor, project_id)
+            blueprints = page['blueprints']
+            next_cursor = page['next_cursor']
+            offset = 0
         
         return jsonify({
             'blueprints': blueprints,
-            'total': total,
+            'total': len(blueprints),  # Size of this page; no full count query
             'limit': limit,
-            'offset': offset
+            'offset': offset,
+            'next_cursor': next_cursor
         }), 200
         
     except ValueError as e:
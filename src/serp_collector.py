@@ -23,15 +23,29 @@ except ImportError:
 # Import ChatOpenAI here as well, though it's less involved in *collection* now
 # Removed ChatOpenAI import and usage; SerpCollector does not require an LLM
 
+from src.utils.serp_cache import get_serp_cache
+from src.utils.rate_limiter import get_rate_limiter
+
 # Create module logger
 logger = logging.getLogger("keyword_research.serp_collector")
 
+DEFAULT_CONCURRENCY = 5  # Keywords collected at once; the shared rate limiter still paces the API calls
+DEFAULT_KEYWORD_TIMEOUT = 30  # Seconds allowed for one keyword's SerpAPI call
+
 class SerpCollector:
     """
     Collects search engine results page (SERP) data using SerpAPI
     """
 
-    def __init__(self):
+    def __init__(self, cache=None, rate_limiter=None, concurrency=None, keyword_timeout=None):
+        """
+        Args:
+            cache (SerpCache): Raw SerpAPI response cache (defaults to the shared one)
+            rate_limiter (RateLimiter): Limiter holding the 'serpapi' quota (defaults to the shared one)
+            concurrency (int): Maximum keywords collected at once (default: SERP_COLLECTOR_CONCURRENCY or 5)
+            keyword_timeout (float): Seconds allowed for one keyword's SerpAPI call
+                (default: SERP_COLLECTOR_KEYWORD_TIMEOUT or 30)
+        """
         self.serpapi_api_key = os.getenv("SERPAPI_API_KEY")
         if not self.serpapi_api_key:
             logger.error("SERPAPI_API_KEY environment variable not set. SerpAPI collection will not work.")
@@ -42,120 +56,130 @@ class SerpCollector:
             self.serpapi_available = True
             logger.info("SerpAPI client initialized.")
 
+        # Shared disk-backed cache of raw SerpAPI responses
+        self.cache = cache if cache is not None else get_serp_cache()
+
+        # Shared SerpAPI quota (awaited, so waiting doesn't block the event loop)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+
+        self.concurrency = concurrency or int(os.getenv("SERP_COLLECTOR_CONCURRENCY", DEFAULT_CONCURRENCY))
+        self.keyword_timeout = keyword_timeout or float(os.getenv("SERP_COLLECTOR_KEYWORD_TIMEOUT", DEFAULT_KEYWORD_TIMEOUT))
+
         # LLM is not strictly needed for collection itself now, but keep if needed elsewhere later
         # Removed OpenAI/LLM initialization; SerpCollector is now LLM-agnostic
 
 
-    async def collect_serp_data(self, keywords, max_results=10):
+    async def collect_serp_data(self, keywords, max_results=10, force_refresh=False, results=None):
         """
         Collect SERP data for the provided keywords using SerpAPI
 
+        Keywords are collected concurrently (at most ``self.concurrency`` at a
+        time) while the shared rate limiter paces the actual API calls. Each
+        keyword's data is written into ``results`` as soon as it arrives, and a
+        keyword that fails or times out only leaves empty entries behind.
+
         Args:
             keywords (list): List of keywords to research
             max_results (int): Maximum number of organic results to collect per keyword
+            force_refresh (bool): Bypass the SERP cache and fetch fresh results
+            results (dict): Optional results structure to fill in place, so callers
+                can read partial results while collection is still running
 
         Returns:
             dict: Collected SERP data including SV and KD
         """
         logger.info(f"Collecting SERP data for {len(keywords)} keywords using SerpAPI")
 
+        if results is None:
+            results = self._create_empty_results_structure(keywords)
+
         if not self.serpapi_available:
             logger.error("SerpAPI is not available. Skipping SERP collection.")
-            return self._create_empty_results_structure(keywords)
-
+            return results
 
-        # Initialize results dictionary
-        results = {
-            "keywords": keywords,
-            "serp_data": {}, # Stores structured organic results per keyword
-            "features": {}, # Stores identified features per keyword
-            "paa_questions": {}, # Stores PAA questions per keyword
-            "related_searches": {}, # Stores related searches per keyword
-            "top_urls": [], # Stores top URLs across all keywords
-            "search_volume": {}, # Stores Search Volume per keyword (from API)
-            "keyword_difficulty": {} # Stores Keyword Difficulty per keyword (from API)
-        }
+        semaphore = asyncio.Semaphore(self.concurrency)
+        keyword_urls = {}
 
-        # Iterate through ALL keywords (assuming 3-keyword limit fix is done)
-        for i, keyword in enumerate(keywords):
-            try:
+        async def collect(i, keyword):
+            async with semaphore:
                 logger.info(f"Processing keyword {i+1}/{len(keywords)}: {keyword}")
-
-                # Add small delay between requests to avoid hitting API rate limits aggressively
-                if i > 0:
-                    await asyncio.sleep(1) # Shorter delay with API calls usually
-
-                # Collect SERP data for this keyword using SerpAPI
-                keyword_data = await self._collect_keyword_serp(keyword, max_results)
-
-                # Store results, ensuring keys exist and are lists/dicts as expected
-                if keyword_data:
-                    results["serp_data"][keyword] = keyword_data.get("organic_results", []) if isinstance(keyword_data.get("organic_results"), list) else []
-                    results["features"][keyword] = keyword_data.get("detected_features", []) if isinstance(keyword_data.get("detected_features"), list) else []
-                    results["paa_questions"][keyword] = keyword_data.get("paa_questions", []) if isinstance(keyword_data.get("paa_questions"), list) else []
-                    results["related_searches"][keyword] = keyword_data.get("related_searches", []) if isinstance(keyword_data.get("related_searches"), list) else []
-
-                    # Store SV and KD if available from the API
-                    if keyword_data.get("search_parameters", {}).get("engine") == "google_keywords":
-                        # SerpAPI's Google Keywords API returns SV/KD directly in the main response
-                        results["search_volume"][keyword] = keyword_data.get("search_volume")
-                        results["keyword_difficulty"][keyword] = keyword_data.get("keyword_difficulty")
-                        logger.info(f"Fetched SV/KD for '{keyword}': SV={results['search_volume'][keyword]}, KD={results['keyword_difficulty'][keyword]}")
-                    elif keyword_data.get("serpapi_pagination"):
-                         # If using standard Google Search API, SV/KD might be in a separate tool or not directly in SERP result
-                         # Depending on your SerpAPI plan and desired approach, you might need a separate call for SV/KD
-                         # For now, we'll assume SV/KD comes from a specific API type or is handled downstream if not here.
-                         # Let's add a placeholder check if SV/KD were somehow attached (less common for standard SERP API)
-                         sv_kd_data = keyword_data.get("keyword_info") # Example key, check SerpAPI docs
-                         if sv_kd_data:
-                              results["search_volume"][keyword] = sv_kd_data.get("search_volume")
-                              results["keyword_difficulty"][keyword] = sv_kd_kd_data.get("difficulty")
-
-
-                    # Add top URLs to the overall list (from organic results)
-                    top_urls = []
-                    # Get top URLs from the results list for this keyword
-                    for result in results["serp_data"][keyword]: # Use all results fetched, not just top 3 initially
-                        url = result.get("link", "") # SerpAPI uses 'link' for URL
-                        # Clean and validate URLs
-                        url = self._clean_url(url)
-                        if url:
-                            top_urls.append(url)
-
-                    # Limit the number of URLs added to the overall list to avoid excessive content analysis later
-                    results["top_urls"].extend(top_urls[:min(max_results, len(top_urls))]) # Add up to max_results URLs
-
-
-                    logger.info(f"Successfully collected SERP data for keyword: {keyword}. Organic results: {len(results['serp_data'][keyword])}, PAA: {len(results['paa_questions'][keyword])}")
-                else:
-                     logger.warning(f"No data returned from SerpAPI for keyword: {keyword}")
-                     # Ensure empty entries for this keyword if no data was returned
-                     results["serp_data"][keyword] = []
-                     results["features"][keyword] = []
-                     results["paa_questions"][keyword] = []
-                     results["related_searches"][keyword] = []
-                     results["search_volume"][keyword] = None
-                     results["keyword_difficulty"][keyword] = None
-
-
-            except Exception as e:
-                logger.error(f"Failed to collect SERP data for keyword '{keyword}' using SerpAPI: {str(e)}", exc_info=True)
-                # Ensure empty entries for this keyword if an error occurred
-                results["serp_data"][keyword] = []
-                results["features"][keyword] = []
-                results["paa_questions"][keyword] = []
-                results["related_searches"][keyword] = []
-                results["search_volume"][keyword] = None
-                results["keyword_difficulty"][keyword] = None
-
-
-        # Remove duplicate URLs from the overall list
-        results["top_urls"] = list(dict.fromkeys(results["top_urls"]))
+                try:
+                    keyword_data = await self._collect_keyword_serp(keyword, max_results, force_refresh)
+                    keyword_urls[keyword] = self._store_keyword_results(results, keyword, keyword_data, max_results)
+                except Exception as e:
+                    logger.error(f"Failed to collect SERP data for keyword '{keyword}' using SerpAPI: {str(e)}", exc_info=True)
+                    self._store_keyword_results(results, keyword, None, max_results)
+
+        await asyncio.gather(*(collect(i, keyword) for i, keyword in enumerate(keywords)))
+
+        # Rebuild the overall URL list in keyword order (completion order varies) and remove duplicates
+        results["top_urls"] = list(dict.fromkeys(
+            url for keyword in keywords for url in keyword_urls.get(keyword, [])
+        ))
         logger.info(f"Collected {len(results['top_urls'])} unique top URLs across all keywords for potential content analysis.")
 
         return results
 
-    async def _collect_keyword_serp(self, keyword, max_results):
+    def _store_keyword_results(self, results, keyword, keyword_data, max_results):
+        """
+        Write one keyword's SERP data into the overall results structure.
+
+        Args:
+            results (dict): Overall results structure, updated in place
+            keyword (str): Keyword the data belongs to
+            keyword_data (dict): Processed SerpAPI data, or None if collection failed
+            max_results (int): Maximum number of URLs taken from this keyword
+
+        Returns:
+            list: Top URLs of this keyword (also appended to results["top_urls"])
+        """
+        if not keyword_data:
+            logger.warning(f"No data returned from SerpAPI for keyword: {keyword}")
+            # Ensure empty entries for this keyword if no data was returned
+            results["serp_data"][keyword] = []
+            results["features"][keyword] = []
+            results["paa_questions"][keyword] = []
+            results["related_searches"][keyword] = []
+            results["search_volume"][keyword] = None
+            results["keyword_difficulty"][keyword] = None
+            return []
+
+        # Store results, ensuring keys exist and are lists/dicts as expected
+        results["serp_data"][keyword] = keyword_data.get("organic_results", []) if isinstance(keyword_data.get("organic_results"), list) else []
+        results["features"][keyword] = keyword_data.get("detected_features", []) if isinstance(keyword_data.get("detected_features"), list) else []
+        results["paa_questions"][keyword] = keyword_data.get("paa_questions", []) if isinstance(keyword_data.get("paa_questions"), list) else []
+        results["related_searches"][keyword] = keyword_data.get("related_searches", []) if isinstance(keyword_data.get("related_searches"), list) else []
+
+        # Store SV and KD if available from the API
+        if (keyword_data.get("search_parameters") or {}).get("engine") == "google_keywords":
+            # SerpAPI's Google Keywords API returns SV/KD directly in the main response
+            results["search_volume"][keyword] = keyword_data.get("search_volume")
+            results["keyword_difficulty"][keyword] = keyword_data.get("keyword_difficulty")
+            logger.info(f"Fetched SV/KD for '{keyword}': SV={results['search_volume'][keyword]}, KD={results['keyword_difficulty'][keyword]}")
+        elif keyword_data.get("serpapi_pagination"):
+            # Standard Google Search responses rarely carry SV/KD; use it if it was attached
+            sv_kd_data = keyword_data.get("keyword_info") # Example key, check SerpAPI docs
+            if sv_kd_data:
+                results["search_volume"][keyword] = sv_kd_data.get("search_volume")
+                results["keyword_difficulty"][keyword] = sv_kd_data.get("difficulty")
+
+        # Get top URLs from the results list for this keyword
+        top_urls = []
+        for result in results["serp_data"][keyword]:
+            url = result.get("link", "") # SerpAPI uses 'link' for URL
+            # Clean and validate URLs
+            url = self._clean_url(url)
+            if url:
+                top_urls.append(url)
+
+        # Limit the number of URLs added to the overall list to avoid excessive content analysis later
+        top_urls = top_urls[:max_results]
+        results["top_urls"].extend(top_urls)
+
+        logger.info(f"Successfully collected SERP data for keyword: {keyword}. Organic results: {len(results['serp_data'][keyword])}, PAA: {len(results['paa_questions'][keyword])}")
+        return top_urls
+
+    async def _collect_keyword_serp(self, keyword, max_results, force_refresh=False):
         """
         Collect SERP data for a single keyword using SerpAPI.
         Note: SerpAPI library handles async internally if used with await.
@@ -163,6 +187,7 @@ class SerpCollector:
         Args:
             keyword (str): Keyword to research
             max_results (int): Maximum number of organic results to collect
+            force_refresh (bool): Bypass the SERP cache and fetch a fresh result
 
         Returns:
             dict: Raw data from SerpAPI response, or None on failure
@@ -172,6 +197,12 @@ class SerpCollector:
             logger.error("SerpAPI not available for _collect_keyword_serp.")
             return None
 
+        cache_params = {"num": max_results, "hl": "en", "gl": "us"}
+        if not force_refresh:
+            cached_results = self.cache.get(keyword, None, "google", **cache_params)
+            if cached_results is not None:
+                return self._process_serpapi_results(cached_results)
+
         try:
             # SerpAPI parameters (customize as needed)
             params = {
@@ -202,8 +233,13 @@ class SerpCollector:
             # Example using get_dict() - assuming it's compatible with async or run in executor
             # raw_results = await search.get_dict() # If get_dict is awaitable
             # If get_dict is synchronous, run in executor:
+            await self.rate_limiter.acquire('serpapi')
             loop = asyncio.get_running_loop()
-            raw_results = await loop.run_in_executor(None, search.get_dict)
+            # Only the API call is timed, not the wait for quota
+            raw_results = await asyncio.wait_for(
+                loop.run_in_executor(None, search.get_dict), self.keyword_timeout
+            )
+            self.cache.set(keyword, raw_results, None, "google", **cache_params)
 
             # --- Option 2: Using aiohttp for direct HTTP request (More control, manual URL/parsing) ---
             # import aiohttp
@@ -220,6 +256,9 @@ class SerpCollector:
             processed_data = self._process_serpapi_results(raw_results)
             return processed_data
 
+        except asyncio.TimeoutError:
+            logger.warning(f"SerpAPI call for keyword '{keyword}' timed out after {self.keyword_timeout} seconds")
+            return None
         except Exception as e:
             logger.error(f"Error calling SerpAPI for keyword '{keyword}': {str(e)}", exc_info=True)
             return None
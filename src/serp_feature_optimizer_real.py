@@ -8,7 +8,7 @@ instead of mock data.
 import logging
 from typing import Dict, Any, List, Optional
 
-from utils.serpapi_client import SerpAPIClient
+from src.utils.serpapi_client import SerpAPIClient
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -84,12 +84,14 @@ class SerpFeatureOptimizerReal:
             ]
         }
     
-    def generate_recommendations(self, keyword: str) -> Dict[str, Any]:
+    def generate_recommendations(self, keyword: str, serp_snapshot=None) -> Dict[str, Any]:
         """
         Generate SERP feature recommendations for a keyword.
         
         Args:
             keyword: Target keyword
+            serp_snapshot: Optional shared SerpSnapshot to read features from instead
+                of issuing a new SerpAPI request
             
         Returns:
             Dictionary containing SERP feature recommendations
@@ -97,7 +99,7 @@ class SerpFeatureOptimizerReal:
         logger.info(f"Generating SERP feature recommendations for keyword: {keyword}")
         
         # Get SERP features from SerpAPI
-        serp_features_dict = self.serpapi_client.get_serp_features(keyword)
+        serp_features_dict = self.serpapi_client.get_serp_features(keyword, snapshot=serp_snapshot)
         logger.info(f"Retrieved SERP features for keyword: {keyword}")
         
         # Convert serp_features from dict to list to match test expectations
@@ -6,10 +6,13 @@ data processing and API operations.
 """
 
 # Import all services for easy access
-from .blueprint_generator import BlueprintGeneratorService
+from .blueprint_generator import BlueprintGeneratorService, get_blueprint_generator
 from .blueprint_storage import BlueprintStorageService
+from .blueprint_jobs import BlueprintJobManager
 
 __all__ = [
     'BlueprintGeneratorService',
-    'BlueprintStorageService'
+    'get_blueprint_generator',
+    'BlueprintStorageService',
+    'BlueprintJobManager'
 ]
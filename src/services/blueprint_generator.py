@@ -5,18 +5,25 @@ This service combines competitor analysis, content analysis, and AI-powered
 content structuring to generate comprehensive content blueprints.
 """
 
+import os
 import logging
 import time
 import json
 import re
-from typing import Dict, Any, List, Optional
+import copy
+from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
 
 # Import existing analysis modules
 from ..competitor_analysis_real import CompetitorAnalysisReal
 from ..content_analyzer_enhanced_real import ContentAnalyzerEnhancedReal
 from ..serp_feature_optimizer_real import SerpFeatureOptimizerReal
-from ..utils.gemini_nlp_client import GeminiNLPClient
+from ..utils.gemini_nlp_client import GeminiNLPClient, get_gemini_client
+from ..utils.serpapi_client import SerpAPIClient
+from ..utils.single_flight import SingleFlight
+from ..utils.sqlite_cache import LazySingleton
+from ..utils.pipeline_executor import PipelineExecutor, PipelineNode
+from ..models.blueprint import sanitize_keyword
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,30 +35,59 @@ class BlueprintGeneratorService:
     competitor analysis, content analysis, and AI-powered content structuring.
     """
     
-    def __init__(self, serpapi_key: str, gemini_api_key: str):
+    # Progress step reported when each pipeline node (streamed section) starts
+    PIPELINE_STEPS = {
+        'competitors': 'competitor_analysis',
+        'serp_features': 'competitor_analysis',
+        'content_insights': 'content_analysis',
+        'heading_structure': 'heading_structure',
+        'topic_clusters': 'topic_clusters'
+    }
+    
+    # Blueprint field holding each pipeline section
+    SECTION_FIELDS = {
+        'competitors': 'competitor_analysis',
+        'serp_features': 'serp_features',
+        'content_insights': 'content_insights',
+        'heading_structure': 'heading_structure',
+        'topic_clusters': 'topic_clusters'
+    }
+    
+    def __init__(self, serpapi_key: str, gemini_api_key: str, gemini_client: Optional[GeminiNLPClient] = None):
         """
         Initialize the blueprint generator with API credentials.
         
         Args:
             serpapi_key: SerpAPI key for search data
             gemini_api_key: Google Gemini API key for AI processing
+            gemini_client: Shared Gemini client used by every analyzer
+                (defaults to the registry's client for the key)
         """
         self.serpapi_key = serpapi_key
         self.gemini_api_key = gemini_api_key
         
         # Initialize analysis services
         try:
+            self.gemini_client = gemini_client or get_gemini_client(gemini_api_key)
             self.competitor_analyzer = CompetitorAnalysisReal(
                 gemini_api_key=gemini_api_key,
-                serpapi_key=serpapi_key
+                serpapi_key=serpapi_key,
+                nlp_client=self.gemini_client
             )
             self.content_analyzer = ContentAnalyzerEnhancedReal(
-                gemini_api_key=gemini_api_key
+                gemini_api_key=gemini_api_key,
+                nlp_client=self.gemini_client
             )
             self.serp_optimizer = SerpFeatureOptimizerReal(
                 serpapi_key=serpapi_key
             )
-            self.gemini_client = GeminiNLPClient(api_key=gemini_api_key)
+            self.serp_client = SerpAPIClient(api_key=serpapi_key)
+            
+            # Coalesces concurrent generations of the same keyword
+            self._inflight = SingleFlight()
+            
+            # Pipeline steps of one blueprint that may run at once
+            self.pipeline_workers = int(os.getenv('BLUEPRINT_PIPELINE_WORKERS', 3))
             
             logger.info("Blueprint generator services initialized successfully")
             
@@ -59,57 +95,107 @@ class BlueprintGeneratorService:
             logger.error(f"Failed to initialize blueprint generator: {str(e)}")
             raise Exception(f"Blueprint generator initialization failed: {str(e)}")
     
-    def generate_blueprint(self, keyword: str, user_id: str, project_id: Optional[str] = None) -> Dict[str, Any]:
+    def generate_blueprint(self, keyword: str, user_id: str, project_id: Optional[str] = None,
+                           progress_callback: Optional[Callable[[str, int], None]] = None,
+                           force_refresh: bool = False,
+                           section_callback: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
         """
         Generate a complete content blueprint for the given keyword.
         
+        Concurrent calls for the same normalized keyword and options share one
+        pipeline run: later callers wait for the running generation and get
+        their own copy of its result (and its progress updates), which they
+        save as their own blueprint.
+        
         Args:
             keyword: Target keyword for content optimization
             user_id: ID of the user requesting the blueprint
             project_id: Optional project ID to associate the blueprint with
+            progress_callback: Optional callable receiving (step_name, percent_complete)
+                before each pipeline step
+            force_refresh: Bypass the SERP cache and fetch fresh results
+            section_callback: Optional callable receiving (section_name, section_data) as
+                soon as each pipeline section (see PIPELINE_STEPS) is computed
             
         Returns:
             Dictionary containing the complete blueprint data
         """
+        flight_key = (sanitize_keyword(keyword), force_refresh)
+        
+        def listener(event: str, *args):
+            callback = progress_callback if event == 'progress' else section_callback
+            if callback is not None:
+                callback(*args)
+        
+        blueprint_data, shared = self._inflight.do(
+            flight_key,
+            lambda emit: self._run_pipeline(
+                keyword, user_id,
+                lambda step, progress: emit('progress', step, progress),
+                force_refresh,
+                lambda name, data: emit('section', name, data)
+            ),
+            listener
+        )
+        
+        # Every caller gets its own copy, so saving one never mutates another's
+        blueprint_data = copy.deepcopy(blueprint_data)
+        
+        if shared:
+            logger.info(f"Reused in-flight blueprint generation for keyword: '{keyword}' (user: {user_id})")
+            blueprint_data['keyword'] = keyword
+            blueprint_data['generation_metadata']['coalesced'] = True
+        
+        return blueprint_data
+    
+    def _run_pipeline(self, keyword: str, user_id: str, progress_callback: Optional[Callable[[str, int], None]],
+                      force_refresh: bool = False,
+                      section_callback: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """Run the pipeline graph for a keyword and compile the blueprint."""
         start_time = time.time()
         logger.info(f"Starting blueprint generation for keyword: '{keyword}' (user: {user_id})")
         
         try:
-            # Step 1: Analyze competitors and SERP features
-            logger.info("Step 1: Analyzing competitors and SERP features")
-            competitors = self._analyze_competitors(keyword)
-            serp_features = self._analyze_serp_features(keyword)
+            # Competitor and SERP feature analysis share a single SERP fetch
+            serp_snapshot = self.serp_client.create_snapshot(keyword, force_refresh=force_refresh)
+            
+            pipeline = PipelineExecutor(
+                self._build_pipeline(keyword, serp_snapshot),
+                max_workers=self.pipeline_workers
+            )
             
-            # Step 2: Analyze competitor content structure
-            logger.info("Step 2: Analyzing competitor content structure")
-            content_insights = self._analyze_competitor_content(competitors)
+            def on_node_start(node: str, finished: int, total: int):
+                logger.info(f"Pipeline step started: {node}")
+                self._report_progress(progress_callback, self.PIPELINE_STEPS[node], 10 + 80 * finished // total)
             
-            # Step 3: Generate heading structure using AI
-            logger.info("Step 3: Generating AI-powered heading structure")
-            heading_structure = self._generate_heading_structure(keyword, competitors, content_insights)
+            def on_node_done(node: str, value: Any, status: str):
+                if section_callback is not None:
+                    section_callback(node, value)
             
-            # Step 4: Generate topic clusters
-            logger.info("Step 4: Generating topic clusters")
-            topic_clusters = self._generate_topic_clusters(keyword, competitors, serp_features)
+            result = pipeline.run(on_node_start, on_node_done)
             
-            # Step 5: Compile final blueprint
+            # Compile final blueprint
+            self._report_progress(progress_callback, 'finalizing', 95)
             generation_time = int(time.time() - start_time)
             
-            blueprint_data = {
-                'keyword': keyword,
-                'competitor_analysis': competitors,
-                'heading_structure': heading_structure,
-                'topic_clusters': topic_clusters,
-                'serp_features': serp_features,
-                'content_insights': content_insights,
-                'generation_metadata': {
-                    'created_at': datetime.utcnow().isoformat(),
-                    'generation_time': generation_time,
-                    'version': '1.0',
-                    'components_used': ['competitor_analysis', 'content_analysis', 'serp_optimization', 'ai_generation']
-                }
+            generation_metadata = {
+                'created_at': datetime.utcnow().isoformat(),
+                'generation_time': generation_time,
+                'version': '1.0',
+                'components_used': ['competitor_analysis', 'content_analysis', 'serp_optimization', 'ai_generation'],
+                'step_timings': result.timings,
+                'step_status': result.status
             }
+            if result.errors:
+                generation_metadata['step_errors'] = result.errors
+            
+            blueprint_data = {'keyword': keyword}
+            for section, field in self.SECTION_FIELDS.items():
+                blueprint_data[field] = result.values[section]
+            blueprint_data['generation_metadata'] = generation_metadata
             
+            if result.degraded:
+                logger.warning(f"Blueprint for '{keyword}' generated with degraded steps: {', '.join(result.degraded)}")
             logger.info(f"Blueprint generation completed for keyword: '{keyword}' in {generation_time}s")
             return blueprint_data
             
@@ -117,34 +203,87 @@ class BlueprintGeneratorService:
             logger.error(f"Error generating blueprint for keyword '{keyword}': {str(e)}")
             raise Exception(f"Blueprint generation failed: {str(e)}")
     
-    def _analyze_competitors(self, keyword: str) -> Dict[str, Any]:
-        """Analyze competitors for the given keyword."""
-        try:
-            competitors = self.competitor_analyzer.analyze_competitors(keyword, num_competitors=5)
-            logger.info(f"Successfully analyzed competitors for keyword: {keyword}")
-            return competitors
-        except Exception as e:
-            logger.warning(f"Competitor analysis failed for '{keyword}': {str(e)}")
-            return {
-                'top_competitors': [],
-                'analysis_status': 'fallback',
-                'error': str(e)
-            }
+    def _build_pipeline(self, keyword: str, serp_snapshot) -> List[PipelineNode]:
+        """
+        Build the blueprint pipeline graph for a keyword.
+        
+        Competitor and SERP feature analysis are independent, and topic
+        clusters only need those two, so they overlap with the content
+        analysis -> heading structure chain.
+        """
+        return [
+            PipelineNode(
+                'competitors',
+                lambda: self._analyze_competitors(keyword, serp_snapshot),
+                fallback=lambda error: {
+                    'top_competitors': [],
+                    'analysis_status': 'fallback',
+                    'error': str(error) if error else 'skipped'
+                }
+            ),
+            PipelineNode(
+                'serp_features',
+                lambda: self._analyze_serp_features(keyword, serp_snapshot),
+                fallback=lambda error: {
+                    'serp_features': {},
+                    'recommendations': [],
+                    'analysis_status': 'fallback',
+                    'error': str(error) if error else 'skipped'
+                }
+            ),
+            PipelineNode(
+                'content_insights',
+                lambda competitors: self._analyze_competitor_content(competitors),
+                inputs=('competitors',),
+                fallback=lambda error: {
+                    'avg_word_count': 0,
+                    'common_sections': [],
+                    'content_gaps': [],
+                    'structural_patterns': {},
+                    'analysis_status': 'failed',
+                    'error': str(error) if error else 'skipped'
+                }
+            ),
+            PipelineNode(
+                'heading_structure',
+                lambda competitors, content_insights: self._generate_heading_structure(
+                    keyword, competitors, content_insights
+                ),
+                inputs=('competitors', 'content_insights'),
+                fallback=lambda error: self._generate_fallback_heading_structure(keyword, [])
+            ),
+            PipelineNode(
+                'topic_clusters',
+                lambda competitors, serp_features: self._generate_topic_clusters(
+                    keyword, competitors, serp_features
+                ),
+                inputs=('competitors', 'serp_features'),
+                fallback=lambda error: self._generate_fallback_topic_clusters(keyword, [])
+            )
+        ]
     
-    def _analyze_serp_features(self, keyword: str) -> Dict[str, Any]:
-        """Analyze SERP features for the given keyword."""
+    def _report_progress(self, progress_callback: Optional[Callable[[str, int], None]], step: str, progress: int):
+        """Notify the progress callback, never letting it break generation."""
+        if progress_callback is None:
+            return
         try:
-            serp_features = self.serp_optimizer.generate_recommendations(keyword)
-            logger.info(f"Successfully analyzed SERP features for keyword: {keyword}")
-            return serp_features
+            progress_callback(step, progress)
         except Exception as e:
-            logger.warning(f"SERP feature analysis failed for '{keyword}': {str(e)}")
-            return {
-                'serp_features': {},
-                'recommendations': [],
-                'analysis_status': 'fallback',
-                'error': str(e)
-            }
+            logger.warning(f"Progress callback failed at step '{step}': {str(e)}")
+    
+    def _analyze_competitors(self, keyword: str, serp_snapshot=None) -> Dict[str, Any]:
+        """Analyze competitors for the given keyword (failures fall back in the pipeline)."""
+        competitors = self.competitor_analyzer.analyze_competitors(
+            keyword, num_competitors=5, serp_snapshot=serp_snapshot
+        )
+        logger.info(f"Successfully analyzed competitors for keyword: {keyword}")
+        return competitors
+    
+    def _analyze_serp_features(self, keyword: str, serp_snapshot=None) -> Dict[str, Any]:
+        """Analyze SERP features for the given keyword (failures fall back in the pipeline)."""
+        serp_features = self.serp_optimizer.generate_recommendations(keyword, serp_snapshot=serp_snapshot)
+        logger.info(f"Successfully analyzed SERP features for keyword: {keyword}")
+        return serp_features
     
     def _analyze_competitor_content(self, competitors: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze the content structure of top competitors."""
@@ -209,6 +348,11 @@ class BlueprintGeneratorService:
         
         return content_insights
     
+    def _has_json_key(self, response: str, key: str) -> bool:
+        """Whether an AI response parses into a JSON object with the given key (cache validator)."""
+        data = self._parse_json_response(response)
+        return isinstance(data, dict) and key in data
+    
     def _parse_json_response(self, response: str) -> Optional[Dict[str, Any]]:
         """Parse JSON from AI response with multiple fallback strategies."""
         if not response:
@@ -294,7 +438,8 @@ class BlueprintGeneratorService:
             }}
             """
             
-            ai_response = self.gemini_client.generate_content(prompt)
+            ai_response = self.gemini_client.generate_content(
+                prompt, validate=lambda response: self._has_json_key(response, 'h1'))
             heading_data = self._parse_json_response(ai_response)
             
             if heading_data and 'h1' in heading_data:
@@ -345,7 +490,8 @@ class BlueprintGeneratorService:
             }}
             """
             
-            ai_response = self.gemini_client.generate_content(prompt)
+            ai_response = self.gemini_client.generate_content(
+                prompt, validate=lambda response: self._has_json_key(response, 'primary_cluster'))
             topic_data = self._parse_json_response(ai_response)
             
             if topic_data and 'primary_cluster' in topic_data:
@@ -451,3 +597,34 @@ class BlueprintGeneratorService:
             return False
         
         return True
+
+
+def _build_blueprint_generator() -> BlueprintGeneratorService:
+    """Blueprint generator built from the API keys in the environment (see get_blueprint_generator)."""
+    serpapi_key = os.getenv('SERPAPI_KEY')
+    gemini_key = os.getenv('GEMINI_API_KEY')
+    
+    if not serpapi_key or not gemini_key:
+        raise Exception("API configuration incomplete")
+    
+    return BlueprintGeneratorService(serpapi_key, gemini_key)
+
+
+_blueprint_generator = LazySingleton(_build_blueprint_generator)
+
+
+def get_blueprint_generator() -> BlueprintGeneratorService:
+    """
+    Get the process-wide blueprint generator built from the API keys in the environment.
+    
+    The generator holds no per-request state, so one instance (and its
+    Gemini client, scraper session and SerpAPI client) serves every request
+    and background job.
+    
+    Returns:
+        Shared BlueprintGeneratorService
+        
+    Raises:
+        Exception: If the API keys are not configured
+    """
+    return _blueprint_generator.get()
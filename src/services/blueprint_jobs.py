@@ -0,0 +1,378 @@
+"""
+Blueprint Job Manager - Background execution of blueprint generation.
+
+This service runs the blueprint generation pipeline on a local worker pool so
+HTTP requests can return immediately with a blueprint ID and clients can poll
+for progress instead of holding a connection open for the whole pipeline.
+"""
+
+import os
+import time
+import uuid
+import logging
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Lock
+from typing import Dict, Any, Iterator, List, Optional, Callable, Tuple
+
+from .blueprint_generator import BlueprintGeneratorService, get_blueprint_generator
+from .blueprint_storage import BlueprintStorageService
+from ..models.blueprint import sanitize_keyword
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def default_generator_factory() -> BlueprintGeneratorService:
+    """Get the shared blueprint generator built from the API keys in the environment."""
+    return get_blueprint_generator()
+
+class BlueprintJobManager:
+    """
+    Runs blueprint generation jobs on a bounded thread pool.
+
+    Each job owns a blueprint row created up front with status 'generating'.
+    The worker fills the row in when generation finishes (or marks it
+    'failed'), while an in-memory progress store tracks the current step and
+    every section computed so far, for status polling and event streams.
+
+    Batches run on a separate pool, so a 500-keyword batch never queues
+    ahead of interactive single-blueprint jobs. Both pools share the
+    process-wide generator, caches and rate limiters.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any], max_workers: Optional[int] = None,
+                 generator_factory: Callable[[], BlueprintGeneratorService] = default_generator_factory,
+                 progress_retention: int = 3600, batch_workers: Optional[int] = None,
+                 orphan_grace: Optional[float] = None):
+        """
+        Initialize the job manager.
+
+        Args:
+            session_factory: Callable returning a new database session for worker threads
+            max_workers: Size of the worker pool (defaults to BLUEPRINT_WORKERS or 4)
+            generator_factory: Callable returning a BlueprintGeneratorService
+            progress_retention: Seconds to keep progress of finished jobs
+            batch_workers: Size of the batch worker pool (defaults to BLUEPRINT_BATCH_WORKERS or 4)
+            orphan_grace: Seconds after which a 'generating' row found at startup is
+                considered orphaned (defaults to BLUEPRINT_ORPHAN_GRACE or 900)
+        """
+        self.session_factory = session_factory
+        self.generator_factory = generator_factory
+        self.max_workers = max_workers or int(os.getenv('BLUEPRINT_WORKERS', 4))
+        self.batch_workers = batch_workers or int(os.getenv('BLUEPRINT_BATCH_WORKERS', 4))
+        self.progress_retention = progress_retention
+        self.orphan_grace = (orphan_grace if orphan_grace is not None
+                             else float(os.getenv('BLUEPRINT_ORPHAN_GRACE', 900)))
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='blueprint-job')
+        self._batch_executor = ThreadPoolExecutor(max_workers=self.batch_workers, thread_name_prefix='blueprint-batch')
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._progress: Dict[str, Dict[str, Any]] = {}
+        self._sections: Dict[str, List[Tuple[str, Any]]] = {}
+        self._lock = Lock()
+        self._changed = Condition(self._lock)
+
+        logger.info(f"Blueprint job manager started with {self.max_workers} workers")
+        self.fail_orphaned_jobs()
+
+    def fail_orphaned_jobs(self) -> int:
+        """
+        Mark blueprints whose job died with a previous process as 'failed'.
+
+        Jobs only live in memory, so a restart leaves their rows 'generating'
+        forever. Rows updated within the grace period are skipped, since
+        another process may still be running them (a job that does finish
+        later still marks its row completed).
+
+        Returns:
+            Number of blueprints marked failed
+        """
+        session = self.session_factory()
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.orphan_grace)
+            failed = BlueprintStorageService(session).fail_orphaned_blueprints(cutoff)
+            if failed:
+                logger.warning(f"Marked {failed} orphaned blueprint jobs as failed")
+            return failed
+        except Exception as e:
+            logger.error(f"Failed to check for orphaned blueprint jobs: {str(e)}")
+            return 0
+        finally:
+            session.close()
+
+    def submit(self, keyword: str, user_id: str, project_id: Optional[str] = None) -> str:
+        """
+        Create a pending blueprint and schedule its generation.
+
+        Args:
+            keyword: Target keyword
+            user_id: ID of the user requesting the blueprint
+            project_id: Optional project ID to associate the blueprint with
+
+        Returns:
+            ID of the pending blueprint
+
+        Raises:
+            Exception: If the pending blueprint could not be created
+        """
+        session = self.session_factory()
+        try:
+            blueprint_id = BlueprintStorageService(session).create_pending_blueprint(keyword, user_id, project_id)
+        finally:
+            session.close()
+
+        self._set_progress(blueprint_id, status='queued', step='queued', progress=0)
+        self._executor.submit(self._run_job, blueprint_id, keyword, user_id, project_id)
+
+        logger.info(f"Queued blueprint job {blueprint_id} for keyword: '{keyword}'")
+        return blueprint_id
+
+    def submit_batch(self, keywords: List[str], user_id: str, project_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create pending blueprints for a batch of keywords and schedule them.
+
+        Keywords that normalize to the same value are generated once. All
+        pending rows are created in a single transaction.
+
+        Args:
+            keywords: Target keywords
+            user_id: ID of the user requesting the blueprints
+            project_id: Optional project ID to associate the blueprints with
+
+        Returns:
+            Batch dictionary with 'batch_id' and 'items' (keyword and blueprint_id)
+
+        Raises:
+            Exception: If the pending blueprints could not be created
+        """
+        unique_keywords = []
+        seen = set()
+        for keyword in keywords:
+            normalized = sanitize_keyword(keyword)
+            if normalized not in seen:
+                seen.add(normalized)
+                unique_keywords.append(keyword)
+
+        session = self.session_factory()
+        try:
+            blueprint_ids = BlueprintStorageService(session).create_pending_blueprints(unique_keywords, user_id, project_id)
+        finally:
+            session.close()
+
+        batch_id = str(uuid.uuid4())
+        items = [
+            {'keyword': keyword, 'blueprint_id': blueprint_id}
+            for keyword, blueprint_id in zip(unique_keywords, blueprint_ids)
+        ]
+        with self._lock:
+            self._batches[batch_id] = {
+                'batch_id': batch_id,
+                'user_id': user_id,
+                'project_id': project_id,
+                'created_at': time.time(),
+                'items': items,
+                'final': {}  # Final progress of items whose progress entry was pruned
+            }
+
+        for item in items:
+            self._set_progress(item['blueprint_id'], status='queued', step='queued', progress=0, batch_id=batch_id)
+            self._batch_executor.submit(self._run_job, item['blueprint_id'], item['keyword'], user_id, project_id)
+
+        logger.info(f"Queued batch {batch_id} with {len(items)} keywords ({len(keywords) - len(items)} duplicates dropped)")
+        return {'batch_id': batch_id, 'items': [dict(item) for item in items]}
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the progress of a batch and of each of its items.
+
+        Args:
+            batch_id: ID of the batch
+
+        Returns:
+            Dictionary with overall 'status', 'progress', per-status 'counts'
+            and 'items', or None if the batch is unknown to this process
+        """
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return None
+            items = []
+            for item in batch['items']:
+                progress = (self._progress.get(item['blueprint_id'])
+                            or batch['final'].get(item['blueprint_id'], {'status': 'queued', 'progress': 0}))
+                entry = dict(item)
+                entry.update({
+                    'status': progress.get('status'),
+                    'step': progress.get('step'),
+                    'progress': progress.get('progress', 0)
+                })
+                if progress.get('error'):
+                    entry['error'] = progress['error']
+                items.append(entry)
+
+        counts = {status: 0 for status in ('queued', 'generating', 'completed', 'failed')}
+        for item in items:
+            counts[item['status']] = counts.get(item['status'], 0) + 1
+
+        finished = counts['completed'] + counts['failed']
+        if finished < len(items):
+            status = 'running'
+        else:
+            status = 'completed_with_errors' if counts['failed'] else 'completed'
+
+        return {
+            'batch_id': batch_id,
+            'user_id': batch['user_id'],
+            'project_id': batch['project_id'],
+            'status': status,
+            'total': len(items),
+            'counts': counts,
+            'progress': sum(item['progress'] or 0 for item in items) // max(len(items), 1),
+            'items': items
+        }
+
+    def get_progress(self, blueprint_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the progress of a job.
+
+        Args:
+            blueprint_id: ID of the blueprint being generated
+
+        Returns:
+            Progress dictionary or None if the job is unknown to this process
+        """
+        with self._lock:
+            progress = self._progress.get(blueprint_id)
+            return dict(progress) if progress else None
+
+    def stream_events(self, blueprint_id: str, heartbeat: float = 15.0,
+                      timeout: Optional[float] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield a job's progress and computed sections as they happen.
+
+        Sections already computed are yielded first, so a stream opened
+        mid-job catches up. The iterator ends once the job completes or fails.
+
+        Args:
+            blueprint_id: ID of the blueprint being generated
+            heartbeat: Seconds without news after which a ('heartbeat', None) event is yielded
+            timeout: Optional total seconds before the stream gives up
+
+        Yields:
+            ('progress', dict), ('section', (name, data)), ('heartbeat', None)
+            and finally ('done', progress dict) events
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        sent_sections = 0
+        last_progress = None
+
+        while True:
+            with self._changed:
+                progress = self._progress.get(blueprint_id)
+                if progress is None:
+                    return
+                if (len(self._sections.get(blueprint_id, [])) == sent_sections
+                        and progress.get('updated_at') == last_progress
+                        and progress.get('status') not in ('completed', 'failed')):
+                    wait = heartbeat if deadline is None else min(heartbeat, deadline - time.time())
+                    if wait <= 0:
+                        return
+                    self._changed.wait(wait)
+                    progress = self._progress.get(blueprint_id)
+                    if progress is None:
+                        return
+                sections = self._sections.get(blueprint_id, [])[sent_sections:]
+                progress = dict(progress)
+
+            for section in sections:
+                yield 'section', section
+            sent_sections += len(sections)
+
+            if progress['status'] in ('completed', 'failed'):
+                yield 'done', progress
+                return
+
+            if progress.get('updated_at') != last_progress:
+                last_progress = progress.get('updated_at')
+                yield 'progress', progress
+            elif not sections:
+                yield 'heartbeat', None
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait)
+        self._batch_executor.shutdown(wait=wait)
+
+    def _set_progress(self, blueprint_id: str, **fields):
+        """Update the progress entry of a job."""
+        with self._lock:
+            entry = self._progress.setdefault(blueprint_id, {'created_at': time.time()})
+            entry.update(fields)
+            entry['updated_at'] = time.time()
+            self._prune_progress()
+            self._changed.notify_all()
+
+    def _add_section(self, blueprint_id: str, name: str, data: Any):
+        """Record a computed blueprint section for the job's event streams."""
+        with self._lock:
+            self._sections.setdefault(blueprint_id, []).append((name, data))
+            self._changed.notify_all()
+
+    def _prune_progress(self):
+        """Drop progress of jobs that finished longer ago than the retention window."""
+        cutoff = time.time() - self.progress_retention
+        expired = [
+            job_id for job_id, entry in self._progress.items()
+            if entry.get('status') in ('completed', 'failed') and entry['updated_at'] < cutoff
+        ]
+        for job_id in expired:
+            entry = self._progress.pop(job_id)
+            self._sections.pop(job_id, None)
+            batch = self._batches.get(entry.get('batch_id'))
+            if batch is not None:
+                # Keep the outcome, so the batch still reports failures after pruning
+                batch['final'][job_id] = {key: entry[key] for key in ('status', 'step', 'progress', 'error')
+                                          if key in entry}
+
+        # Drop batches once every item's progress has been pruned
+        if expired:
+            finished_batches = [
+                batch_id for batch_id, batch in self._batches.items()
+                if batch['created_at'] < cutoff
+                and not any(item['blueprint_id'] in self._progress for item in batch['items'])
+            ]
+            for batch_id in finished_batches:
+                del self._batches[batch_id]
+
+    def _run_job(self, blueprint_id: str, keyword: str, user_id: str, project_id: Optional[str]):
+        """Generate a blueprint and persist the result (runs on a worker thread)."""
+        self._set_progress(blueprint_id, status='generating', step='starting', progress=5)
+        session = self.session_factory()
+        storage = BlueprintStorageService(session)
+
+        try:
+            generator = self.generator_factory()
+            blueprint_data = generator.generate_blueprint(
+                keyword, user_id, project_id,
+                progress_callback=lambda step, progress: self._set_progress(
+                    blueprint_id, step=step, progress=progress
+                ),
+                section_callback=lambda name, data: self._add_section(blueprint_id, name, data)
+            )
+
+            if not generator.validate_blueprint_data(blueprint_data):
+                raise Exception("Blueprint generation validation failed")
+
+            if not storage.complete_blueprint(blueprint_id, blueprint_data):
+                raise Exception("Failed to save generated blueprint")
+
+            self._set_progress(blueprint_id, status='completed', step='completed', progress=100)
+            logger.info(f"Blueprint job {blueprint_id} completed")
+
+        except Exception as e:
+            logger.error(f"Blueprint job {blueprint_id} failed: {str(e)}")
+            storage.update_blueprint_status(blueprint_id, user_id, 'failed')
+            self._set_progress(blueprint_id, status='failed', step='failed', error=str(e))
+        finally:
+            session.close()
@@ -0,0 +1,347 @@
+"""
+Blueprint Search Index - Full-text search over blueprint keywords and content.
+
+Indexes each blueprint's keyword, H1/H2 headings, topic cluster names and
+common topics so search_blueprints can return ranked matches from an index
+instead of scanning every row with LIKE. SQLite uses an FTS5 virtual table
+and PostgreSQL a weighted tsvector column with a GIN index; other databases
+(or SQLite builds without FTS5) report the index as unavailable and callers
+fall back to the LIKE scan.
+"""
+
+import re
+import time
+import logging
+import weakref
+from threading import Lock
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import text, select, table, column
+from sqlalchemy.orm import Session
+
+from ..models.blueprint import Blueprint
+from ..utils.payload_codec import get_payload_codec
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAX_QUERY_TERMS = 10
+BACKFILL_BATCH_SIZE = 500
+
+# Relative weight of each indexed field in the ranking
+FIELD_WEIGHTS = {'keyword': 10.0, 'headings': 4.0, 'topics': 2.0}
+
+SQLITE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS blueprint_search_docs (
+        docid INTEGER PRIMARY KEY AUTOINCREMENT,
+        blueprint_id VARCHAR(36) NOT NULL UNIQUE,
+        user_id VARCHAR(36) NOT NULL
+    )""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS blueprint_search USING fts5(
+        keyword, headings, topics, tokenize = 'porter unicode61'
+    )"""
+]
+
+POSTGRES_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS blueprint_search (
+        blueprint_id VARCHAR(36) PRIMARY KEY,
+        user_id VARCHAR(36) NOT NULL,
+        document TSVECTOR NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_blueprint_search_document ON blueprint_search USING GIN (document)",
+    "CREATE INDEX IF NOT EXISTS idx_blueprint_search_user_id ON blueprint_search (user_id)"
+]
+
+SCHEMAS = {'sqlite': SQLITE_SCHEMA, 'postgresql': POSTGRES_SCHEMA}
+
+# Table holding one row per indexed blueprint, and the probe telling whether the index exists
+INDEXED_TABLES = {'sqlite': 'blueprint_search_docs', 'postgresql': 'blueprint_search'}
+PROBES = {
+    'sqlite': "SELECT name FROM sqlite_master WHERE name = 'blueprint_search'",
+    'postgresql': "SELECT to_regclass('blueprint_search')"
+}
+DROP_STATEMENTS = {
+    'sqlite': ["DROP TABLE IF EXISTS blueprint_search", "DROP TABLE IF EXISTS blueprint_search_docs"],
+    'postgresql': ["DROP TABLE IF EXISTS blueprint_search"]
+}
+
+# Seconds before an engine whose index was missing (or could not be probed) is checked again
+READY_RETRY_SECONDS = 60
+
+# Engines mapped to (index available, monotonic time of the check)
+_ready_engines = weakref.WeakKeyDictionary()
+_ready_lock = Lock()
+
+
+def _texts(value: Any) -> List[str]:
+    """Flatten strings out of a list/dict payload fragment."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [item for key in ('title', 'name', 'topic', 'keyword') if key in value for item in _texts(value[key])]
+    if isinstance(value, (list, tuple)):
+        return [item for entry in value for item in _texts(entry)]
+    return []
+
+
+def extract_document(keyword: str, payloads: Dict[str, Any]) -> Tuple[str, str, str]:
+    """
+    Build the searchable text of a blueprint.
+
+    Args:
+        keyword: Blueprint keyword
+        payloads: Decoded payload sections (missing sections are skipped)
+
+    Returns:
+        Tuple of (keyword, headings, topics) text
+    """
+    headings = []
+    heading_structure = payloads.get('heading_structure') or {}
+    if isinstance(heading_structure, dict):
+        headings.extend(_texts(heading_structure.get('h1')))
+        headings.extend(_texts(heading_structure.get('h2_sections')))
+
+    topics = []
+    topic_clusters = payloads.get('topic_clusters') or {}
+    if isinstance(topic_clusters, dict):
+        topics.extend(_texts(topic_clusters.get('primary_cluster')))
+        secondary = topic_clusters.get('secondary_clusters')
+        if isinstance(secondary, dict):
+            topics.extend(name.replace('_', ' ') for name in secondary)
+
+    content_insights = payloads.get('content_insights') or {}
+    if isinstance(content_insights, dict):
+        topics.extend(_texts(content_insights.get('common_sections')))
+        topics.extend(_texts(content_insights.get('common_topics')))
+
+    competitor_analysis = payloads.get('competitor_analysis') or {}
+    if isinstance(competitor_analysis, dict):
+        insights = competitor_analysis.get('insights') or {}
+        if isinstance(insights, dict):
+            topics.extend(_texts(insights.get('common_topics')))
+
+    return keyword or '', '\n'.join(headings), '\n'.join(topics)
+
+
+def query_terms(query: str) -> List[str]:
+    """Split a user search string into lowercase word terms."""
+    return re.findall(r'\w+', (query or '').lower())[:MAX_QUERY_TERMS]
+
+
+def build_search_index(engine, codec=None, rebuild: bool = False) -> bool:
+    """
+    Create the search index if needed and index every blueprint missing from it.
+    
+    Run at application startup and by build_search_index.py, never inside a
+    request: on a large database the first backfill takes a while. Each
+    batch commits on its own, so an interrupted run resumes where it stopped.
+    
+    Args:
+        engine: SQLAlchemy engine of the blueprint database
+        codec: Payload codec used to decode stored sections (defaults to the configured codec)
+        rebuild: Drop and re-create the index first (e.g. after changing extract_document)
+        
+    Returns:
+        True if the index is available, False if the database does not support it
+        or building failed
+    """
+    dialect = engine.dialect.name
+    if dialect not in SCHEMAS:
+        logger.info(f"Full-text search not supported on {dialect}, using LIKE search")
+        return False
+    codec = codec if codec is not None else get_payload_codec()
+
+    try:
+        with engine.begin() as connection:
+            if rebuild:
+                for statement in DROP_STATEMENTS[dialect]:
+                    connection.execute(text(statement))
+            for statement in SCHEMAS[dialect]:
+                connection.execute(text(statement))
+        indexed = _backfill(engine, dialect, codec)
+    except Exception as e:
+        logger.error(f"Failed to build blueprint search index: {str(e)}")
+        with _ready_lock:
+            _ready_engines.pop(engine, None)
+        return False
+
+    with _ready_lock:
+        _ready_engines[engine] = (True, time.monotonic())
+    logger.info(f"Blueprint search index ready ({indexed} blueprints indexed)")
+    return True
+
+
+def _backfill(engine, dialect: str, codec) -> int:
+    """Index blueprints that have no document yet, one committed batch at a time."""
+    blueprints = Blueprint.__table__
+    indexed_ids = select(column('blueprint_id')).select_from(table(INDEXED_TABLES[dialect]))
+    columns = [blueprints.c.id, blueprints.c.user_id, blueprints.c.keyword] + [
+        blueprints.c[field] for field in Blueprint.PAYLOAD_FIELDS
+    ]
+    last_id, indexed = '', 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(*columns).where(blueprints.c.id > last_id, blueprints.c.id.not_in(indexed_ids))
+                .order_by(blueprints.c.id).limit(BACKFILL_BATCH_SIZE)
+            ).all()
+            for row in rows:
+                payloads = {field: codec.decode(getattr(row, field)) for field in Blueprint.PAYLOAD_FIELDS}
+                _insert(connection, dialect, row.id, row.user_id, extract_document(row.keyword, payloads))
+        if not rows:
+            return indexed
+        indexed += len(rows)
+        last_id = rows[-1].id
+
+
+def _insert(connection, dialect: str, blueprint_id: str, user_id: str, document: Tuple[str, str, str]):
+    """Insert one document (the blueprint must not be indexed yet)."""
+    keyword, headings, topics = document
+    params = {'blueprint_id': blueprint_id, 'user_id': user_id,
+              'keyword': keyword, 'headings': headings, 'topics': topics}
+    if dialect == 'sqlite':
+        docid = connection.execute(text(
+            "INSERT INTO blueprint_search_docs (blueprint_id, user_id) VALUES (:blueprint_id, :user_id)"
+        ), params).lastrowid
+        connection.execute(text(
+            "INSERT INTO blueprint_search (rowid, keyword, headings, topics) VALUES (:docid, :keyword, :headings, :topics)"
+        ), dict(params, docid=docid))
+    else:
+        connection.execute(text(
+            "INSERT INTO blueprint_search (blueprint_id, user_id, document) VALUES (:blueprint_id, :user_id, "
+            "setweight(to_tsvector('english', :keyword), 'A') || "
+            "setweight(to_tsvector('english', :headings), 'B') || "
+            "setweight(to_tsvector('english', :topics), 'C'))"
+        ), params)
+
+
+def _delete(connection, dialect: str, blueprint_id: str):
+    """Remove one document if it is indexed."""
+    if dialect == 'sqlite':
+        docid = connection.execute(text(
+            "SELECT docid FROM blueprint_search_docs WHERE blueprint_id = :blueprint_id"
+        ), {'blueprint_id': blueprint_id}).scalar()
+        if docid is not None:
+            connection.execute(text("DELETE FROM blueprint_search WHERE rowid = :docid"), {'docid': docid})
+            connection.execute(text("DELETE FROM blueprint_search_docs WHERE docid = :docid"), {'docid': docid})
+    else:
+        connection.execute(text("DELETE FROM blueprint_search WHERE blueprint_id = :blueprint_id"),
+                           {'blueprint_id': blueprint_id})
+
+
+def _index_available(engine) -> bool:
+    """
+    Whether the index tables exist, probed once per engine.
+    
+    A missing index (or a failed probe) is re-checked after READY_RETRY_SECONDS,
+    so an index built later, or a transient error, is picked up without a restart.
+    """
+    dialect = engine.dialect.name
+    if dialect not in PROBES:
+        return False
+
+    now = time.monotonic()
+    with _ready_lock:
+        state = _ready_engines.get(engine)
+        if state is not None and (state[0] or now - state[1] < READY_RETRY_SECONDS):
+            return state[0]
+
+    try:
+        with engine.connect() as connection:
+            available = connection.execute(text(PROBES[dialect])).scalar() is not None
+    except Exception as e:
+        logger.warning(f"Could not check the blueprint search index, using LIKE search: {str(e)}")
+        available = False
+    if not available:
+        logger.info("Blueprint search index not built yet (run build_search_index.py), using LIKE search")
+
+    with _ready_lock:
+        _ready_engines[engine] = (available, now)
+    return available
+
+
+class BlueprintSearchIndex:
+    """Maintains and queries the blueprint full-text index for one session."""
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize the index for a session (build_search_index creates it).
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db = db_session
+        engine = db_session.get_bind()
+        self.dialect = engine.dialect.name
+        self.available = _index_available(engine)
+
+    def index_blueprint(self, blueprint_id: str, user_id: str, keyword: str, payloads: Dict[str, Any]):
+        """
+        Add or replace a blueprint's document, in the session's current transaction.
+
+        A failure is logged and rolled back to a savepoint, so indexing never
+        fails the blueprint write itself.
+
+        Args:
+            blueprint_id: ID of the blueprint
+            user_id: ID of the owning user
+            keyword: Blueprint keyword
+            payloads: Decoded payload sections available so far
+        """
+        if not self.available:
+            return
+        try:
+            with self.db.begin_nested():
+                connection = self.db.connection()
+                _delete(connection, self.dialect, blueprint_id)
+                _insert(connection, self.dialect, blueprint_id, user_id, extract_document(keyword, payloads))
+        except Exception as e:
+            logger.warning(f"Failed to index blueprint {blueprint_id}: {str(e)}")
+
+    def remove_blueprint(self, blueprint_id: str):
+        """Remove a blueprint's document, in the session's current transaction."""
+        if not self.available:
+            return
+        try:
+            with self.db.begin_nested():
+                _delete(self.db.connection(), self.dialect, blueprint_id)
+        except Exception as e:
+            logger.warning(f"Failed to remove blueprint {blueprint_id} from search index: {str(e)}")
+
+    def search(self, user_id: str, query: str, limit: int = 10) -> Optional[List[str]]:
+        """
+        Find a user's blueprints matching every term of a query, best first.
+
+        Terms match as word prefixes, so partial words typed in a search box
+        still match.
+
+        Args:
+            user_id: ID of the user
+            query: Free-text search string
+            limit: Maximum number of results
+
+        Returns:
+            Ranked blueprint IDs, or None if the index is unavailable
+        """
+        if not self.available:
+            return None
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        if self.dialect == 'sqlite':
+            weights = ', '.join(str(weight) for weight in FIELD_WEIGHTS.values())
+            rows = self.db.execute(text(
+                "SELECT d.blueprint_id FROM blueprint_search "
+                "JOIN blueprint_search_docs d ON d.docid = blueprint_search.rowid "
+                "WHERE blueprint_search MATCH :match AND d.user_id = :user_id "
+                f"ORDER BY bm25(blueprint_search, {weights}) LIMIT :limit"
+            ), {'match': ' '.join(f'"{term}"*' for term in terms), 'user_id': user_id, 'limit': limit})
+        else:
+            rows = self.db.execute(text(
+                "SELECT blueprint_id FROM blueprint_search, to_tsquery('english', :match) query "
+                "WHERE user_id = :user_id AND document @@ query "
+                "ORDER BY ts_rank_cd(document, query) DESC LIMIT :limit"
+            ), {'match': ' & '.join(f"{term}:*" for term in terms), 'user_id': user_id, 'limit': limit})
+
+        return [row.blueprint_id for row in rows]
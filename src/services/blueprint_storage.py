@@ -5,29 +5,83 @@ This service handles storing, retrieving, and managing blueprints in the databas
 providing a clean interface for blueprint data persistence.
 """
 
+import json
+import base64
 import logging
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import and_, or_, case, func, select
+from sqlalchemy.orm import Session, undefer, undefer_group
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from datetime import datetime, timedelta
 
-from ..models.blueprint import Blueprint, Project, validate_blueprint_data, sanitize_keyword
+from ..models.blueprint import Blueprint, Project, UserBlueprintStats, validate_blueprint_data, sanitize_keyword
+from ..utils.payload_codec import PayloadCodec, PayloadDecodeError, get_payload_codec
+from .blueprint_search import BlueprintSearchIndex
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def encode_page_cursor(created_at: datetime, blueprint_id: str) -> str:
+    """
+    Encode the position after a listed blueprint as an opaque page cursor.
+    
+    Args:
+        created_at: Creation time of the last blueprint on the page
+        blueprint_id: ID of the last blueprint on the page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([created_at.isoformat(), blueprint_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_page_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a page cursor produced by encode_page_cursor.
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        Tuple of (created_at, blueprint_id)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, blueprint_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), str(blueprint_id)
+    except Exception:
+        raise ValueError(f"Invalid page cursor: {cursor}")
+
 class BlueprintStorageService:
     """Service for storing and retrieving blueprints from the database."""
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, codec: Optional[PayloadCodec] = None):
         """
         Initialize the storage service with a database session.
         
         Args:
             db_session: SQLAlchemy database session
+            codec: Payload codec used to compress stored sections (defaults to
+                the process-wide codec configured by BLUEPRINT_PAYLOAD_CODEC)
         """
         self.db = db_session
+        self.codec = codec or get_payload_codec()
+        self.search_index = BlueprintSearchIndex(db_session)
+    
+    def _encode_payloads(self, blueprint_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Encode the payload sections of blueprint data for storage."""
+        return {field: self.codec.encode(blueprint_data.get(field)) for field in Blueprint.PAYLOAD_FIELDS}
+    
+    def _decode_payloads(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode the stored payload sections present in a blueprint dictionary."""
+        for field in Blueprint.PAYLOAD_FIELDS:
+            if field in data:
+                data[field] = self.codec.decode(data[field])
+        return data
     
     def save_blueprint(self, blueprint_data: Dict[str, Any], user_id: str, project_id: Optional[str] = None) -> str:
         """
@@ -67,17 +121,16 @@ class BlueprintStorageService:
                 keyword=keyword,
                 user_id=user_id,
                 project_id=project_id,
-                competitor_analysis=blueprint_data.get('competitor_analysis'),
-                heading_structure=blueprint_data.get('heading_structure'),
-                topic_clusters=blueprint_data.get('topic_clusters'),
-                serp_features=blueprint_data.get('serp_features'),
-                content_insights=blueprint_data.get('content_insights'),
                 status='completed',
-                generation_time=generation_time
+                generation_time=generation_time,
+                **self._encode_payloads(blueprint_data)
             )
             
             # Save to database
             self.db.add(blueprint)
+            self.db.flush()
+            self._adjust_stats(user_id, total=1, completed=1, created_at=blueprint.created_at)
+            self.search_index.index_blueprint(blueprint.id, user_id, keyword, blueprint_data)
             self.db.commit()
             self.db.refresh(blueprint)
             
@@ -93,21 +146,185 @@ class BlueprintStorageService:
             logger.error(f"Error saving blueprint: {str(e)}")
             raise Exception(f"Failed to save blueprint: {str(e)}")
     
-    def get_blueprint(self, blueprint_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    def create_pending_blueprint(self, keyword: str, user_id: str, project_id: Optional[str] = None) -> str:
+        """
+        Create a placeholder blueprint row for an asynchronous generation job.
+        
+        Args:
+            keyword: Target keyword
+            user_id: ID of the user requesting the blueprint
+            project_id: Optional project ID to associate the blueprint with
+            
+        Returns:
+            ID of the created blueprint (status 'generating')
+            
+        Raises:
+            Exception: If the keyword is invalid or the database operation fails
+        """
+        logger.info(f"Creating pending blueprint for keyword: {keyword}")
+        
+        try:
+            sanitized_keyword = sanitize_keyword(keyword)
+            if not sanitized_keyword:
+                raise Exception("Invalid keyword provided")
+            
+            blueprint = Blueprint(
+                keyword=sanitized_keyword,
+                user_id=user_id,
+                project_id=project_id,
+                status='generating'
+            )
+            
+            self.db.add(blueprint)
+            self.db.flush()
+            self._adjust_stats(user_id, total=1, created_at=blueprint.created_at)
+            self.search_index.index_blueprint(blueprint.id, user_id, sanitized_keyword, {})
+            self.db.commit()
+            self.db.refresh(blueprint)
+            
+            logger.info(f"Pending blueprint created with ID: {blueprint.id}")
+            return blueprint.id
+            
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Database error creating pending blueprint: {str(e)}")
+            raise Exception(f"Failed to create blueprint: Database error")
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error creating pending blueprint: {str(e)}")
+            raise Exception(f"Failed to create blueprint: {str(e)}")
+    
+    def create_pending_blueprints(self, keywords: List[str], user_id: str, project_id: Optional[str] = None) -> List[str]:
+        """
+        Create placeholder blueprint rows for a batch of keywords in one transaction.
+
+        Args:
+            keywords: Target keywords
+            user_id: ID of the user requesting the blueprints
+            project_id: Optional project ID to associate the blueprints with
+
+        Returns:
+            IDs of the created blueprints (status 'generating'), in keyword order
+
+        Raises:
+            Exception: If a keyword is invalid or the database operation fails
+        """
+        logger.info(f"Creating {len(keywords)} pending blueprints for user: {user_id}")
+
+        try:
+            blueprints = []
+            for keyword in keywords:
+                sanitized_keyword = sanitize_keyword(keyword)
+                if not sanitized_keyword:
+                    raise Exception(f"Invalid keyword provided: '{keyword}'")
+
+                blueprints.append(Blueprint(
+                    keyword=sanitized_keyword,
+                    user_id=user_id,
+                    project_id=project_id,
+                    status='generating'
+                ))
+
+            self.db.add_all(blueprints)
+            self.db.flush()
+            blueprint_ids = [blueprint.id for blueprint in blueprints]
+            if blueprints:
+                self._adjust_stats(user_id, total=len(blueprints),
+                                   created_at=max(blueprint.created_at for blueprint in blueprints))
+            for blueprint in blueprints:
+                self.search_index.index_blueprint(blueprint.id, user_id, blueprint.keyword, {})
+            self.db.commit()
+
+            return blueprint_ids
+
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Database error creating pending blueprints: {str(e)}")
+            raise Exception(f"Failed to create blueprints: Database error")
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error creating pending blueprints: {str(e)}")
+            raise Exception(f"Failed to create blueprints: {str(e)}")
+
+    def complete_blueprint(self, blueprint_id: str, blueprint_data: Dict[str, Any]) -> bool:
+        """
+        Fill in a pending blueprint with generated data and mark it completed.
+        
+        Args:
+            blueprint_id: ID of the pending blueprint
+            blueprint_data: Complete blueprint data dictionary
+            
+        Returns:
+            True if updated successfully, False otherwise
+        """
+        logger.info(f"Completing blueprint: {blueprint_id}")
+        
+        try:
+            if not validate_blueprint_data(blueprint_data):
+                raise Exception("Blueprint data validation failed")
+            
+            blueprint = self.db.query(Blueprint).filter(Blueprint.id == blueprint_id).first()
+            if not blueprint:
+                logger.warning(f"Blueprint not found for completion: {blueprint_id}")
+                return False
+            
+            metadata = blueprint_data.get('generation_metadata', {})
+            
+            for field, value in self._encode_payloads(blueprint_data).items():
+                setattr(blueprint, field, value)
+            blueprint.generation_time = metadata.get('generation_time')
+            completed = 0 if blueprint.status == 'completed' else 1
+            blueprint.status = 'completed'
+            blueprint.updated_at = datetime.utcnow()
+            
+            self._adjust_stats(blueprint.user_id, completed=completed)
+            self.search_index.index_blueprint(blueprint_id, blueprint.user_id, blueprint.keyword, blueprint_data)
+            self.db.commit()
+            logger.info(f"Blueprint completed successfully: {blueprint_id}")
+            return True
+            
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Database error completing blueprint: {str(e)}")
+            return False
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error completing blueprint: {str(e)}")
+            return False
+    
+    def get_blueprint(self, blueprint_id: str, user_id: str,
+                      sections: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """
         Retrieve a blueprint by ID with user ownership verification.
         
         Args:
             blueprint_id: ID of the blueprint to retrieve
             user_id: ID of the user requesting the blueprint
+            sections: Optional payload fields to load (default: all of them);
+                an empty list returns the metadata only
             
         Returns:
             Blueprint data dictionary or None if not found
+            
+        Raises:
+            ValueError: If a requested section is not a payload field
+            PayloadDecodeError: If a stored section cannot be decoded
         """
+        if sections is not None:
+            unknown = [field for field in sections if field not in Blueprint.PAYLOAD_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown blueprint sections: {', '.join(unknown)}")
+        
         logger.info(f"Retrieving blueprint: {blueprint_id} for user: {user_id}")
         
         try:
-            blueprint = self.db.query(Blueprint).filter(
+            # Payload columns are deferred; load only the requested ones in the same query
+            if sections is None:
+                options = [undefer_group('payload')]
+            else:
+                options = [undefer(getattr(Blueprint, field)) for field in sections]
+            
+            blueprint = self.db.query(Blueprint).options(*options).filter(
                 Blueprint.id == blueprint_id,
                 Blueprint.user_id == user_id
             ).first()
@@ -116,8 +333,12 @@ class BlueprintStorageService:
                 logger.warning(f"Blueprint not found: {blueprint_id}")
                 return None
             
-            return blueprint.to_dict()
+            return self._decode_payloads(blueprint.to_dict(sections))
             
+        except PayloadDecodeError as e:
+            # The row exists, so this must not look like a missing blueprint
+            logger.error(f"Failed to decode blueprint {blueprint_id}: {str(e)}")
+            raise
         except SQLAlchemyError as e:
             logger.error(f"Database error retrieving blueprint: {str(e)}")
             return None
@@ -127,7 +348,10 @@ class BlueprintStorageService:
     
     def list_user_blueprints(self, user_id: str, limit: int = 20, offset: int = 0, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        List blueprints for a user with pagination.
+        List blueprints for a user with offset pagination.
+        
+        Prefer list_user_blueprints_page, whose cost does not grow with the
+        page number.
         
         Args:
             user_id: ID of the user
@@ -141,15 +365,10 @@ class BlueprintStorageService:
         logger.info(f"Listing blueprints for user: {user_id} (limit: {limit}, offset: {offset})")
         
         try:
-            query = self.db.query(Blueprint).filter(Blueprint.user_id == user_id)
+            query = self._summary_query(user_id, project_id)
+            rows = query.order_by(Blueprint.created_at.desc(), Blueprint.id.desc()).offset(offset).limit(limit).all()
             
-            # Filter by project if specified
-            if project_id:
-                query = query.filter(Blueprint.project_id == project_id)
-            
-            blueprints = query.order_by(Blueprint.created_at.desc()).offset(offset).limit(limit).all()
-            
-            return [bp.to_summary() for bp in blueprints]
+            return [Blueprint.row_to_summary(row) for row in rows]
             
         except SQLAlchemyError as e:
             logger.error(f"Database error listing blueprints: {str(e)}")
@@ -158,6 +377,70 @@ class BlueprintStorageService:
             logger.error(f"Error listing blueprints: {str(e)}")
             return []
     
+    def list_user_blueprints_page(self, user_id: str, limit: int = 20, cursor: Optional[str] = None,
+                                  project_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        List blueprints for a user with keyset (cursor) pagination.
+        
+        Pages are ordered newest first on (created_at, id) and each page seeks
+        past the previous one through the (user_id, created_at, id) index.
+        
+        Args:
+            user_id: ID of the user
+            limit: Maximum number of blueprints to return
+            cursor: next_cursor of the previous page (None for the first page)
+            project_id: Optional project ID to filter by
+            
+        Returns:
+            Dictionary with 'blueprints' (summaries) and 'next_cursor'
+            (None on the last page)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        position = decode_page_cursor(cursor) if cursor else None
+        logger.info(f"Listing blueprints for user: {user_id} (limit: {limit}, cursor: {cursor})")
+        
+        try:
+            query = self._summary_query(user_id, project_id)
+            
+            if position:
+                created_at, blueprint_id = position
+                query = query.filter(or_(
+                    Blueprint.created_at < created_at,
+                    and_(Blueprint.created_at == created_at, Blueprint.id < blueprint_id)
+                ))
+            
+            # Fetch one extra row to know whether another page follows
+            rows = query.order_by(Blueprint.created_at.desc(), Blueprint.id.desc()).limit(limit + 1).all()
+            
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_page_cursor(rows[-1].created_at, rows[-1].id)
+            
+            return {
+                'blueprints': [Blueprint.row_to_summary(row) for row in rows],
+                'next_cursor': next_cursor
+            }
+            
+        except SQLAlchemyError as e:
+            logger.error(f"Database error listing blueprints: {str(e)}")
+            return {'blueprints': [], 'next_cursor': None}
+        except Exception as e:
+            logger.error(f"Error listing blueprints: {str(e)}")
+            return {'blueprints': [], 'next_cursor': None}
+    
+    def _summary_query(self, user_id: str, project_id: Optional[str] = None):
+        """Query selecting only summary columns of a user's blueprints."""
+        query = self.db.query(*Blueprint.summary_columns()).filter(Blueprint.user_id == user_id)
+        
+        # Filter by project if specified
+        if project_id:
+            query = query.filter(Blueprint.project_id == project_id)
+        
+        return query
+    
     def update_blueprint_status(self, blueprint_id: str, user_id: str, status: str) -> bool:
         """
         Update the status of a blueprint.
@@ -182,9 +465,12 @@ class BlueprintStorageService:
                 logger.warning(f"Blueprint not found for status update: {blueprint_id}")
                 return False
             
+            completed = (status == 'completed') - (blueprint.status == 'completed')
             blueprint.status = status
             blueprint.updated_at = datetime.utcnow()
             
+            if completed:
+                self._adjust_stats(user_id, completed=completed)
             self.db.commit()
             logger.info(f"Blueprint status updated successfully: {blueprint_id}")
             return True
@@ -197,7 +483,78 @@ class BlueprintStorageService:
             self.db.rollback()
             logger.error(f"Error updating blueprint status: {str(e)}")
             return False
+
+    def fail_orphaned_blueprints(self, older_than: datetime) -> int:
+        """
+        Mark blueprints left 'generating' by a process that stopped as 'failed'.
+        
+        Args:
+            older_than: Only rows last updated before this time are affected,
+                so jobs still running in other processes are left alone
+            
+        Returns:
+            Number of blueprints marked failed
+            
+        Raises:
+            Exception: If the database operation fails
+        """
+        try:
+            failed = self.db.query(Blueprint).filter(
+                Blueprint.status == 'generating',
+                or_(Blueprint.updated_at < older_than, Blueprint.updated_at.is_(None))
+            ).update({'status': 'failed', 'updated_at': datetime.utcnow()}, synchronize_session=False)
+            self.db.commit()
+            return failed
+            
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Database error failing orphaned blueprints: {str(e)}")
+            raise Exception("Failed to update orphaned blueprints: Database error")
     
+    def update_blueprint_statuses(self, updates: List[Tuple[str, str, str]]) -> int:
+        """
+        Update the status of many blueprints in one transaction.
+
+        Used by WriteBehindQueue for its batched status writes.
+
+        Args:
+            updates: (blueprint_id, user_id, status) tuples; blueprints not
+                owned by the given user are skipped
+
+        Returns:
+            Number of blueprints updated
+
+        Raises:
+            Exception: If the database operation fails
+        """
+        try:
+            targets = {blueprint_id: (user_id, status) for blueprint_id, user_id, status in updates}
+            blueprints = self.db.query(Blueprint).filter(Blueprint.id.in_(list(targets))).all() if targets else []
+
+            now = datetime.utcnow()
+            completed_by_user = {}
+            updated = 0
+            for blueprint in blueprints:
+                user_id, status = targets[blueprint.id]
+                if blueprint.user_id != user_id:
+                    continue
+                completed = (status == 'completed') - (blueprint.status == 'completed')
+                completed_by_user[user_id] = completed_by_user.get(user_id, 0) + completed
+                blueprint.status = status
+                blueprint.updated_at = now
+                updated += 1
+
+            for user_id, completed in completed_by_user.items():
+                if completed:
+                    self._adjust_stats(user_id, completed=completed)
+            self.db.commit()
+            return updated
+
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error(f"Database error updating blueprint statuses: {str(e)}")
+            raise Exception(f"Failed to update blueprint statuses: Database error")
+
     def delete_blueprint(self, blueprint_id: str, user_id: str) -> bool:
         """
         Delete a blueprint (with user ownership verification).
@@ -221,7 +578,10 @@ class BlueprintStorageService:
                 logger.warning(f"Blueprint not found for deletion: {blueprint_id}")
                 return False
             
+            completed = -1 if blueprint.status == 'completed' else 0
             self.db.delete(blueprint)
+            self._adjust_stats(user_id, total=-1, completed=completed, recompute_latest=True)
+            self.search_index.remove_blueprint(blueprint_id)
             self.db.commit()
             
             logger.info(f"Blueprint deleted successfully: {blueprint_id}")
@@ -238,7 +598,10 @@ class BlueprintStorageService:
     
     def search_blueprints(self, user_id: str, keyword_search: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        Search blueprints by keyword.
+        Search blueprints by keyword, headings and topics.
+        
+        Uses the full-text index (best matches first) where the database
+        supports it, otherwise a keyword LIKE scan (newest first).
         
         Args:
             user_id: ID of the user
@@ -251,12 +614,23 @@ class BlueprintStorageService:
         logger.info(f"Searching blueprints for user: {user_id}, search: {keyword_search}")
         
         try:
-            blueprints = self.db.query(Blueprint).filter(
-                Blueprint.user_id == user_id,
-                Blueprint.keyword.contains(keyword_search.lower())
-            ).order_by(Blueprint.created_at.desc()).limit(limit).all()
+            blueprint_ids = self.search_index.search(user_id, keyword_search, limit)
+            
+            if blueprint_ids is None:
+                rows = self._summary_query(user_id).filter(
+                    Blueprint.keyword.contains(keyword_search.lower())
+                ).order_by(Blueprint.created_at.desc(), Blueprint.id.desc()).limit(limit).all()
+                return [Blueprint.row_to_summary(row) for row in rows]
             
-            return [bp.to_summary() for bp in blueprints]
+            if not blueprint_ids:
+                return []
+            
+            # Already restricted to the user by the index; a primary-key lookup
+            # keeps the planner off the per-user index range
+            rows = {row.id: row for row in self.db.query(*Blueprint.summary_columns()).filter(
+                Blueprint.id.in_(blueprint_ids)
+            )}
+            return [Blueprint.row_to_summary(rows[blueprint_id]) for blueprint_id in blueprint_ids if blueprint_id in rows]
             
         except SQLAlchemyError as e:
             logger.error(f"Database error searching blueprints: {str(e)}")
@@ -265,6 +639,73 @@ class BlueprintStorageService:
             logger.error(f"Error searching blueprints: {str(e)}")
             return []
     
+    def _adjust_stats(self, user_id: str, total: int = 0, completed: int = 0,
+                      created_at: Optional[datetime] = None, recompute_latest: bool = False):
+        """
+        Apply a blueprint change to the user's stats row, within the current transaction.
+        
+        If the user has no stats row yet, it is created from their blueprints
+        (which, once flushed, already include the change).
+        
+        Args:
+            user_id: ID of the user
+            total: Change in the number of blueprints
+            completed: Change in the number of completed blueprints
+            created_at: Creation time of an added blueprint
+            recompute_latest: Re-read the latest creation time (after a delete)
+        """
+        self.db.flush()
+        values = {
+            UserBlueprintStats.total_blueprints: UserBlueprintStats.total_blueprints + total,
+            UserBlueprintStats.completed_blueprints: UserBlueprintStats.completed_blueprints + completed,
+            UserBlueprintStats.updated_at: datetime.utcnow()
+        }
+        if created_at is not None:
+            values[UserBlueprintStats.latest_blueprint_at] = case(
+                (or_(UserBlueprintStats.latest_blueprint_at.is_(None),
+                     UserBlueprintStats.latest_blueprint_at < created_at), created_at),
+                else_=UserBlueprintStats.latest_blueprint_at
+            )
+        if recompute_latest:
+            values[UserBlueprintStats.latest_blueprint_at] = select(func.max(Blueprint.created_at)).where(
+                Blueprint.user_id == user_id
+            ).scalar_subquery()
+        
+        updated = self.db.query(UserBlueprintStats).filter(
+            UserBlueprintStats.user_id == user_id
+        ).update(values, synchronize_session=False)
+        
+        if not updated and not self._create_stats(user_id):
+            # Another writer created the row first; its counts exclude this change
+            self.db.query(UserBlueprintStats).filter(
+                UserBlueprintStats.user_id == user_id
+            ).update(values, synchronize_session=False)
+    
+    def _create_stats(self, user_id: str) -> bool:
+        """
+        Insert a user's stats row computed from their blueprints in one grouped query.
+        
+        Returns:
+            True if inserted, False if the row already existed
+        """
+        total, completed, latest = self.db.query(
+            func.count(Blueprint.id),
+            func.coalesce(func.sum(case((Blueprint.status == 'completed', 1), else_=0)), 0),
+            func.max(Blueprint.created_at)
+        ).filter(Blueprint.user_id == user_id).one()
+        
+        try:
+            with self.db.begin_nested():
+                self.db.add(UserBlueprintStats(
+                    user_id=user_id,
+                    total_blueprints=total,
+                    completed_blueprints=completed,
+                    latest_blueprint_at=latest
+                ))
+            return True
+        except IntegrityError:
+            return False
+    
     def get_user_stats(self, user_id: str) -> Dict[str, Any]:
         """
         Get statistics about user's blueprints.
@@ -278,32 +719,29 @@ class BlueprintStorageService:
         logger.info(f"Getting stats for user: {user_id}")
         
         try:
-            # Count total blueprints
-            total_blueprints = self.db.query(Blueprint).filter(Blueprint.user_id == user_id).count()
-            
-            # Count by status
-            completed_blueprints = self.db.query(Blueprint).filter(
-                Blueprint.user_id == user_id,
-                Blueprint.status == 'completed'
-            ).count()
-            
-            # Count recent blueprints (last 30 days)
+            stats = self.db.get(UserBlueprintStats, user_id, populate_existing=True)
+            if stats is None:
+                # First read for this user (e.g. blueprints created before the stats table)
+                self._create_stats(user_id)
+                self.db.commit()
+                stats = self.db.get(UserBlueprintStats, user_id)
+            
+            # Sliding window, so it is counted rather than stored; the
+            # (user_id, created_at, id) index makes this an index range count
             thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            recent_blueprints = self.db.query(Blueprint).filter(
+            recent_blueprints = self.db.query(func.count(Blueprint.id)).filter(
                 Blueprint.user_id == user_id,
                 Blueprint.created_at >= thirty_days_ago
-            ).count()
+            ).scalar()
             
-            # Get most recent blueprint
-            latest_blueprint = self.db.query(Blueprint).filter(
-                Blueprint.user_id == user_id
-            ).order_by(Blueprint.created_at.desc()).first()
+            total_blueprints = stats.total_blueprints
+            completed_blueprints = stats.completed_blueprints
             
             return {
                 'total_blueprints': total_blueprints,
                 'completed_blueprints': completed_blueprints,
                 'recent_blueprints': recent_blueprints,
-                'latest_blueprint_date': latest_blueprint.created_at.isoformat() if latest_blueprint else None,
+                'latest_blueprint_date': stats.latest_blueprint_at.isoformat() if stats.latest_blueprint_at else None,
                 'success_rate': (completed_blueprints / total_blueprints * 100) if total_blueprints > 0 else 0
             }
             
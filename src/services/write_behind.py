@@ -0,0 +1,238 @@
+"""
+Write-Behind Queue - Batched background writes for small, frequent updates.
+
+Blueprint status changes and API usage counters are tiny writes that would
+otherwise each take the database write lock and commit on their own. The
+queue collects them in memory and a background thread writes everything
+pending once per flush interval: the statuses in one transaction on the
+blueprint database, the usage counters in another on the users database
+(Flask-SQLAlchemy). Repeated updates coalesce: the last status of a
+blueprint wins and usage increments are summed.
+"""
+
+import os
+import time
+import logging
+from threading import Condition, Thread
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import sessionmaker
+
+from .blueprint_storage import BlueprintStorageService
+from ..models.user import User, db
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def users_session_factory(app) -> Optional[Callable[[], Any]]:
+    """
+    Session factory for the users database of a Flask app, for usage counters.
+
+    Args:
+        app: Flask application
+
+    Returns:
+        A sessionmaker bound to the app's Flask-SQLAlchemy engine, or None if
+        the app does not use Flask-SQLAlchemy (the users table lives nowhere else)
+    """
+    if 'sqlalchemy' not in app.extensions:
+        return None
+    with app.app_context():
+        return sessionmaker(bind=db.engine)
+
+class WriteBehindQueue:
+    """
+    Queues blueprint status updates and usage counters for batched writes.
+
+    Writes are durable only once flushed: callers that need read-your-writes
+    (e.g. the status route) should keep writing synchronously. close() flushes
+    whatever is still pending.
+    """
+
+    def __init__(self, session_factory: Callable[[], Any], usage_session_factory: Optional[Callable[[], Any]] = None,
+                 flush_interval: Optional[float] = None, max_batch: Optional[int] = None, max_retries: int = 3):
+        """
+        Initialize the queue and start its writer thread.
+
+        Args:
+            session_factory: Callable returning a new blueprint database session for the writer thread
+            usage_session_factory: Callable returning a new users database session (see
+                users_session_factory); without one, usage counters cannot be queued
+            flush_interval: Seconds writes accumulate before a flush (defaults to WRITE_BEHIND_FLUSH_MS or 50ms)
+            max_batch: Pending writes that trigger an immediate flush (defaults to WRITE_BEHIND_MAX_BATCH or 500)
+            max_retries: Failed flushes of the same writes before they are dropped
+        """
+        self.session_factory = session_factory
+        self.usage_session_factory = usage_session_factory
+        self.flush_interval = (flush_interval if flush_interval is not None
+                               else int(os.getenv('WRITE_BEHIND_FLUSH_MS', 50)) / 1000)
+        self.max_batch = max_batch or int(os.getenv('WRITE_BEHIND_MAX_BATCH', 500))
+        self.max_retries = max_retries
+
+        self._statuses: Dict[str, Tuple[str, str]] = {}
+        self._usage: Dict[int, int] = {}
+        self._changed = Condition()
+        self._queued = 0  # Sequence number of the latest queued write
+        self._written = 0  # Sequence number of the latest write flushed (or dropped)
+        self._failures = {'statuses': 0, 'usage': 0}  # Consecutive failed flushes per kind of write
+        self._flush_requested = False
+        self._closed = False
+
+        self._thread = Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    @property
+    def accepts_usage(self) -> bool:
+        """Whether usage counters can be queued (the queue has a users database session factory)."""
+        return self.usage_session_factory is not None
+
+    def update_blueprint_status(self, blueprint_id: str, user_id: str, status: str):
+        """
+        Queue a blueprint status change (replaces a pending change of the same blueprint).
+
+        Args:
+            blueprint_id: ID of the blueprint to update
+            user_id: ID of the user (for ownership verification)
+            status: New status value
+        """
+        with self._changed:
+            self._statuses[blueprint_id] = (user_id, status)
+            self._enqueued()
+
+    def increment_api_usage(self, user_id: int, amount: int = 1):
+        """
+        Queue an increment of a user's API usage counter.
+
+        Args:
+            user_id: ID of the user
+            amount: Calls to add
+
+        Raises:
+            RuntimeError: If the queue has no users database session factory
+        """
+        if not self.accepts_usage:
+            raise RuntimeError("Write-behind queue has no users database for usage counters")
+        with self._changed:
+            self._usage[user_id] = self._usage.get(user_id, 0) + amount
+            self._enqueued()
+
+    def pending(self) -> int:
+        """Number of coalesced writes waiting for a flush."""
+        with self._changed:
+            return len(self._statuses) + len(self._usage)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write everything queued so far and wait for it.
+
+        Args:
+            timeout: Optional seconds to wait
+
+        Returns:
+            True if the queued writes were flushed (or dropped after repeated
+            failures), False on timeout
+        """
+        with self._changed:
+            target = self._queued
+            self._flush_requested = True
+            self._changed.notify_all()
+            return self._changed.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Flush pending writes and stop the writer thread."""
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        self._thread.join(timeout)
+
+    def _enqueued(self):
+        """Record a queued write (caller holds the lock)."""
+        self._queued += 1
+        pending = len(self._statuses) + len(self._usage)
+        # Wake the writer to start the flush interval, or to flush a full batch early
+        if pending == 1 or pending >= self.max_batch:
+            self._changed.notify_all()
+
+    def _run(self):
+        """Writer thread: collect writes for one interval, then write each kind in its own transaction."""
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._statuses or self._usage or self._closed)
+                if self._closed and not (self._statuses or self._usage):
+                    return
+
+                deadline = time.monotonic() + self.flush_interval
+                while not (self._closed or self._flush_requested
+                           or len(self._statuses) + len(self._usage) >= self.max_batch):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+
+                statuses, usage, sequence = self._statuses, self._usage, self._queued
+                self._statuses, self._usage = {}, {}
+                self._flush_requested = False
+
+            # A failure of one kind never holds back or drops the other
+            failed = [(kind, batch) for kind, batch, write in (
+                ('statuses', statuses, self._write_statuses),
+                ('usage', usage, self._write_usage)
+            ) if batch and not self._write(kind, write, batch)]
+
+            retrying = False
+            with self._changed:
+                for kind, batch in failed:
+                    if self._failures[kind] >= self.max_retries:
+                        logger.error(f"Dropping {len(batch)} pending {kind} writes "
+                                     f"after {self._failures[kind]} failed flushes")
+                        self._failures[kind] = 0
+                    elif kind == 'statuses':
+                        # Retry with the next batch; newer statuses win
+                        for blueprint_id, update_args in batch.items():
+                            self._statuses.setdefault(blueprint_id, update_args)
+                        retrying = True
+                    else:
+                        # Retry with the next batch; counts add up
+                        for user_id, amount in batch.items():
+                            self._usage[user_id] = self._usage.get(user_id, 0) + amount
+                        retrying = True
+                if not retrying:
+                    self._written = sequence
+                self._changed.notify_all()
+
+            if retrying and not self._closed:
+                time.sleep(self.flush_interval)
+
+    def _write(self, kind: str, write: Callable[[Any, Dict], None], batch: Dict) -> bool:
+        """Write one kind of batch in its own transaction. Returns False if it failed."""
+        session = (self.session_factory if kind == 'statuses' else self.usage_session_factory)()
+        try:
+            write(session, batch)
+            self._failures[kind] = 0
+            return True
+        except Exception as e:
+            session.rollback()
+            self._failures[kind] += 1
+            logger.warning(f"Write-behind flush of {kind} failed (attempt {self._failures[kind]}): {str(e)}")
+            return False
+        finally:
+            session.close()
+
+    def _write_statuses(self, session, statuses: Dict[str, Tuple[str, str]]):
+        """Write blueprint statuses on a blueprint database session (commits)."""
+        BlueprintStorageService(session).update_blueprint_statuses(
+            [(blueprint_id, user_id, status) for blueprint_id, (user_id, status) in statuses.items()]
+        )
+
+    def _write_usage(self, session, usage: Dict[int, int]):
+        """Add usage counters on a users database session (commits)."""
+        users = User.__table__
+        session.execute(
+            update(users).where(users.c.id == bindparam('user_id')).values(
+                api_calls_used=users.c.api_calls_used + bindparam('amount')
+            ),
+            [{'user_id': user_id, 'amount': amount} for user_id, amount in usage.items()]
+        )
+        session.commit()
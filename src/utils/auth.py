@@ -10,7 +10,12 @@ from datetime import datetime, timedelta, timezone
 from functools import wraps
 from typing import Optional, Dict, Any, Tuple
 from flask import current_app, request, jsonify, g
-from src.models.user import User
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from src.models.user import User, db
+from src.utils.user_cache import get_user_cache
 
 class AuthError(Exception):
     """Custom exception for authentication errors."""
@@ -169,6 +174,50 @@ class SecurityUtils:
         # Allow relative URLs starting with /
         return target.startswith('/')
 
+# Cached user lookups
+def load_user(user_id: int) -> Optional[User]:
+    """
+    Get a user attached to the current session, from the user cache when possible.
+    
+    A cache hit is merged into the session without a query, so routes can
+    read the user or change it and commit as usual.
+    """
+    cache = get_user_cache()
+    version = cache.version(user_id)
+    values = cache.get(user_id, version)
+    if values is None:
+        user = db.session.get(User, user_id)
+        if user is not None:
+            cache.set(user_id, version, {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+        return user
+    
+    user = User(**values)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user from the user cache (every process-local copy is re-read)."""
+    get_user_cache().invalidate(user_id)
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _track_changed_user(mapper, connection, target):
+    """Remember users written in a flush, to invalidate once the commit succeeds."""
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('changed_user_ids', set()).add(target.id)
+
+@event.listens_for(FlaskSession, 'after_commit')
+def _invalidate_changed_users(session):
+    """Invalidate users changed by a committed transaction (profile, password, deactivation)."""
+    for user_id in session.info.pop('changed_user_ids', ()):
+        invalidate_cached_user(user_id)
+
+@event.listens_for(FlaskSession, 'after_rollback')
+def _forget_changed_users(session):
+    """Rolled back changes leave the cached rows valid."""
+    session.info.pop('changed_user_ids', None)
+
 # Authentication decorators
 def token_required(f):
     """Decorator to require valid JWT token for route access."""
@@ -193,8 +242,8 @@ def token_required(f):
                     'code': 'INVALID_TOKEN_TYPE'
                 }), 401
             
-            # Get user from database
-            user = User.query.get(payload['user_id'])
+            # Get user from the user cache, or the database on a miss
+            user = load_user(payload['user_id'])
             if not user:
                 return jsonify({
                     'error': 'User not found',
@@ -263,8 +312,15 @@ def api_limit_required(f):
                 }
             }), 429
         
-        # Increment usage counter
-        user.increment_api_usage()
+        # Increment usage counter, batched by the write-behind queue when the app has one
+        write_queue = current_app.config.get('WRITE_BEHIND_QUEUE')
+        if write_queue and write_queue.accepts_usage:
+            write_queue.increment_api_usage(user.id)
+            # Keep the loaded and cached user in step without marking it dirty (the queue owns the write)
+            set_committed_value(user, 'api_calls_used', user.api_calls_used + 1)
+            get_user_cache().update(user.id, api_calls_used=user.api_calls_used)
+        else:
+            user.increment_api_usage()
         
         return f(*args, **kwargs)
     
@@ -19,10 +19,20 @@ from bs4 import BeautifulSoup
 import concurrent.futures
 from threading import Lock
 
+from .host_scheduler import HostScheduler, get_host_scheduler
+from .page_cache import PageCache, get_page_cache, content_hash, normalize_url
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .html_extractor import build_links, build_images, extract_page, lxml_available
+from .single_flight import SingleFlight
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Coalesces concurrent scrapes of the same URL across every scraper instance,
+# e.g. competitor pages that rank for several keywords of a batch
+_url_flight = SingleFlight()
+
 class BrowserContentScraper:
     """
     A reliable content scraper with enhanced browser simulation and error handling.
@@ -30,19 +40,35 @@ class BrowserContentScraper:
     This class provides robust web scraping with anti-bot detection countermeasures.
     """
     
-    def __init__(self, headless: bool = True):
+    # Per-request timeouts in seconds (requests ignores a timeout set on the Session)
+    REQUEST_TIMEOUT = 15
+    RETRY_TIMEOUT = 25
+    
+    def __init__(self, headless: bool = True, scheduler: Optional[HostScheduler] = None,
+                 page_cache: Optional[PageCache] = None, engine: Optional[str] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
         """
         Initialize the content scraper.
         
         Args:
             headless: Kept for compatibility (not used in requests-based implementation)
+            scheduler: Host politeness scheduler (defaults to the shared process-wide one)
+            page_cache: Scraped page cache (defaults to the shared process-wide one)
+            engine: HTML extraction engine, 'lxml' or 'bs4' (defaults to SCRAPER_HTML_ENGINE,
+                using lxml when it is installed)
+            rate_limiter: Rate limiter holding the node-wide 'browser_scraping' quota
+                (defaults to the shared one)
         """
         self.headless = headless
         self.session = None
         self._lock = Lock()
-        self.last_request_time = 0
-        self.min_request_interval = 2.0  # 2 seconds between requests
-        self.failed_urls = set()  # Track failed URLs to avoid repeated attempts
+        self.scheduler = scheduler if scheduler is not None else get_host_scheduler()
+        self.page_cache = page_cache if page_cache is not None else get_page_cache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        self.engine = (engine or os.getenv('SCRAPER_HTML_ENGINE', 'lxml')).lower()
+        if self.engine == 'lxml' and not lxml_available():
+            logger.warning("lxml not installed, falling back to BeautifulSoup extraction")
+            self.engine = 'bs4'
         self._setup_session()
         
     def _setup_session(self):
@@ -76,9 +102,6 @@ class BrowserContentScraper:
             'Sec-Fetch-User': '?1',
             'Cache-Control': 'max-age=0',
         })
-        
-        # Set longer timeout for better success rate
-        self.session.timeout = 15
     
     def _get_random_user_agent(self) -> str:
         """Get a random realistic user agent to avoid detection."""
@@ -101,21 +124,6 @@ class BrowserContentScraper:
         ]
         return random.choice(user_agents)
     
-    def _rate_limit(self):
-        """Rate limiting with random variation to appear more human-like."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        # Add random variation to delays (1.5-3 seconds)
-        min_delay = self.min_request_interval + random.uniform(-0.5, 1.0)
-        
-        if time_since_last_request < min_delay:
-            sleep_time = min_delay - time_since_last_request
-            logger.info(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
-    
     def __enter__(self):
         """Context manager entry point."""
         return self
@@ -135,92 +143,103 @@ class BrowserContentScraper:
             self.session = None
         logger.info("Content scraper closed successfully")
     
-    def scrape_content(self, url: str, retry_count: int = 0) -> Dict[str, Any]:
+    def scrape_content(self, url: str, retry_count: int = 0, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Scrape content from a web page with enhanced error handling.
         
+        Results are served from the page cache while fresh. Stale entries are
+        revalidated with a conditional GET, and recently failed URLs are
+        skipped until their negative cache entry expires. Concurrent scrapes
+        of the same normalized URL share one fetch.
+        
         Args:
             url: URL of the web page to scrape
             retry_count: Current retry attempt (for internal use)
+            force_refresh: Ignore cached results and failures
             
         Returns:
             Dictionary containing scraped content or error info
         """
-        logger.info(f"Scraping content from URL: {url}")
+        if retry_count > 0:
+            return self._scrape(url, retry_count, force_refresh)
         
-        # Check if URL previously failed
-        if url in self.failed_urls and retry_count == 0:
-            logger.warning(f"Skipping previously failed URL: {url}")
-            return self._get_error_result(url, "Previously failed - skipping to avoid repeated failures")
+        result, shared = _url_flight.do(
+            (normalize_url(url), force_refresh),
+            lambda emit: self._scrape(url, 0, force_refresh)
+        )
+        if shared:
+            logger.info(f"Reused in-flight scrape of URL: {url}")
+            return dict(result)
+        return result
+    
+    def _scrape(self, url: str, retry_count: int = 0, force_refresh: bool = False) -> Dict[str, Any]:
+        """Fetch and extract a page (see scrape_content)."""
+        logger.info(f"Scraping content from URL: {url}")
         
-        # Rate limit to be polite
-        self._rate_limit()
+        cached = None
+        if not force_refresh:
+            # Check if URL failed recently
+            failure = self.page_cache.get_failure(url) if retry_count == 0 else None
+            if failure:
+                logger.warning(f"Skipping recently failed URL: {url}")
+                return self._get_error_result(
+                    url, f"Previously failed - skipping to avoid repeated failures ({failure['error']})",
+                    failure['status_code']
+                )
+            
+            cached = self.page_cache.get(url)
+            if cached and cached['fresh']:
+                logger.info(f"Page cache hit for URL: {url}")
+                return self._cached_result(cached['result'])
         
         try:
-            # Refresh user agent for retry attempts
+            # Retries get a fresh User-Agent and a longer timeout, set per request
+            # because the session is shared by concurrent scrape_many workers
+            headers = {}
+            timeout = self.REQUEST_TIMEOUT
             if retry_count > 0:
-                self.session.headers['User-Agent'] = self._get_random_user_agent()
+                headers['User-Agent'] = self._get_random_user_agent()
+                timeout = self.RETRY_TIMEOUT
                 logger.info(f"Retry attempt {retry_count} with new User-Agent")
             
-            # Make the request
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
-                script.decompose()
-            
-            # Extract page title
-            title_tag = soup.find('title')
-            title = title_tag.get_text().strip() if title_tag else ""
-            
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if not meta_desc:
-                meta_desc = soup.find('meta', attrs={'property': 'og:description'})
-            description = meta_desc.get('content', '').strip() if meta_desc else ""
+            # Revalidate a stale cache entry instead of downloading it again
+            if cached:
+                if cached['etag']:
+                    headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    headers['If-Modified-Since'] = cached['last_modified']
             
-            # Extract main content
-            main_content = self._extract_main_content(soup)
+            # Make the request once the host scheduler grants a polite slot
+            with self.scheduler.slot(url, priority=retry_count):
+                self.rate_limiter.wait_if_needed('browser_scraping')
+                response = self.session.get(url, headers=headers, timeout=timeout)
+            self.scheduler.report(url, response.status_code, response.headers.get('Retry-After'))
             
-            # Extract headings
-            headings = self._extract_headings(soup)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
             
-            # Extract links
-            links = self._extract_links(soup, url)
+            if cached and response.status_code == 304:
+                logger.info(f"Cached content still valid for URL: {url}")
+                self.page_cache.touch(url, etag, last_modified)
+                return self._cached_result(cached['result'])
             
-            # Extract images
-            images = self._extract_images(soup, url)
-            
-            # Calculate word count
-            word_count = len(main_content.split())
-            
-            # Get domain
-            domain = urlparse(url).netloc
+            response.raise_for_status()
             
-            # Calculate content metrics
-            content_metrics = self._calculate_content_metrics(main_content, headings, links["all"], images)
+            # Skip parsing when the body is byte-for-byte what we extracted before
+            body_hash = content_hash(response.text)
+            if cached and cached['content_hash'] == body_hash:
+                logger.info(f"Content unchanged for URL: {url}")
+                self.page_cache.set(url, cached['result'], body_hash, etag, last_modified)
+                return self._cached_result(cached['result'])
             
-            # Compile results
-            result = {
-                "url": url,
-                "title": title,
-                "description": description,
-                "meta_description": description,
-                "main_content": main_content,
-                "headings": headings,
-                "links": links,
-                "images": images,
-                "word_count": word_count,
-                "domain": domain,
-                "content_metrics": content_metrics,
+            result = self._extract_page(response.text, url)
+            result.update({
                 "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
                 "status_code": response.status_code,
                 "retry_count": retry_count
-            }
+            })
+            
+            self.page_cache.set(url, result, body_hash, etag, last_modified)
             
             logger.info(f"Successfully scraped content from URL: {url}")
             return result
@@ -233,28 +252,124 @@ class BrowserContentScraper:
             logger.error(f"Unexpected error scraping URL {url}: {str(e)}")
             return self._get_error_result(url, f"Unexpected error: {str(e)}")
     
+    def _extract_page(self, html: str, url: str) -> Dict[str, Any]:
+        """Extract title, description, content, headings, links, images and metrics from HTML."""
+        extracted = extract_page(html, url) if self.engine == 'lxml' else None
+        if extracted is None:
+            extracted = self._extract_page_bs4(html, url)
+        
+        main_content = extracted["main_content"]
+        content_metrics = self._calculate_content_metrics(
+            main_content, extracted["headings"], extracted["links"]["all"], extracted["images"]
+        )
+        
+        return {
+            "url": url,
+            "title": extracted["title"],
+            "description": extracted["description"],
+            "meta_description": extracted["description"],
+            "main_content": main_content,
+            "headings": extracted["headings"],
+            "links": extracted["links"],
+            "images": extracted["images"],
+            "word_count": len(main_content.split()),
+            "domain": urlparse(url).netloc,
+            "content_metrics": content_metrics
+        }
+    
+    def _extract_page_bs4(self, html: str, url: str) -> Dict[str, Any]:
+        """Extract page fields with BeautifulSoup (used when lxml is unavailable)."""
+        # Parse the HTML
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Remove script and style elements
+        for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
+            script.decompose()
+        
+        # Extract page title
+        title_tag = soup.find('title')
+        title = title_tag.get_text().strip() if title_tag else ""
+        
+        # Extract meta description
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if not meta_desc:
+            meta_desc = soup.find('meta', attrs={'property': 'og:description'})
+        description = meta_desc.get('content', '').strip() if meta_desc else ""
+        
+        # Extract main content
+        main_content = self._extract_main_content(soup)
+        
+        # Extract headings
+        headings = self._extract_headings(soup)
+        
+        # Extract links
+        links = self._extract_links(soup, url)
+        
+        # Extract images
+        images = self._extract_images(soup, url)
+        
+        return {
+            "title": title,
+            "description": description,
+            "main_content": main_content,
+            "headings": headings,
+            "links": links,
+            "images": images
+        }
+    
+    def _cached_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Mark a result as served from the page cache."""
+        result = dict(result)
+        result["from_cache"] = True
+        return result
+    
+    def scrape_many(self, urls: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Scrape several URLs concurrently.
+        
+        The host scheduler dispatches whichever URL's host is ready next, so
+        slow or backed-off hosts don't hold up the rest of the batch.
+        
+        Args:
+            urls: URLs to scrape
+            max_workers: Worker threads (defaults to the scheduler's concurrency cap)
+            
+        Returns:
+            Scrape results in the same order as ``urls``
+        """
+        if not urls:
+            return []
+        
+        workers = min(len(urls), max_workers or self.scheduler.max_concurrency)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scraper') as executor:
+            return list(executor.map(self.scrape_content, urls))
+    
     def _handle_http_error(self, url: str, error: requests.exceptions.HTTPError, retry_count: int) -> Dict[str, Any]:
         """Handle HTTP errors with appropriate retry logic."""
-        status_code = error.response.status_code if error.response else 0
+        status_code = error.response.status_code if error.response is not None else 0
         
         if status_code == 403:
             logger.warning(f"403 Forbidden for URL {url} - website blocking automated access")
-            self.failed_urls.add(url)  # Mark as failed to avoid future attempts
-            return self._get_error_result(url, f"403 Forbidden - Website blocks automated access", status_code)
+            error_msg = "403 Forbidden - Website blocks automated access"
+            self.page_cache.record_failure(url, error_msg, status_code, kind='blocked')
+            return self._get_error_result(url, error_msg, status_code)
         
         elif status_code == 429:
             if retry_count < 2:
-                wait_time = (retry_count + 1) * 5  # 5, 10 seconds
-                logger.warning(f"Rate limited for URL {url}, waiting {wait_time} seconds before retry")
-                time.sleep(wait_time)
+                # The host scheduler already backs the host off (honouring Retry-After)
+                logger.warning(f"Rate limited for URL {url}, retrying once the host backoff expires")
                 return self.scrape_content(url, retry_count + 1)
             else:
                 logger.error(f"Rate limit exceeded for URL {url} after {retry_count} retries")
-                return self._get_error_result(url, f"Rate limit exceeded after {retry_count} retries", status_code)
+                error_msg = f"Rate limit exceeded after {retry_count} retries"
+                self.page_cache.record_failure(url, error_msg, status_code)
+                return self._get_error_result(url, error_msg, status_code)
         
         elif status_code in [404, 410]:
             logger.warning(f"Content not found for URL {url} (HTTP {status_code})")
-            return self._get_error_result(url, f"Content not found (HTTP {status_code})", status_code)
+            error_msg = f"Content not found (HTTP {status_code})"
+            self.page_cache.record_failure(url, error_msg, status_code, kind='not_found')
+            return self._get_error_result(url, error_msg, status_code)
         
         elif status_code >= 500 and retry_count < 1:
             logger.warning(f"Server error for URL {url} (HTTP {status_code}), retrying...")
@@ -263,7 +378,9 @@ class BrowserContentScraper:
         
         else:
             logger.error(f"HTTP error for URL {url}: {status_code}")
-            return self._get_error_result(url, f"HTTP {status_code} error", status_code)
+            error_msg = f"HTTP {status_code} error"
+            self.page_cache.record_failure(url, error_msg, status_code)
+            return self._get_error_result(url, error_msg, status_code)
     
     def _handle_request_error(self, url: str, error: requests.exceptions.RequestException, retry_count: int) -> Dict[str, Any]:
         """Handle request errors with retry logic."""
@@ -271,12 +388,12 @@ class BrowserContentScraper:
         
         if "timeout" in error_msg.lower() and retry_count < 1:
             logger.warning(f"Timeout for URL {url}, retrying with longer timeout...")
-            self.session.timeout = 25  # Increase timeout for retry
             time.sleep(2)
             return self.scrape_content(url, retry_count + 1)
         
         elif "connection" in error_msg.lower():
             logger.error(f"Connection error for URL {url}: {error_msg}")
+            self.page_cache.record_failure(url, f"Connection error: {error_msg}")
             return self._get_error_result(url, f"Connection error: {error_msg}")
         
         else:
@@ -338,82 +455,27 @@ class BrowserContentScraper:
     
     def _extract_links(self, soup: BeautifulSoup, base_url: str) -> Dict[str, Any]:
         """Extract links from the page."""
-        links = []
-        domain = urlparse(base_url).netloc
-        
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            text = link.get_text(strip=True)
-            
-            # Skip empty hrefs, anchors, and javascript
-            if not href or href.startswith('#') or href.startswith('javascript:') or href.startswith('mailto:'):
-                continue
-            
-            # Convert relative URLs to absolute
-            if href.startswith('/'):
-                href = urljoin(base_url, href)
-            elif not href.startswith(('http://', 'https://')):
-                href = urljoin(base_url, href)
-            
-            # Clean up the link text
-            if not text:
-                text = link.get('title', '') or link.get('aria-label', '') or ''
-            
-            if href:  # Only add if we have a valid URL
-                links.append({
-                    'text': text[:200],  # Limit text length
-                    'url': href
-                })
-        
-        # Categorize links
-        internal_links = []
-        external_links = []
-        
-        for link in links:
-            if domain in urlparse(link['url']).netloc:
-                internal_links.append(link)
-            else:
-                external_links.append(link)
-        
-        return {
-            "internal": internal_links,
-            "external": external_links,
-            "all": links,
-            "total": len(links)
-        }
+        return build_links([
+            {
+                'href': link['href'],
+                'text': link.get_text(strip=True),
+                'title': link.get('title', ''),
+                'aria_label': link.get('aria-label', '')
+            }
+            for link in soup.find_all('a', href=True)
+        ], base_url)
     
     def _extract_images(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
         """Extract images from the page."""
-        images = []
-        
-        for img in soup.find_all('img'):
-            src = img.get('src') or img.get('data-src')  # Handle lazy loading
-            if not src:
-                continue
-            
-            # Convert relative URLs to absolute
-            if src.startswith('/'):
-                src = urljoin(base_url, src)
-            elif not src.startswith(('http://', 'https://')):
-                src = urljoin(base_url, src)
-            
-            alt = img.get('alt', '').strip()
-            
-            # Skip very small images (likely icons/tracking pixels)
-            width = img.get('width', 0)
-            height = img.get('height', 0)
-            try:
-                if width and height and (int(width) < 50 or int(height) < 50):
-                    continue
-            except (ValueError, TypeError):
-                pass
-            
-            images.append({
-                'alt': alt,
-                'src': src
-            })
-        
-        return images
+        return build_images([
+            {
+                'src': img.get('src') or img.get('data-src'),  # Handle lazy loading
+                'alt': img.get('alt', ''),
+                'width': img.get('width', 0),
+                'height': img.get('height', 0)
+            }
+            for img in soup.find_all('img')
+        ], base_url)
     
     def _calculate_content_metrics(self, content: str, headings: List[Dict[str, str]], 
                                  links: List[Dict[str, str]], images: List[Dict[str, str]]) -> Dict[str, Any]:
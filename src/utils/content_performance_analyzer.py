@@ -3,7 +3,7 @@ from typing import Dict, Any, List, Optional
 from collections import Counter
 import statistics
 
-from .gemini_nlp_client import GeminiNLPClient
+from .gemini_nlp_client import GeminiNLPClient, get_gemini_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -12,14 +12,15 @@ logger = logging.getLogger(__name__)
 class ContentPerformanceAnalyzer:
   
     
-    def __init__(self, gemini_api_key: str):
+    def __init__(self, gemini_api_key: str, gemini_client: Optional[GeminiNLPClient] = None):
         """
         Initialize the content performance analyzer.
         
         Args:
             gemini_api_key: Gemini API key for content analysis
+            gemini_client: Shared Gemini client (defaults to the registry's client for the key)
         """
-        self.gemini_client = GeminiNLPClient(api_key=gemini_api_key)
+        self.gemini_client = gemini_client or get_gemini_client(gemini_api_key)
     
     def analyze_real_content_patterns(self, competitor_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
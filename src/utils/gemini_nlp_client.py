@@ -5,16 +5,32 @@ This module provides integration with Google's Gemini API for natural language p
 """
 
 import os
+import asyncio
 import logging
 import json
 import random
 import re
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from .llm_cache import LLMCache, get_llm_cache
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .sqlite_cache import LazySingleton
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL = 'gemini-2.0-flash'
+
+# Batch analysis limits
+BATCH_MAX_CHARS_PER_DOCUMENT = 6000  # Documents are truncated to this many characters
+BATCH_MAX_TOKENS = 16000  # Approximate prompt token budget of one batched request
+BATCH_MAX_DOCUMENTS = 8  # Documents packed into one batched request
+BATCH_FALLBACK_WORKERS = 4  # Concurrent single-document requests for documents a batch missed
+CHARS_PER_TOKEN = 4  # Rough token estimate used for the budget
+
 class GeminiNLPClient:
     """
     Gemini API client for NLP tasks.
@@ -22,15 +38,23 @@ class GeminiNLPClient:
     This class provides methods for natural language processing using Google's Gemini API.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[LLMCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
         """
         Initialize the Gemini API client.
         
         Args:
             api_key: Gemini API key
+            cache: Response cache (defaults to the shared process-wide cache)
+            rate_limiter: Rate limiter holding the 'gemini' quota (defaults to the shared one)
         """
         self.api_key = api_key
         self.client = None
+        self.model_name = DEFAULT_MODEL
+        self.cache = cache if cache is not None else get_llm_cache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        self._model = None
+        self._model_lock = Lock()
         
         # Try to initialize the client if API key is provided
         if api_key:
@@ -50,12 +74,16 @@ class GeminiNLPClient:
         else:
             logger.warning("Gemini API key not provided, using fallback analysis")
     
-    def generate_content(self, prompt: str) -> str:
+    def generate_content(self, prompt: str, use_cache: bool = True,
+                         validate: Optional[Callable[[str], bool]] = None) -> str:
         """
         Generate content using Gemini API.
         
         Args:
             prompt: Prompt for content generation
+            use_cache: Set to False for prompts that must get a fresh response
+            validate: Optional check that the response is usable (e.g. parses as
+                the expected JSON); responses failing it are never cached
             
         Returns:
             Generated content as string
@@ -69,21 +97,63 @@ class GeminiNLPClient:
         
         try:
             # Generate content using Gemini API
-            logging.info("Using Gemini model: gemini-2.0-flash (free tier)")
-            model = self.client.GenerativeModel('gemini-2.0-flash')
-            response = model.generate_content(prompt)
+            response_text, from_cache = self._generate_text(prompt, use_cache)
             
-            # Extract text from response
-            if hasattr(response, 'text'):
-                return response.text
-            else:
-                # Handle different response formats
-                return str(response)
+            if from_cache and validate and not validate(response_text):
+                # Unusable entry cached before validation: ask the model again
+                response_text, from_cache = self._generate_text(prompt, use_cache=False)
+            
+            if use_cache and not from_cache and (validate is None or validate(response_text)):
+                self.cache.set(self.model_name, prompt, response_text)
+            
+            return response_text
             
         except Exception as e:
             logger.error(f"Error generating content: {str(e)}")
             return self._generate_fallback_content(prompt)
     
+    def _generate_text(self, prompt: str, use_cache: bool = True) -> Tuple[str, bool]:
+        """
+        Get the model's response to a prompt, from the cache when possible.
+        
+        Responses are not written back here; callers store them once they
+        know the response is usable.
+        
+        Args:
+            prompt: Prompt to send
+            use_cache: Whether to look the prompt up in the response cache
+            
+        Returns:
+            Tuple of (response text, whether it came from the cache)
+        """
+        if use_cache:
+            cached = self.cache.get(self.model_name, prompt)
+            if cached is not None:
+                return cached, True
+        
+        self.rate_limiter.wait_if_needed('gemini')
+        response = self._get_model().generate_content(prompt)
+        
+        return self._response_text(response), False
+    
+    @staticmethod
+    def _response_text(response) -> str:
+        """Extract the text of a Gemini response."""
+        if hasattr(response, 'text'):
+            return response.text
+        
+        # Handle different response formats
+        return str(response)
+    
+    def _get_model(self):
+        """Get the GenerativeModel, constructing it on first use only."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    logging.info(f"Using Gemini model: {self.model_name} (free tier)")
+                    self._model = self.client.GenerativeModel(self.model_name)
+        return self._model
+    
     def _generate_fallback_content(self, prompt: str) -> str:
         """
         Generate fallback content when API is not available.
@@ -227,12 +297,13 @@ class GeminiNLPClient:
         5. Future Trends and Emerging Opportunities
         """
     
-    def analyze_text(self, text: str) -> Dict[str, Any]:
+    def analyze_text(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Analyze text using Gemini API.
         
         Args:
             text: Text to analyze
+            use_cache: Set to False to bypass the response cache
             
         Returns:
             Dictionary containing analysis results
@@ -244,129 +315,19 @@ class GeminiNLPClient:
             logger.warning("Using fallback analysis")
             return self._analyze_text_fallback(text)
         
+        response_text = None
         try:
-            # Analyze text using Gemini API
-            logging.info("Using Gemini model: gemini-2.0-flash (free tier)")
-            model = self.client.GenerativeModel('gemini-2.0-flash')
-            
             # Create a structured prompt for analysis
-            analysis_prompt = f"""
-            Your task is to analyze the provided text and return a structured JSON response.
-            Do not include any conversational text, introductions, explanations, or markdown formatting around the JSON output.
-            The response should be only the JSON object itself.
-
-            Analyze the following text:
-            ---
-            {text}
-            ---
-
-            The JSON response must include these components:
-            1. entities: An array of extracted key entities (people, organizations, concepts, etc.). Each entity object should have "name", "type", and "salience".
-            2. sentiment: An object determining the overall sentiment (positive, negative, neutral), with "score" and "magnitude" fields.
-            3. categories: An array classifying the text into relevant categories. Each category object should have "name" and "confidence".
-            4. language: A string identifying the language (e.g., "en").
-
-            Format your response strictly as a single JSON object with these exact keys: "entities", "sentiment", "categories", "language".
-            Example of the expected JSON structure:
-            {{
-              "entities": [{{"name": "example entity", "type": "EVENT", "salience": 0.9}}],
-              "sentiment": {{"score": 0.5, "magnitude": 0.8}},
-              "categories": [{{"name": "/Technology/Internet", "confidence": 0.7}}],
-              "language": "en"
-            }}
-            
-            Again, provide *only* the JSON object as your response.
-            """
-            
-            response = model.generate_content(analysis_prompt)
-            
-            # Extract text from response
-            if hasattr(response, 'text'):
-                response_text = response.text
-            else:
-                response_text = str(response)
+            analysis_prompt = self._build_analysis_prompt(text)
             
-            # Try to parse JSON from response
-            parsed_result = None
-            json_str_for_parsing = None # To store the string that was attempted for parsing, for logging
-
-            # Attempt 1: Markdown
-            # Ensure re is imported (it's at the top of the file, so no need for local import)
-            json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-            if json_match:
-                json_str_for_parsing = json_match.group(1).strip()
-                try:
-                    parsed_result = json.loads(json_str_for_parsing)
-                    logger.info("Successfully parsed JSON from markdown block (Attempt 1).")
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Attempt 1 (markdown) failed: JSONDecodeError - {str(e)} on content snippet: '{json_str_for_parsing[:100]}...'")
-                    parsed_result = None # Ensure it's None if parsing fails
-
-            # Attempt 2: First '{' to last '}'
-            if parsed_result is None:
-                try:
-                    first_brace = response_text.find('{')
-                    last_brace = response_text.rfind('}')
-                    if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
-                        json_str_for_parsing = response_text[first_brace : last_brace + 1]
-                        parsed_result = json.loads(json_str_for_parsing)
-                        logger.info("Successfully parsed JSON from first '{' to last '}' (Attempt 2).")
-                    else:
-                        # This case might not need logging if no braces found, or a less severe log.
-                        # logger.warning("Attempt 2 (first-last brace) failed: Could not find valid start/end braces or they were inverted.")
-                        pass # Not necessarily an error if no braces, just means this method won't work
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Attempt 2 (first-last brace) failed: JSONDecodeError - {str(e)} on content snippet: '{json_str_for_parsing[:100]}...'")
-                    parsed_result = None
-
-            # Attempt 3: From known key '"entities":'
-            if parsed_result is None:
-                json_str_for_parsing = None # Reset for this attempt's logging
-                try:
-                    known_key_start = response_text.find('"entities":')
-                    if known_key_start != -1:
-                        json_start_brace = response_text.rfind('{', 0, known_key_start)
-                        if json_start_brace != -1:
-                            potential_json_str = response_text[json_start_brace:]
-                            open_braces = 0
-                            json_end_brace = -1
-                            # Iterate to find the matching closing brace for json_start_brace
-                            for i, char in enumerate(potential_json_str):
-                                if char == '{':
-                                    open_braces += 1
-                                elif char == '}':
-                                    open_braces -= 1
-                                    if open_braces == 0:
-                                        json_end_brace = i
-                                        break
-                            
-                            if json_end_brace != -1:
-                                json_str_for_parsing = potential_json_str[:json_end_brace + 1]
-                                parsed_result = json.loads(json_str_for_parsing)
-                                logger.info("Successfully parsed JSON from known key substring with balanced braces (Attempt 3).")
-                            else:
-                                logger.warning("Attempt 3 (known key) failed: Could not find a balanced JSON object from the potential start.")
-                        else:
-                            logger.warning("Attempt 3 (known key) failed: Could not find an opening brace '{' before the known key.")
-                    else:
-                        # logger.warning("Attempt 3 (known key) failed: Known key '\"entities\":' not found in response.")
-                        pass # Not an error if key isn't there, just means this method won't work
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Attempt 3 (known key) failed: JSONDecodeError - {str(e)} on content snippet: '{json_str_for_parsing[:100] if json_str_for_parsing else 'N/A'}...'")
-                    parsed_result = None
-            
-            # After all attempts:
-            if parsed_result:
-                result = parsed_result
-                # Ensure required keys exist
-                if "entities" not in result:
-                    result["entities"] = []
-                if "sentiment" not in result:
-                    result["sentiment"] = {"score": 0, "magnitude": 0}
-                if "categories" not in result:
-                    result["categories"] = []
-                if "language" not in result:
-                    result["language"] = "en"
+            # Analyze text using Gemini API
+            response_text, from_cache = self._generate_text(analysis_prompt, use_cache)
+            
+            result = self._parse_analysis_response(response_text)
+            if result:
+                # Only cache responses that parsed into a usable analysis
+                if use_cache and not from_cache:
+                    self.cache.set(self.model_name, analysis_prompt, response_text)
                 return result
             else:
                 # Log the failure to parse and fall back
@@ -377,13 +338,146 @@ class GeminiNLPClient:
 
         except Exception as e: # This is the outer try-except for the API call itself
             # Check if response_text was defined (i.e., API call was made and returned something)
-            response_text_available = 'response_text' in locals() or 'response_text' in globals()
-            if response_text_available and response_text: # response_text might be defined but empty
+            if response_text: # response_text might be defined but empty
                  logger.error(f"Error during Gemini API call or response processing. Raw Gemini API response was: {response_text}. Error: {str(e)}", exc_info=True)
             else:
                  logger.error(f"Error during Gemini API call or response processing: {str(e)}", exc_info=True)
             return self._analyze_text_fallback(text)
     
+    def _build_analysis_prompt(self, text: str) -> str:
+        """
+        Build the structured analysis prompt for a single text.
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Prompt asking for entities, sentiment, categories and language as JSON
+        """
+        return f"""
+        Your task is to analyze the provided text and return a structured JSON response.
+        Do not include any conversational text, introductions, explanations, or markdown formatting around the JSON output.
+        The response should be only the JSON object itself.
+
+        Analyze the following text:
+        ---
+        {text}
+        ---
+
+        The JSON response must include these components:
+        1. entities: An array of extracted key entities (people, organizations, concepts, etc.). Each entity object should have "name", "type", and "salience".
+        2. sentiment: An object determining the overall sentiment (positive, negative, neutral), with "score" and "magnitude" fields.
+        3. categories: An array classifying the text into relevant categories. Each category object should have "name" and "confidence".
+        4. language: A string identifying the language (e.g., "en").
+
+        Format your response strictly as a single JSON object with these exact keys: "entities", "sentiment", "categories", "language".
+        Example of the expected JSON structure:
+        {{
+          "entities": [{{"name": "example entity", "type": "EVENT", "salience": 0.9}}],
+          "sentiment": {{"score": 0.5, "magnitude": 0.8}},
+          "categories": [{{"name": "/Technology/Internet", "confidence": 0.7}}],
+          "language": "en"
+        }}
+        
+        Again, provide *only* the JSON object as your response.
+        """
+    
+    def _parse_analysis_response(self, response_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse an analysis JSON object out of a model response.
+        
+        Args:
+            response_text: Raw model response
+            
+        Returns:
+            Analysis dictionary with all required keys, or None if no JSON could be parsed
+        """
+        # Try to parse JSON from response
+        parsed_result = None
+        json_str_for_parsing = None # To store the string that was attempted for parsing, for logging
+
+        # Attempt 1: Markdown
+        # Ensure re is imported (it's at the top of the file, so no need for local import)
+        json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
+        if json_match:
+            json_str_for_parsing = json_match.group(1).strip()
+            try:
+                parsed_result = json.loads(json_str_for_parsing)
+                logger.info("Successfully parsed JSON from markdown block (Attempt 1).")
+            except json.JSONDecodeError as e:
+                logger.warning(f"Attempt 1 (markdown) failed: JSONDecodeError - {str(e)} on content snippet: '{json_str_for_parsing[:100]}...'")
+                parsed_result = None # Ensure it's None if parsing fails
+
+        # Attempt 2: First '{' to last '}'
+        if parsed_result is None:
+            try:
+                first_brace = response_text.find('{')
+                last_brace = response_text.rfind('}')
+                if first_brace != -1 and last_brace != -1 and last_brace > first_brace:
+                    json_str_for_parsing = response_text[first_brace : last_brace + 1]
+                    parsed_result = json.loads(json_str_for_parsing)
+                    logger.info("Successfully parsed JSON from first '{' to last '}' (Attempt 2).")
+                else:
+                    # This case might not need logging if no braces found, or a less severe log.
+                    # logger.warning("Attempt 2 (first-last brace) failed: Could not find valid start/end braces or they were inverted.")
+                    pass # Not necessarily an error if no braces, just means this method won't work
+            except json.JSONDecodeError as e:
+                logger.warning(f"Attempt 2 (first-last brace) failed: JSONDecodeError - {str(e)} on content snippet: '{json_str_for_parsing[:100]}...'")
+                parsed_result = None
+
+        # Attempt 3: From known key '"entities":'
+        if parsed_result is None:
+            json_str_for_parsing = None # Reset for this attempt's logging
+            try:
+                known_key_start = response_text.find('"entities":')
+                if known_key_start != -1:
+                    json_start_brace = response_text.rfind('{', 0, known_key_start)
+                    if json_start_brace != -1:
+                        potential_json_str = response_text[json_start_brace:]
+                        open_braces = 0
+                        json_end_brace = -1
+                        # Iterate to find the matching closing brace for json_start_brace
+                        for i, char in enumerate(potential_json_str):
+                            if char == '{':
+                                open_braces += 1
+                            elif char == '}':
+                                open_braces -= 1
+                                if open_braces == 0:
+                                    json_end_brace = i
+                                    break
+                        
+                        if json_end_brace != -1:
+                            json_str_for_parsing = potential_json_str[:json_end_brace + 1]
+                            parsed_result = json.loads(json_str_for_parsing)
+                            logger.info("Successfully parsed JSON from known key substring with balanced braces (Attempt 3).")
+                        else:
+                            logger.warning("Attempt 3 (known key) failed: Could not find a balanced JSON object from the potential start.")
+                    else:
+                        logger.warning("Attempt 3 (known key) failed: Could not find an opening brace '{' before the known key.")
+                else:
+                    # logger.warning("Attempt 3 (known key) failed: Known key '\"entities\":' not found in response.")
+                    pass # Not an error if key isn't there, just means this method won't work
+            except json.JSONDecodeError as e:
+                logger.warning(f"Attempt 3 (known key) failed: JSONDecodeError - {str(e)} on content snippet: '{json_str_for_parsing[:100] if json_str_for_parsing else 'N/A'}...'")
+                parsed_result = None
+        
+        if not parsed_result or not isinstance(parsed_result, dict):
+            return None
+        
+        return self._normalize_analysis(parsed_result)
+    
+    def _normalize_analysis(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Ensure an analysis dictionary has every required key."""
+        if "entities" not in result:
+            result["entities"] = []
+        if "sentiment" not in result:
+            result["sentiment"] = {"score": 0, "magnitude": 0}
+        if "categories" not in result:
+            result["categories"] = []
+        if "language" not in result:
+            result["language"] = "en"
+        return result
+    
     def _analyze_text_fallback(self, text: str) -> Dict[str, Any]:
         """
         Analyze text using fallback methods when API is not available.
@@ -485,18 +579,184 @@ class GeminiNLPClient:
         # Return as a dictionary with the sentiment key
         return {"sentiment": analysis["sentiment"]}
     
-    def analyze_content(self, text: str) -> Dict[str, Any]:
+    def analyze_content(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Analyze content of text (alias for analyze_text).
         
         Args:
             text: Text to analyze
+            use_cache: Set to False to bypass the response cache
             
         Returns:
             Dictionary containing analysis results
         """
         # This is an alias for analyze_text to maintain compatibility with content analyzer
-        return self.analyze_text(text)
+        return self.analyze_text(text, use_cache)
+    
+    def analyze_content_batch(self, texts: List[str], max_chars_per_document: int = BATCH_MAX_CHARS_PER_DOCUMENT,
+                              max_batch_tokens: int = BATCH_MAX_TOKENS,
+                              use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Analyze several documents with as few Gemini round-trips as possible.
+        
+        Documents are truncated and packed into structured multi-document
+        prompts that fit a token budget. Any document a batched response
+        doesn't cover is analyzed on its own, concurrently.
+        
+        Args:
+            texts: Texts to analyze
+            max_chars_per_document: Characters of each text sent to the model
+            max_batch_tokens: Approximate prompt token budget per batched request
+            use_cache: Set to False to bypass the response cache
+            
+        Returns:
+            Analysis results in the same order and shape as analyze_text
+        """
+        if not texts:
+            return []
+        
+        documents = [(text or '')[:max_chars_per_document] for text in texts]
+        
+        # If client is not initialized, use fallback
+        if not self.client:
+            logger.warning("Using fallback analysis")
+            return [self._analyze_text_fallback(document) for document in documents]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(documents)
+        
+        # Per-document results are cached under the single-document prompt,
+        # so batched and individual analyses of the same text share entries
+        pending = []
+        for index, document in enumerate(documents):
+            cached = self.cache.get(self.model_name, self._build_analysis_prompt(document)) if use_cache else None
+            analysis = self._parse_analysis_response(cached) if cached else None
+            if analysis:
+                results[index] = analysis
+            else:
+                pending.append(index)
+        
+        for batch in self._pack_batches(pending, documents, max_batch_tokens):
+            if len(batch) == 1:
+                continue  # Single documents are analyzed below
+            
+            logger.info(f"Analyzing {len(batch)} documents in one request")
+            try:
+                response_text, _ = self._generate_text(
+                    self._build_batch_analysis_prompt([documents[index] for index in batch]), use_cache=False
+                )
+                analyses = self._parse_batch_analysis_response(response_text, len(batch))
+            except Exception as e:
+                logger.error(f"Error during batched Gemini analysis: {str(e)}")
+                analyses = [None] * len(batch)
+            
+            for index, analysis in zip(batch, analyses):
+                if analysis:
+                    results[index] = analysis
+                    if use_cache:
+                        self.cache.set(self.model_name, self._build_analysis_prompt(documents[index]), json.dumps(analysis))
+        
+        # Fan out concurrently for documents no batch covered
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(len(missing), BATCH_FALLBACK_WORKERS)) as executor:
+                analyses = executor.map(lambda index: self.analyze_text(documents[index], use_cache), missing)
+                for index, analysis in zip(missing, analyses):
+                    results[index] = analysis
+        
+        return results
+    
+    def _pack_batches(self, indices: List[int], documents: List[str], max_batch_tokens: int) -> List[List[int]]:
+        """Group document indices into batches that fit the token budget."""
+        batches = []
+        current = []
+        current_tokens = 0
+        
+        for index in indices:
+            tokens = len(documents[index]) // CHARS_PER_TOKEN + 1
+            if current and (current_tokens + tokens > max_batch_tokens or len(current) >= BATCH_MAX_DOCUMENTS):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(index)
+            current_tokens += tokens
+        
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    def _build_batch_analysis_prompt(self, documents: List[str]) -> str:
+        """
+        Build a structured analysis prompt covering several documents.
+        
+        Args:
+            documents: Texts to analyze
+            
+        Returns:
+            Prompt asking for one analysis object per document as a JSON array
+        """
+        document_blocks = "\n".join(
+            f"=== DOCUMENT {number} ===\n{document}\n=== END DOCUMENT {number} ==="
+            for number, document in enumerate(documents, 1)
+        )
+        
+        return f"""
+        Your task is to analyze each of the {len(documents)} documents below independently and return a structured JSON response.
+        Do not include any conversational text, introductions, explanations, or markdown formatting around the JSON output.
+
+        {document_blocks}
+
+        For each document, produce an object with these components:
+        1. document: The document number.
+        2. entities: An array of extracted key entities (people, organizations, concepts, etc.). Each entity object should have "name", "type", and "salience".
+        3. sentiment: An object determining the overall sentiment (positive, negative, neutral), with "score" and "magnitude" fields.
+        4. categories: An array classifying the text into relevant categories. Each category object should have "name" and "confidence".
+        5. language: A string identifying the language (e.g., "en").
+
+        Format your response strictly as a single JSON array with exactly {len(documents)} objects, one per document, in document order.
+        Example of one element:
+        {{"document": 1, "entities": [{{"name": "example entity", "type": "EVENT", "salience": 0.9}}], "sentiment": {{"score": 0.5, "magnitude": 0.8}}, "categories": [{{"name": "/Technology/Internet", "confidence": 0.7}}], "language": "en"}}
+        
+        Again, provide *only* the JSON array as your response.
+        """
+    
+    def _parse_batch_analysis_response(self, response_text: str, count: int) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse a batched analysis response into per-document results.
+        
+        Args:
+            response_text: Raw model response
+            count: Number of documents in the batch
+            
+        Returns:
+            List of ``count`` analyses, with None for documents the response didn't cover
+        """
+        analyses: List[Optional[Dict[str, Any]]] = [None] * count
+        
+        first_bracket = response_text.find('[')
+        last_bracket = response_text.rfind(']')
+        if first_bracket == -1 or last_bracket <= first_bracket:
+            logger.warning("Batched analysis response contained no JSON array")
+            return analyses
+        
+        try:
+            items = json.loads(response_text[first_bracket:last_bracket + 1])
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse batched analysis response: {str(e)}")
+            return analyses
+        
+        for position, item in enumerate(items if isinstance(items, list) else []):
+            if not isinstance(item, dict):
+                continue
+            number = item.pop("document", position + 1)
+            try:
+                index = int(number) - 1
+            except (TypeError, ValueError):
+                index = position
+            if 0 <= index < count and analyses[index] is None:
+                analyses[index] = self._normalize_analysis(item)
+        
+        return analyses
     
     def classify_text(self, text: str) -> Dict[str, Any]:
         """
@@ -529,3 +789,200 @@ class GeminiNLPClient:
             "language": analysis["language"],
             "tokens": analysis["tokens"]
         }
+
+
+class AsyncGeminiNLPClient:
+    """
+    Asyncio front end of GeminiNLPClient.
+    
+    Shares the wrapped client's model, response cache and rate limiter. The
+    'gemini' quota is awaited with ``rate_limiter.acquire()`` and requests go
+    through the SDK's ``generate_content_async`` when it has one, otherwise
+    through the loop's executor, so concurrent pipelines never block the loop.
+    """
+    
+    def __init__(self, client: Optional[GeminiNLPClient] = None, api_key: Optional[str] = None):
+        """
+        Initialize the async client.
+        
+        Args:
+            client: Synchronous client to wrap (defaults to the shared client for ``api_key``)
+            api_key: Gemini API key, used when no client is given
+        """
+        self.client = client if client is not None else get_gemini_client(api_key)
+    
+    async def _generate_text(self, prompt: str, use_cache: bool = True) -> Tuple[str, bool]:
+        """
+        Get the model's response to a prompt, from the cache when possible.
+        
+        Args:
+            prompt: Prompt to send
+            use_cache: Whether to look the prompt up in the response cache
+            
+        Returns:
+            Tuple of (response text, whether it came from the cache)
+        """
+        client = self.client
+        
+        if use_cache:
+            cached = client.cache.get(client.model_name, prompt)
+            if cached is not None:
+                return cached, True
+        
+        await client.rate_limiter.acquire('gemini')
+        model = client._get_model()
+        
+        if hasattr(model, 'generate_content_async'):
+            response = await model.generate_content_async(prompt)
+        else:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(None, model.generate_content, prompt)
+        
+        return client._response_text(response), False
+    
+    async def generate_content(self, prompt: str, use_cache: bool = True,
+                               validate: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Generate content using Gemini API.
+        
+        Args:
+            prompt: Prompt for content generation
+            use_cache: Set to False for prompts that must get a fresh response
+            validate: Optional check that the response is usable; responses
+                failing it are never cached
+            
+        Returns:
+            Generated content as string
+        """
+        client = self.client
+        logger.info(f"Generating content with prompt: {prompt[:50]}...")
+        
+        if not client.client:
+            logger.warning("Using fallback content generation")
+            return client._generate_fallback_content(prompt)
+        
+        try:
+            response_text, from_cache = await self._generate_text(prompt, use_cache)
+            
+            if from_cache and validate and not validate(response_text):
+                # Unusable entry cached before validation: ask the model again
+                response_text, from_cache = await self._generate_text(prompt, use_cache=False)
+            
+            if use_cache and not from_cache and (validate is None or validate(response_text)):
+                client.cache.set(client.model_name, prompt, response_text)
+            
+            return response_text
+            
+        except Exception as e:
+            logger.error(f"Error generating content: {str(e)}")
+            return client._generate_fallback_content(prompt)
+    
+    async def analyze_text(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Analyze text using Gemini API.
+        
+        Args:
+            text: Text to analyze
+            use_cache: Set to False to bypass the response cache
+            
+        Returns:
+            Dictionary containing analysis results
+        """
+        client = self.client
+        logger.info(f"Analyzing text: {text[:50]}...")
+        
+        if not client.client:
+            logger.warning("Using fallback analysis")
+            return client._analyze_text_fallback(text)
+        
+        try:
+            analysis_prompt = client._build_analysis_prompt(text)
+            response_text, from_cache = await self._generate_text(analysis_prompt, use_cache)
+            
+            result = client._parse_analysis_response(response_text)
+            if result:
+                # Only cache responses that parsed into a usable analysis
+                if use_cache and not from_cache:
+                    client.cache.set(client.model_name, analysis_prompt, response_text)
+                return result
+            
+            logger.error(f"Failed to parse Gemini API response as JSON. Raw response snippet: {response_text[:200]}...")
+            return client._analyze_text_fallback(text)
+            
+        except Exception as e:
+            logger.error(f"Error during Gemini API call or response processing: {str(e)}", exc_info=True)
+            return client._analyze_text_fallback(text)
+    
+    async def analyze_content(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Analyze content of text (alias for analyze_text).
+        
+        Args:
+            text: Text to analyze
+            use_cache: Set to False to bypass the response cache
+            
+        Returns:
+            Dictionary containing analysis results
+        """
+        return await self.analyze_text(text, use_cache)
+
+
+class GeminiClientRegistry:
+    """
+    Process-wide pool of shared GeminiNLPClient instances, one per API key.
+    
+    Building a client configures the SDK and its GenerativeModel is created
+    lazily once, so sharing clients keeps both off the request path.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._clients: Dict[Optional[str], GeminiNLPClient] = {}
+        self._lock = Lock()
+    
+    def get_client(self, api_key: Optional[str] = None) -> GeminiNLPClient:
+        """
+        Get the shared client for an API key, creating it on first use.
+        
+        Args:
+            api_key: Gemini API key (defaults to GEMINI_API_KEY)
+            
+        Returns:
+            Shared GeminiNLPClient
+        """
+        api_key = api_key or os.getenv('GEMINI_API_KEY')
+        
+        client = self._clients.get(api_key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(api_key)
+                if client is None:
+                    client = GeminiNLPClient(api_key=api_key)
+                    self._clients[api_key] = client
+        return client
+    
+    def clear(self):
+        """Drop every shared client (e.g. after rotating API keys)."""
+        with self._lock:
+            self._clients.clear()
+
+
+_gemini_registry = LazySingleton(GeminiClientRegistry)
+
+
+def get_gemini_registry() -> GeminiClientRegistry:
+    """Get the process-wide Gemini client registry."""
+    return _gemini_registry.get()
+
+
+def get_gemini_client(api_key: Optional[str] = None) -> GeminiNLPClient:
+    """
+    Get the shared GeminiNLPClient for an API key.
+    
+    Args:
+        api_key: Gemini API key (defaults to GEMINI_API_KEY)
+        
+    Returns:
+        Shared GeminiNLPClient
+    """
+    return get_gemini_registry().get_client(api_key)
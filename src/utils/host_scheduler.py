@@ -0,0 +1,322 @@
+"""
+Host-Aware Politeness Scheduler
+
+Schedules outbound scraping requests per registrable domain instead of with
+one global delay. Each host gets its own token bucket and backoff state,
+a global cap bounds the number of in-flight requests, and waiting requests
+are dispatched in priority order among those whose host is ready.
+"""
+
+import os
+import time
+import heapq
+import random
+import logging
+import itertools
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Condition, Lock
+from typing import Dict, Optional, Union
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Second-level labels under which registrations happen one level deeper
+# (e.g. bbc.co.uk, abc.net.au). A small stand-in for the public suffix list.
+_SECOND_LEVEL_SUFFIXES = {'co', 'com', 'net', 'org', 'gov', 'edu', 'ac', 'ne', 'or', 'go'}
+
+THROTTLE_STATUS_CODES = (403, 429)
+
+
+def registrable_domain(url: str) -> str:
+    """
+    Get the registrable domain (eTLD+1 approximation) of a URL.
+
+    Args:
+        url: URL or bare host name
+
+    Returns:
+        Registrable domain, e.g. 'en.wikipedia.org' -> 'wikipedia.org'
+    """
+    host = urlparse(url).hostname if '//' in url else url.split('/')[0].split(':')[0]
+    host = (host or '').lower().strip('.')
+
+    labels = host.split('.')
+    if len(labels) <= 2 or host.replace('.', '').isdigit():
+        return host
+
+    if len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL_SUFFIXES:
+        return '.'.join(labels[-3:])
+
+    return '.'.join(labels[-2:])
+
+
+def parse_retry_after(value: Optional[Union[str, int, float]]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Delay in seconds or an HTTP date
+
+    Returns:
+        Delay in seconds, or None if the value is missing or invalid
+    """
+    if value is None or value == '':
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class HostState:
+    """Token bucket and backoff state of a single host."""
+    tokens: float
+    last_refill: float
+    blocked_until: float = 0.0
+    backoff_level: int = 0
+    active: int = 0
+
+
+class HostScheduler:
+    """
+    Per-host token buckets with a global concurrency cap.
+
+    Callers wrap each request in ``slot(url)``. The call blocks until the
+    URL's host has a token, the host is not backing off, a global slot is
+    free, and no higher-priority request for a ready host is waiting.
+    """
+
+    def __init__(self, requests_per_second: float = 0.5, burst: int = 1, max_concurrency: int = 8,
+                 jitter: float = 1.0, base_backoff: float = 10.0, max_backoff: float = 300.0,
+                 prune_interval: float = 60.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_second: Sustained request rate per host
+            burst: Token bucket capacity per host
+            max_concurrency: Maximum in-flight requests across all hosts
+            jitter: Maximum random extra delay (seconds) added after each request to a host
+            base_backoff: First backoff delay after a 403/429 without Retry-After
+            max_backoff: Upper bound of the exponential backoff delay
+            prune_interval: Minimum seconds between sweeps dropping the state of idle hosts
+        """
+        self.rate = requests_per_second
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.prune_interval = prune_interval
+
+        self._hosts: Dict[str, HostState] = {}
+        self._next_prune = time.monotonic() + prune_interval
+        self._waiting = []  # Heap of (priority, sequence, host)
+        self._sequence = itertools.count()
+        self._active = 0
+        self._cond = Condition(Lock())
+
+    def _get_host(self, host: str, now: float) -> HostState:
+        """Get (or create) the state of a host, refilling its bucket."""
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(tokens=float(self.burst), last_refill=now)
+            self._hosts[host] = state
+        else:
+            state.tokens = min(float(self.burst), state.tokens + (now - state.last_refill) * self.rate)
+            state.last_refill = now
+        return state
+
+    def _prune(self, now: float) -> None:
+        """
+        Drop the state of hosts that is no different from a fresh one (caller holds the lock).
+
+        A host qualifies once no request is in flight or waiting for it, it is
+        not backing off and its bucket has refilled, so one-off hosts of a long
+        crawl don't accumulate.
+        """
+        waiting = {entry[2] for entry in self._waiting}
+        for host, state in list(self._hosts.items()):
+            if (state.active == 0 and state.backoff_level == 0 and state.blocked_until <= now
+                    and host not in waiting
+                    and state.tokens + (now - state.last_refill) * self.rate >= self.burst):
+                del self._hosts[host]
+        self._next_prune = now + self.prune_interval
+
+    def _ready_in(self, host: str, now: float) -> float:
+        """Seconds until the host can take another request (0 if ready)."""
+        state = self._get_host(host, now)
+        token_wait = 0.0 if state.tokens >= 1 else (1 - state.tokens) / self.rate
+        return max(token_wait, state.blocked_until - now, 0.0)
+
+    def _next_ready_entry(self, now: float):
+        """The highest-priority waiting entry whose host is ready."""
+        for entry in sorted(self._waiting):
+            if self._ready_in(entry[2], now) <= 0:
+                return entry
+        return None
+
+    def acquire(self, url: str, priority: int = 10) -> str:
+        """
+        Block until a request to ``url`` may be sent.
+
+        Args:
+            url: URL about to be requested
+            priority: Lower values are dispatched first
+
+        Returns:
+            Registrable domain the slot was granted for (pass to release)
+        """
+        host = registrable_domain(url)
+        entry = (priority, next(self._sequence), host)
+
+        with self._cond:
+            heapq.heappush(self._waiting, entry)
+            waited = False
+
+            while True:
+                now = time.monotonic()
+                host_wait = self._ready_in(host, now)
+
+                if (host_wait <= 0 and self._active < self.max_concurrency
+                        and self._next_ready_entry(now) == entry):
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+
+                    state = self._hosts[host]
+                    state.tokens -= 1 + random.uniform(0, self.jitter) * self.rate
+                    state.active += 1
+                    self._active += 1
+                    if waited:
+                        logger.debug(f"Dispatching request to {host} after waiting")
+                    # Others may now be ready (e.g. a different host was behind us)
+                    self._cond.notify_all()
+                    return host
+
+                if not waited and host_wait > 0:
+                    logger.info(f"Rate limiting {host}: waiting {host_wait:.2f} seconds")
+                waited = True
+                self._cond.wait(timeout=host_wait if host_wait > 0 else 0.5)
+
+    def release(self, host: str, status_code: Optional[int] = None,
+                retry_after: Optional[Union[str, int, float]] = None) -> None:
+        """
+        Release a slot and record the outcome of the request.
+
+        Args:
+            host: Value returned by acquire
+            status_code: HTTP status of the response, if any
+            retry_after: Retry-After header of the response, if any
+        """
+        with self._cond:
+            self._active -= 1
+            state = self._hosts.get(host)
+            if state is not None:
+                state.active -= 1
+            now = time.monotonic()
+            if now >= self._next_prune:
+                self._prune(now)
+            self._cond.notify_all()
+
+        if status_code is not None:
+            self.report(host, status_code, retry_after)
+
+    def report(self, url_or_host: str, status_code: int,
+               retry_after: Optional[Union[str, int, float]] = None) -> None:
+        """
+        Adjust a host's backoff from a response status.
+
+        403 and 429 responses block the host for the Retry-After delay or an
+        exponentially growing backoff; successful responses reset it.
+
+        Args:
+            url_or_host: URL or registrable domain
+            status_code: HTTP status code
+            retry_after: Retry-After header value, if any
+        """
+        host = registrable_domain(url_or_host)
+
+        with self._cond:
+            now = time.monotonic()
+            state = self._get_host(host, now)
+
+            if status_code in THROTTLE_STATUS_CODES:
+                state.backoff_level += 1
+                delay = parse_retry_after(retry_after)
+                if delay is None:
+                    delay = self.base_backoff * (2 ** (state.backoff_level - 1))
+                delay = min(delay, self.max_backoff)
+                state.blocked_until = max(state.blocked_until, now + delay)
+                logger.warning(f"Host {host} returned {status_code}; backing off for {delay:.1f} seconds")
+            elif status_code < 400:
+                state.backoff_level = 0
+
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, url: str, priority: int = 10):
+        """
+        Context manager holding a request slot for ``url``.
+
+        Args:
+            url: URL about to be requested
+            priority: Lower values are dispatched first
+        """
+        host = self.acquire(url, priority)
+        try:
+            yield host
+        finally:
+            self.release(host)
+
+    def get_host_status(self, url_or_host: str) -> Dict[str, float]:
+        """Get the current bucket/backoff state of a host (for monitoring)."""
+        host = registrable_domain(url_or_host)
+        with self._cond:
+            now = time.monotonic()
+            state = self._get_host(host, now)
+            return {
+                'tokens': round(state.tokens, 3),
+                'ready_in': round(self._ready_in(host, now), 3),
+                'backoff_level': state.backoff_level,
+                'active': state.active
+            }
+
+
+_host_scheduler: Optional[HostScheduler] = None
+_host_scheduler_lock = Lock()
+
+
+def get_host_scheduler() -> HostScheduler:
+    """
+    Get the process-wide host scheduler, configured from the environment.
+
+    Environment variables:
+        SCRAPER_HOST_RPS: Sustained requests per second per host (default: 0.5)
+        SCRAPER_HOST_BURST: Token bucket capacity per host (default: 1)
+        SCRAPER_MAX_CONCURRENCY: Global in-flight request cap (default: 8)
+    """
+    global _host_scheduler
+
+    if _host_scheduler is None:
+        with _host_scheduler_lock:
+            if _host_scheduler is None:
+                _host_scheduler = HostScheduler(
+                    requests_per_second=float(os.getenv('SCRAPER_HOST_RPS', 0.5)),
+                    burst=int(os.getenv('SCRAPER_HOST_BURST', 1)),
+                    max_concurrency=int(os.getenv('SCRAPER_MAX_CONCURRENCY', 8))
+                )
+
+    return _host_scheduler
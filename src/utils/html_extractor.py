@@ -0,0 +1,350 @@
+"""
+Single-Pass HTML Extractor
+
+lxml-based extraction engine for BrowserContentScraper. Title, meta
+description, main content candidates, headings, links and images are all
+collected in one traversal of the DOM, and element text lengths are computed
+bottom-up during the same walk, so the largest-block fallback for main
+content is linear in the size of the page instead of quadratic.
+
+Produces the same fields as the BeautifulSoup path in the scraper.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from urllib.parse import urlparse, urljoin
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+    etree = None
+
+logger = logging.getLogger(__name__)
+
+# Subtrees dropped before extraction (same as the BeautifulSoup path)
+REMOVED_TAGS = frozenset(["script", "style", "nav", "footer", "header", "aside"])
+
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+BLOCK_TAGS = frozenset(['div', 'section', 'article'])
+
+# Main content selectors in priority order: (kind, value)
+CONTENT_SELECTORS: List[Tuple[str, str]] = [
+    ('tag', 'main'),
+    ('tag', 'article'),
+    ('role', 'main'),
+    ('class', 'content'),
+    ('id', 'content'),
+    ('class', 'main-content'),
+    ('id', 'main-content'),
+    ('class', 'post-content'),
+    ('class', 'entry-content'),
+    ('class', 'article-content'),
+    ('class', 'blog-content'),
+    ('class', 'page-content'),
+    ('class', 'single-content')
+]
+
+MIN_BLOCK_TEXT_LENGTH = 200  # Minimum text length of the largest-block fallback
+
+
+def lxml_available() -> bool:
+    """Whether the lxml engine can be used."""
+    return lxml is not None
+
+
+def build_links(raw_links: List[Dict[str, str]], base_url: str) -> Dict[str, Any]:
+    """
+    Resolve and categorize links.
+
+    Args:
+        raw_links: Dictionaries with 'href', 'text', 'title' and 'aria_label'
+        base_url: URL of the page the links were found on
+
+    Returns:
+        Dictionary with internal, external and all links plus the total
+    """
+    links = []
+    domain = urlparse(base_url).netloc
+
+    for link in raw_links:
+        href = link['href']
+
+        # Skip empty hrefs, anchors, and javascript
+        if not href or href.startswith('#') or href.startswith('javascript:') or href.startswith('mailto:'):
+            continue
+
+        # Convert relative URLs to absolute
+        if not href.startswith(('http://', 'https://')):
+            href = urljoin(base_url, href)
+
+        text = link['text'] or link.get('title') or link.get('aria_label') or ''
+
+        if href:
+            links.append({
+                'text': text[:200],  # Limit text length
+                'url': href
+            })
+
+    internal_links = []
+    external_links = []
+
+    for link in links:
+        if domain in urlparse(link['url']).netloc:
+            internal_links.append(link)
+        else:
+            external_links.append(link)
+
+    return {
+        "internal": internal_links,
+        "external": external_links,
+        "all": links,
+        "total": len(links)
+    }
+
+
+def build_images(raw_images: List[Dict[str, Any]], base_url: str) -> List[Dict[str, str]]:
+    """
+    Resolve image sources and drop icons/tracking pixels.
+
+    Args:
+        raw_images: Dictionaries with 'src', 'alt', 'width' and 'height'
+        base_url: URL of the page the images were found on
+
+    Returns:
+        List of dictionaries with 'alt' and 'src'
+    """
+    images = []
+
+    for img in raw_images:
+        src = img['src']
+        if not src:
+            continue
+
+        # Convert relative URLs to absolute
+        if not src.startswith(('http://', 'https://')):
+            src = urljoin(base_url, src)
+
+        # Skip very small images (likely icons/tracking pixels)
+        width = img.get('width')
+        height = img.get('height')
+        try:
+            if width and height and (int(width) < 50 or int(height) < 50):
+                continue
+        except (ValueError, TypeError):
+            pass
+
+        images.append({
+            'alt': (img.get('alt') or '').strip(),
+            'src': src
+        })
+
+    return images
+
+
+def _is_element(node) -> bool:
+    """True for elements, False for comments and processing instructions."""
+    return isinstance(node.tag, str)
+
+
+def _stripped_length(text: Optional[str]) -> int:
+    """Length of a text node as counted by get_text(strip=True)."""
+    return len(text.strip()) if text else 0
+
+
+def _iter_strings(element) -> Iterator[str]:
+    """Yield the stripped, non-empty text strings of an element in document order."""
+    stack = [element]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            text = item.strip()
+            if text:
+                yield text
+            continue
+
+        if item.text and _is_element(item):
+            text = item.text.strip()
+            if text:
+                yield text
+
+        for child in reversed(item):
+            if child.tail:
+                stack.append(child.tail)
+            if _is_element(child) and child.tag not in REMOVED_TAGS:
+                stack.append(child)
+
+
+def element_text(element, separator: str = '') -> str:
+    """Text of an element, equivalent to BeautifulSoup's get_text(separator, strip=True)."""
+    return separator.join(_iter_strings(element))
+
+
+def _selector_index(element) -> Optional[int]:
+    """Index of the highest-priority content selector the element matches."""
+    classes = None
+    for index, (kind, value) in enumerate(CONTENT_SELECTORS):
+        if kind == 'tag':
+            matched = element.tag == value
+        elif kind == 'role':
+            matched = element.get('role') == value
+        elif kind == 'id':
+            matched = element.get('id') == value
+        else:
+            if classes is None:
+                classes = (element.get('class') or '').split()
+            matched = value in classes
+        if matched:
+            return index
+    return None
+
+
+def parse_document(html: str):
+    """
+    Parse HTML into an lxml document.
+
+    Args:
+        html: Page HTML
+
+    Returns:
+        Root element, or None if the document is empty or unparseable
+    """
+    if lxml is None or not html or not html.strip():
+        return None
+
+    try:
+        # Parse bytes so pages with an XML encoding declaration are accepted
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        return lxml.html.document_fromstring(html.encode('utf-8', errors='replace'), parser=parser)
+    except (etree.ParserError, ValueError) as e:
+        logger.warning(f"lxml could not parse document: {str(e)}")
+        return None
+
+
+def extract_page(html: str, base_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract page fields in a single DOM traversal.
+
+    Args:
+        html: Page HTML
+        base_url: URL of the page
+
+    Returns:
+        Dictionary with title, description, main_content, headings, links and
+        images, or None if lxml is unavailable or the page can't be parsed
+    """
+    root = parse_document(html)
+    if root is None:
+        return None
+
+    title = None
+    meta_name_description = None
+    meta_og_description = None
+    body = None
+    content_matches: Dict[int, Any] = {}
+    headings = []
+    raw_links = []
+    raw_images = []
+    blocks = []
+    text_lengths: Dict[Any, int] = {}
+
+    # Iterative pre/post-order walk: (element, exiting)
+    stack = [(root, False)]
+    while stack:
+        element, exiting = stack.pop()
+
+        if exiting:
+            # Children are finished, so the subtree text length is known
+            length = _stripped_length(element.text)
+            for child in element:
+                if _is_element(child) and child.tag not in REMOVED_TAGS:
+                    length += text_lengths.get(child, 0)
+                length += _stripped_length(child.tail)
+            text_lengths[element] = length
+            continue
+
+        tag = element.tag
+        stack.append((element, True))
+        for child in reversed(element):
+            if _is_element(child) and child.tag not in REMOVED_TAGS:
+                stack.append((child, False))
+
+        if tag == 'title' and title is None:
+            title = (element.text_content() or '').strip()
+        elif tag == 'meta':
+            if meta_name_description is None and element.get('name') == 'description':
+                meta_name_description = element
+            elif meta_og_description is None and element.get('property') == 'og:description':
+                meta_og_description = element
+        elif tag == 'body' and body is None:
+            body = element
+        elif tag in HEADING_TAGS:
+            headings.append(element)
+        elif tag == 'a' and element.get('href') is not None:
+            raw_links.append(element)
+        elif tag == 'img':
+            raw_images.append({
+                'src': element.get('src') or element.get('data-src'),
+                'alt': element.get('alt', ''),
+                'width': element.get('width', 0),
+                'height': element.get('height', 0)
+            })
+
+        if tag in BLOCK_TAGS:
+            blocks.append(element)
+
+        index = _selector_index(element)
+        if index is not None and index not in content_matches:
+            content_matches[index] = element
+
+    meta_desc = meta_name_description if meta_name_description is not None else meta_og_description
+    description = (meta_desc.get('content') or '').strip() if meta_desc is not None else ""
+
+    return {
+        "title": title or "",
+        "description": description,
+        "main_content": _main_content(root, body, content_matches, blocks, text_lengths),
+        "headings": _headings(headings),
+        "links": build_links([
+            {
+                'href': link.get('href'),
+                'text': element_text(link),
+                'title': link.get('title', ''),
+                'aria_label': link.get('aria-label', '')
+            }
+            for link in raw_links
+        ], base_url),
+        "images": build_images(raw_images, base_url)
+    }
+
+
+def _main_content(root, body, content_matches: Dict[int, Any], blocks: List[Any],
+                  text_lengths: Dict[Any, int]) -> str:
+    """Pick the main content element: selector match, largest block, body, then the whole page."""
+    if content_matches:
+        return element_text(content_matches[min(content_matches)], ' ')
+
+    if blocks:
+        # max() keeps the first of equally long blocks, like the BeautifulSoup path
+        largest = max(blocks, key=lambda block: text_lengths.get(block, 0))
+        if text_lengths.get(largest, 0) > MIN_BLOCK_TEXT_LENGTH:
+            return element_text(largest, ' ')
+
+    if body is not None:
+        return element_text(body, ' ')
+
+    return element_text(root, ' ')
+
+
+def _headings(elements: List[Any]) -> List[Dict[str, str]]:
+    """Build heading entries, filtering out empty or single-character headings."""
+    headings = []
+    for element in elements:
+        text = element_text(element)
+        if text and len(text) > 1:
+            headings.append({
+                'level': element.tag,
+                'text': text
+            })
+    return headings
@@ -0,0 +1,203 @@
+"""
+LLM Response Cache
+
+Disk-backed TTL cache for Gemini responses, keyed by model name plus a hash
+of the normalized prompt. Blueprint, intent and content-analysis prompts
+repeat heavily across users, so a repeat blueprint costs no Gemini latency
+or quota.
+"""
+
+import time
+import sqlite3
+import hashlib
+import logging
+from typing import Dict, Any, Optional
+
+from .sqlite_cache import LazySingleton, SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = 'llm_cache.db'  # In the data directory (see sqlite_cache)
+DEFAULT_TTL = 7 * 24 * 3600  # 7 days
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class LLMCache(SQLiteCache):
+    """
+    SQLite-backed cache of LLM responses.
+
+    Prompts are normalized by collapsing whitespace, so the indentation of
+    triple-quoted prompt templates does not split otherwise identical
+    entries. Expired entries are ignored on read, and the least recently
+    used entries are evicted beyond ``max_entries``.
+    """
+
+    NAME = 'LLM cache'
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            cache_key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_accessed REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_accessed ON llm_cache(last_accessed)"
+    )
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, ttl: int = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, enabled: bool = True):
+        """
+        Initialize the LLM cache.
+
+        Args:
+            db_path: Path of the SQLite cache file (relative paths live in the data directory)
+            ttl: Time-to-live of an entry in seconds
+            max_entries: Maximum number of entries kept before LRU eviction
+            enabled: When False, every lookup is a miss and nothing is stored
+        """
+        super().__init__(db_path, ttl, max_entries, enabled)
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        """Collapse whitespace so re-indented prompts share an entry."""
+        return ' '.join((prompt or '').split())
+
+    def make_key(self, model: str, prompt: str) -> str:
+        """
+        Build the cache key for a prompt.
+
+        Args:
+            model: Model name
+            prompt: Prompt text
+
+        Returns:
+            Hex digest identifying the model/prompt pair
+        """
+        key_data = f"{model}\n{self.normalize_prompt(prompt)}"
+        return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+
+    def get(self, model: str, prompt: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            model: Model name
+            prompt: Prompt text
+
+        Returns:
+            Cached response text or None on a miss or expired entry
+        """
+        if not self.enabled:
+            return None
+
+        cache_key = self.make_key(model, prompt)
+        now = time.time()
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM llm_cache WHERE cache_key = ?",
+                    (cache_key,)
+                ).fetchone()
+
+                if row and now - row[1] < self.ttl:
+                    conn.execute(
+                        "UPDATE llm_cache SET last_accessed = ? WHERE cache_key = ?",
+                        (now, cache_key)
+                    )
+                    self._count('hits')
+                    logger.info(f"LLM cache hit for {model} prompt: {prompt.strip()[:50]}...")
+                    return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache read failed: {str(e)}")
+
+        self._count('misses')
+        return None
+
+    def set(self, model: str, prompt: str, response: str) -> None:
+        """
+        Store a response, evicting least recently used entries if needed.
+
+        Args:
+            model: Model name
+            prompt: Prompt text
+            response: Response text to store
+        """
+        if not self.enabled or not response:
+            return
+
+        now = time.time()
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO llm_cache (cache_key, model, response, created_at, last_accessed)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (self.make_key(model, prompt), model, response, now, now)
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop expired entries and trim the cache to max_entries (LRU)."""
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,))
+
+        count = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                """
+                DELETE FROM llm_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_cache ORDER BY last_accessed ASC LIMIT ?
+                )
+                """,
+                (overflow,)
+            )
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        if not self.enabled:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM llm_cache")
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache clear failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counters and current size
+        """
+        return {
+            'enabled': self.enabled,
+            'entries': self._scalar("SELECT COUNT(*) FROM llm_cache"),
+            'ttl': self.ttl,
+            **self._hit_stats()
+        }
+
+
+_llm_cache = LazySingleton(
+    lambda: LLMCache.from_env('LLM_CACHE', DEFAULT_CACHE_PATH, DEFAULT_TTL, DEFAULT_MAX_ENTRIES)
+)
+
+
+def get_llm_cache() -> LLMCache:
+    """
+    Get the process-wide LLM cache, configured from the environment.
+
+    Environment variables:
+        LLM_CACHE_PATH: SQLite file path (default: llm_cache.db in DATA_DIR)
+        LLM_CACHE_TTL: Entry lifetime in seconds (default: 604800)
+        LLM_CACHE_MAX_ENTRIES: LRU size bound (default: 10000)
+        LLM_CACHE_ENABLED: Set to 'false' to disable caching
+    """
+    return _llm_cache.get()
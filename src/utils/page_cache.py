@@ -0,0 +1,343 @@
+"""
+Scraped Page Cache
+
+Persistent cache of extracted page content for BrowserContentScraper.
+Entries are keyed by normalized URL and keep the ETag/Last-Modified
+validators so stale pages can be revalidated with a conditional GET, plus a
+content hash so an unchanged body is never parsed twice. Failed URLs are
+remembered in a negative cache that expires, instead of forever.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+from .sqlite_cache import LazySingleton, SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = 'page_cache.db'  # In the data directory (see sqlite_cache)
+DEFAULT_TTL = 7 * 24 * 3600  # Revalidate pages after a week
+DEFAULT_MAX_ENTRIES = 20000
+
+# Negative cache lifetimes by failure kind (seconds)
+FAILURE_TTLS = {
+    'blocked': 24 * 3600,     # 403: site blocks automated access
+    'not_found': 6 * 3600,    # 404/410
+    'transient': 15 * 60      # Timeouts, connection errors, 5xx, rate limits
+}
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'mc_cid', 'mc_eid', 'ref', '_ga'}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent spellings share a cache entry.
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    tracking parameters, and sorts the remaining query parameters.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+
+    return urlunparse((scheme, netloc, parsed.path or '/', parsed.params, urlencode(query), ''))
+
+
+def content_hash(body: str) -> str:
+    """Hash of a response body, used to skip re-parsing unchanged pages."""
+    return hashlib.sha256((body or '').encode('utf-8', errors='replace')).hexdigest()
+
+
+class PageCache(SQLiteCache):
+    """
+    SQLite-backed cache of scraped page results with conditional revalidation.
+    """
+
+    NAME = 'page cache'
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS scraped_pages (
+            url_key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            result TEXT NOT NULL,
+            content_hash TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at REAL NOT NULL,
+            validated_at REAL NOT NULL,
+            last_accessed REAL NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS scrape_failures (
+            url_key TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            error TEXT,
+            status_code INTEGER,
+            expires_at REAL NOT NULL
+        )
+        """
+    )
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, ttl: int = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, enabled: bool = True):
+        """
+        Initialize the page cache.
+
+        Args:
+            db_path: Path of the SQLite cache file (relative paths live in the data directory)
+            ttl: Seconds after which a cached page must be revalidated
+            max_entries: Maximum number of cached pages before LRU eviction
+            enabled: When False, nothing is read or stored
+        """
+        self.revalidations = 0
+        self.negative_hits = 0
+        super().__init__(db_path, ttl, max_entries, enabled)
+
+    def _init_db(self):
+        """Create the cache tables, adding last_accessed to files created before it existed."""
+        super()._init_db()
+        with self._connect() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(scraped_pages)")}
+            if 'last_accessed' not in columns:
+                conn.execute("ALTER TABLE scraped_pages ADD COLUMN last_accessed REAL NOT NULL DEFAULT 0")
+                conn.execute("UPDATE scraped_pages SET last_accessed = validated_at")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_scraped_pages_last_accessed ON scraped_pages(last_accessed)"
+            )
+
+    @staticmethod
+    def _key(url: str) -> str:
+        """Cache key of a URL."""
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached page.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Dictionary with 'result', 'etag', 'last_modified', 'content_hash'
+            and 'fresh' (False when the entry must be revalidated), or None
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        entry = None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    """
+                    SELECT result, content_hash, etag, last_modified, validated_at
+                    FROM scraped_pages WHERE url_key = ?
+                    """,
+                    (self._key(url),)
+                ).fetchone()
+                if row:
+                    entry = {
+                        'result': json.loads(row[0]),
+                        'content_hash': row[1],
+                        'etag': row[2],
+                        'last_modified': row[3],
+                        'fresh': now - row[4] < self.ttl
+                    }
+                    conn.execute(
+                        "UPDATE scraped_pages SET last_accessed = ? WHERE url_key = ?", (now, self._key(url))
+                    )
+        except (sqlite3.Error, ValueError) as e:
+            # An unreadable entry is a miss; the next successful scrape replaces it
+            logger.warning(f"Page cache read failed for {url}: {str(e)}")
+            entry = None
+
+        if entry is None:
+            self._count('misses')
+            return None
+
+        self._count('hits' if entry['fresh'] else 'revalidations')
+        return entry
+
+    def set(self, url: str, result: Dict[str, Any], body_hash: Optional[str] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Store an extracted page result along with its validators.
+
+        Args:
+            url: Page URL
+            result: Extracted scrape result
+            body_hash: Hash of the response body
+            etag: ETag response header
+            last_modified: Last-Modified response header
+        """
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO scraped_pages
+                        (url_key, url, result, content_hash, etag, last_modified,
+                         fetched_at, validated_at, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (self._key(url), normalize_url(url), json.dumps(result), body_hash,
+                     etag, last_modified, now, now, now)
+                )
+                conn.execute("DELETE FROM scrape_failures WHERE url_key = ?", (self._key(url),))
+                self._evict(conn)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Page cache write failed for {url}: {str(e)}")
+
+    def touch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Mark a cached page as revalidated (e.g. after a 304 Not Modified).
+
+        Args:
+            url: Page URL
+            etag: New ETag, if the server sent one
+            last_modified: New Last-Modified, if the server sent one
+        """
+        if not self.enabled:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    UPDATE scraped_pages
+                    SET validated_at = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+                    WHERE url_key = ?
+                    """,
+                    (time.time(), etag, last_modified, self._key(url))
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Page cache touch failed for {url}: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Trim the page table to max_entries, dropping least recently used pages."""
+        count = conn.execute("SELECT COUNT(*) FROM scraped_pages").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                """
+                DELETE FROM scraped_pages WHERE url_key IN (
+                    SELECT url_key FROM scraped_pages ORDER BY last_accessed ASC LIMIT ?
+                )
+                """,
+                (overflow,)
+            )
+        conn.execute("DELETE FROM scrape_failures WHERE expires_at < ?", (time.time(),))
+
+    def record_failure(self, url: str, error: str, status_code: int = 0, kind: str = 'transient') -> None:
+        """
+        Remember a failed URL until its failure kind expires.
+
+        Args:
+            url: Page URL
+            error: Error message
+            status_code: HTTP status code, if any
+            kind: Failure kind, one of FAILURE_TTLS
+        """
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + FAILURE_TTLS.get(kind, FAILURE_TTLS['transient'])
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO scrape_failures (url_key, url, error, status_code, expires_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (self._key(url), normalize_url(url), error, status_code, expires_at)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Page cache failure write failed for {url}: {str(e)}")
+
+    def get_failure(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an unexpired failure for a URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Dictionary with 'error' and 'status_code', or None
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT error, status_code FROM scrape_failures WHERE url_key = ? AND expires_at > ?",
+                    (self._key(url), time.time())
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Page cache failure read failed for {url}: {str(e)}")
+            return None
+
+        if not row:
+            return None
+
+        self._count('negative_hits')
+        return {'error': row[0], 'status_code': row[1] or 0}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with counters and current sizes
+        """
+        return {
+            'enabled': self.enabled,
+            'pages': self._scalar("SELECT COUNT(*) FROM scraped_pages"),
+            'failures': self._scalar("SELECT COUNT(*) FROM scrape_failures WHERE expires_at > ?", (time.time(),)),
+            'hits': self.hits,
+            'revalidations': self.revalidations,
+            'misses': self.misses,
+            'negative_hits': self.negative_hits
+        }
+
+
+_page_cache = LazySingleton(
+    lambda: PageCache.from_env('PAGE_CACHE', DEFAULT_CACHE_PATH, DEFAULT_TTL, DEFAULT_MAX_ENTRIES)
+)
+
+
+def get_page_cache() -> PageCache:
+    """
+    Get the process-wide page cache, configured from the environment.
+
+    Environment variables:
+        PAGE_CACHE_PATH: SQLite file path (default: page_cache.db in DATA_DIR)
+        PAGE_CACHE_TTL: Seconds before a page is revalidated (default: 604800)
+        PAGE_CACHE_MAX_ENTRIES: LRU size bound (default: 20000)
+        PAGE_CACHE_ENABLED: Set to 'false' to disable caching
+    """
+    return _page_cache.get()
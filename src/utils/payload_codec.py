@@ -0,0 +1,230 @@
+"""
+Blueprint Payload Codec
+
+Compresses the JSON payload sections of blueprints before they are stored.
+Values are serialized with compact separators, compressed with zstd
+(optionally with a dictionary trained on existing payloads) or gzip, and
+wrapped in a small tagged envelope that still fits the JSON columns:
+
+    {"_codec": "zstd", "v": 1, "dict": 1234, "data": "<base64>"}
+
+Decoding is transparent: envelopes are decompressed according to their tag
+and any other value (rows written before the codec existed) is returned
+unchanged, so old and new rows can live side by side.
+"""
+
+import os
+import gzip
+import json
+import base64
+import logging
+from threading import Lock
+from typing import Any, Iterable, Optional
+
+from .sqlite_cache import LazySingleton
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_KEY = '_codec'
+CODEC_VERSION = 1
+ALGORITHMS = ('none', 'gzip', 'zstd')
+DEFAULT_LEVELS = {'gzip': 6, 'zstd': 10}
+DEFAULT_DICTIONARY_SIZE = 64 * 1024
+
+
+class PayloadDecodeError(Exception):
+    """A stored payload envelope could not be decoded (corrupt data, missing zstandard or dictionary)."""
+
+
+def zstd_available() -> bool:
+    """Whether the zstd algorithm can be used."""
+    return zstandard is not None
+
+
+def is_encoded(value: Any) -> bool:
+    """Whether a stored value is a codec envelope."""
+    return isinstance(value, dict) and CODEC_KEY in value and 'data' in value
+
+
+def dumps_compact(value: Any) -> bytes:
+    """Serialize a value as compact UTF-8 JSON."""
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def train_dictionary(samples: Iterable[Any], size: int = DEFAULT_DICTIONARY_SIZE) -> bytes:
+    """
+    Train a zstd dictionary on sample payloads.
+
+    Args:
+        samples: Decoded payload values (e.g. competitor_analysis sections)
+        size: Maximum dictionary size in bytes
+
+    Returns:
+        Raw dictionary bytes, to be saved and passed to PayloadCodec
+
+    Raises:
+        Exception: If zstandard is not installed or there are too few samples
+    """
+    if zstandard is None:
+        raise Exception("zstandard is not installed; cannot train a dictionary")
+    encoded = [dumps_compact(sample) for sample in samples if sample is not None]
+    if len(encoded) < 8:
+        raise Exception(f"Need at least 8 samples to train a dictionary, got {len(encoded)}")
+    return zstandard.train_dictionary(size, encoded).as_bytes()
+
+
+class PayloadCodec:
+    """Encodes payload values into tagged compressed envelopes and back."""
+
+    def __init__(self, algorithm: str = 'gzip', level: Optional[int] = None,
+                 dictionary: Optional[bytes] = None):
+        """
+        Initialize the codec.
+
+        Args:
+            algorithm: 'zstd', 'gzip' or 'none' (store values as plain JSON);
+                zstd falls back to gzip when zstandard is not installed
+            level: Compression level (defaults depend on the algorithm; the
+                gzip default is used after a fallback from zstd)
+            dictionary: Optional trained zstd dictionary bytes
+        """
+        algorithm = (algorithm or 'none').lower()
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown payload codec '{algorithm}' (expected one of {', '.join(ALGORITHMS)})")
+        if algorithm == 'zstd' and zstandard is None:
+            logger.warning("zstandard not installed, falling back to gzip payload compression")
+            algorithm = 'gzip'
+            level = None  # zstd levels (up to 22) don't carry over to gzip (0-9)
+
+        self.algorithm = algorithm
+        self.level = level if level is not None else DEFAULT_LEVELS.get(algorithm, 0)
+        self._dictionary = None
+        self.dictionary_id = None
+        self._lock = Lock()
+        self._compressor = None
+        self._decompressors = {}
+
+        if dictionary and zstandard is not None:
+            self._dictionary = zstandard.ZstdCompressionDict(dictionary)
+            self.dictionary_id = self._dictionary.dict_id()
+
+    @property
+    def tag(self) -> str:
+        """Description of what this codec writes, e.g. 'zstd:v1:dict1234'."""
+        tag = f"{self.algorithm}:v{CODEC_VERSION}"
+        if self.algorithm == 'zstd' and self.dictionary_id:
+            tag += f":dict{self.dictionary_id}"
+        return tag
+
+    def encode(self, value: Any) -> Any:
+        """
+        Encode a payload value for storage.
+
+        Args:
+            value: JSON-serializable payload (None is stored as None)
+
+        Returns:
+            Envelope dictionary, or the value itself when the codec is 'none'
+        """
+        if value is None or self.algorithm == 'none' or is_encoded(value):
+            return value
+
+        raw = dumps_compact(value)
+        envelope = {CODEC_KEY: self.algorithm, 'v': CODEC_VERSION}
+        if self.algorithm == 'zstd':
+            with self._lock:
+                if self._compressor is None:
+                    self._compressor = zstandard.ZstdCompressor(level=self.level, dict_data=self._dictionary)
+                compressed = self._compressor.compress(raw)
+            if self.dictionary_id:
+                envelope['dict'] = self.dictionary_id
+        else:
+            compressed = gzip.compress(raw, compresslevel=self.level, mtime=0)
+
+        envelope['data'] = base64.b64encode(compressed).decode('ascii')
+        return envelope
+
+    def decode(self, value: Any) -> Any:
+        """
+        Decode a stored payload value.
+
+        Args:
+            value: Envelope written by any codec configuration, or a plain value
+
+        Returns:
+            The original payload
+
+        Raises:
+            PayloadDecodeError: If the envelope is corrupt or needs zstandard or
+                a dictionary that is unavailable
+        """
+        if not is_encoded(value):
+            return value
+
+        algorithm = value[CODEC_KEY]
+        version = value.get('v', CODEC_VERSION)
+        if version != CODEC_VERSION:
+            raise PayloadDecodeError(f"Unsupported payload codec version: {version}")
+
+        try:
+            compressed = base64.b64decode(value['data'])
+            if algorithm == 'gzip':
+                raw = gzip.decompress(compressed)
+            elif algorithm == 'zstd':
+                raw = self._zstd_decompress(compressed, value.get('dict'))
+            else:
+                raise PayloadDecodeError(f"Unknown payload codec: {algorithm}")
+            return json.loads(raw)
+        except PayloadDecodeError:
+            raise
+        except Exception as e:
+            raise PayloadDecodeError(f"Failed to decode {algorithm} payload: {str(e)}")
+
+    def _zstd_decompress(self, compressed: bytes, dictionary_id: Optional[int]) -> bytes:
+        """Decompress a zstd frame, using the trained dictionary if it was written with one."""
+        if zstandard is None:
+            raise PayloadDecodeError("zstandard is not installed; cannot decode zstd payload")
+        if dictionary_id and dictionary_id != self.dictionary_id:
+            raise PayloadDecodeError(f"Payload was compressed with unknown zstd dictionary {dictionary_id}")
+
+        with self._lock:
+            decompressor = self._decompressors.get(dictionary_id)
+            if decompressor is None:
+                decompressor = zstandard.ZstdDecompressor(dict_data=self._dictionary if dictionary_id else None)
+                self._decompressors[dictionary_id] = decompressor
+            return decompressor.decompress(compressed)
+
+
+def _build_payload_codec() -> PayloadCodec:
+    """Payload codec configured from the environment (see get_payload_codec)."""
+    level = os.getenv('BLUEPRINT_PAYLOAD_LEVEL')
+    dictionary = None
+    dictionary_path = os.getenv('BLUEPRINT_PAYLOAD_DICTIONARY')
+    if dictionary_path:
+        with open(dictionary_path, 'rb') as f:
+            dictionary = f.read()
+    return PayloadCodec(
+        algorithm=os.getenv('BLUEPRINT_PAYLOAD_CODEC', 'none'),
+        level=int(level) if level else None,
+        dictionary=dictionary
+    )
+
+
+_payload_codec = LazySingleton(_build_payload_codec)
+
+
+def get_payload_codec() -> PayloadCodec:
+    """
+    Get the process-wide payload codec, configured from the environment.
+
+    Environment variables:
+        BLUEPRINT_PAYLOAD_CODEC: 'none' (default), 'gzip' or 'zstd'
+        BLUEPRINT_PAYLOAD_LEVEL: Compression level (default: 6 for gzip, 10 for zstd)
+        BLUEPRINT_PAYLOAD_DICTIONARY: Path of a trained zstd dictionary (optional)
+    """
+    return _payload_codec.get()
@@ -0,0 +1,199 @@
+"""
+Dependency-Graph Pipeline Executor
+
+Runs a small graph of pipeline steps on a thread pool. Each node declares
+the nodes whose values it takes as inputs; a node starts as soon as all of
+its inputs are resolved, so independent steps overlap. Every node is timed,
+and a failed node falls back to its default value (if it has one) and
+degrades only the nodes downstream of it.
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Node outcomes
+COMPLETED = 'completed'
+FAILED = 'failed'          # The node raised; its fallback value (if any) was used
+DEGRADED = 'degraded'      # The node ran on a failed input's fallback value
+SKIPPED = 'skipped'        # An input failed without a fallback; the node's own fallback was used
+
+
+@dataclass
+class PipelineNode:
+    """
+    One step of a pipeline.
+
+    Attributes:
+        name: Unique node name, also the key of its value in the results
+        fn: Callable receiving the values of ``inputs`` as keyword arguments
+        inputs: Names of the nodes this node depends on
+        fallback: Optional callable receiving the exception (or None when the
+            node is skipped) and returning a default value
+    """
+    name: str
+    fn: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    fallback: Optional[Callable[[Optional[BaseException]], Any]] = None
+
+
+@dataclass
+class PipelineResult:
+    """Values, outcomes, timings and errors of a pipeline run."""
+    values: Dict[str, Any] = field(default_factory=dict)
+    status: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def degraded(self) -> List[str]:
+        """Names of the nodes that did not complete normally."""
+        return [name for name, status in self.status.items() if status != COMPLETED]
+
+
+class PipelineExecutor:
+    """Executes a dependency graph of PipelineNodes with bounded concurrency."""
+
+    def __init__(self, nodes: List[PipelineNode], max_workers: int = 4):
+        """
+        Initialize the executor and validate the graph.
+
+        Args:
+            nodes: Pipeline nodes
+            max_workers: Maximum nodes running at once
+
+        Raises:
+            ValueError: If a node name is duplicated, an input is unknown or the graph has a cycle
+        """
+        self.nodes: Dict[str, PipelineNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate pipeline node '{node.name}'")
+            self.nodes[node.name] = node
+        self.max_workers = max_workers
+        self._validate()
+
+    def _validate(self):
+        """Check that every input exists and that the graph is acyclic."""
+        for node in self.nodes.values():
+            for name in node.inputs:
+                if name not in self.nodes:
+                    raise ValueError(f"Pipeline node '{node.name}' depends on unknown node '{name}'")
+
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline graph has a cycle through '{name}'")
+            visiting.add(name)
+            for dependency in self.nodes[name].inputs:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.nodes:
+            visit(name)
+
+    def run(self, on_node_start: Optional[Callable[[str, int, int], None]] = None,
+            on_node_done: Optional[Callable[[str, Any, str], None]] = None) -> PipelineResult:
+        """
+        Run every node once its inputs are resolved.
+
+        Args:
+            on_node_start: Optional callable receiving (node name, nodes finished, total nodes)
+                when a node is submitted
+            on_node_done: Optional callable receiving (node name, value, status) as soon
+                as a node is resolved, e.g. to stream partial results
+
+        Returns:
+            PipelineResult of the run
+        """
+        result = PipelineResult()
+        pending = dict(self.nodes)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline') as executor:
+            while pending or running:
+                for name, node in list(pending.items()):
+                    if all(dependency in result.status for dependency in node.inputs):
+                        del pending[name]
+                        if self._skip_if_inputs_missing(node, result):
+                            self._notify_done(on_node_done, name, result)
+                            continue
+                        if on_node_start is not None:
+                            on_node_start(name, len(result.status), len(self.nodes))
+                        inputs = {dependency: result.values[dependency] for dependency in node.inputs}
+                        running[executor.submit(self._timed, node, inputs)] = node
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node = running.pop(future)
+                    value, error, elapsed = future.result()
+                    result.timings[node.name] = round(elapsed, 3)
+                    if error is None:
+                        result.values[node.name] = value
+                        degraded = any(result.status[dependency] != COMPLETED for dependency in node.inputs)
+                        result.status[node.name] = DEGRADED if degraded else COMPLETED
+                    else:
+                        logger.warning(f"Pipeline node '{node.name}' failed: {str(error)}")
+                        result.errors[node.name] = str(error)
+                        result.status[node.name] = FAILED
+                        result.values[node.name] = self._fallback(node, error)
+                    self._notify_done(on_node_done, node.name, result)
+
+        return result
+
+    @staticmethod
+    def _notify_done(on_node_done: Optional[Callable[[str, Any, str], None]], name: str,
+                     result: PipelineResult):
+        """Report a resolved node, never letting the hook break the run."""
+        if on_node_done is None:
+            return
+        try:
+            on_node_done(name, result.values[name], result.status[name])
+        except Exception as e:
+            logger.warning(f"Pipeline hook failed for node '{name}': {str(e)}")
+
+    def _skip_if_inputs_missing(self, node: PipelineNode, result: PipelineResult) -> bool:
+        """Resolve a node without running it if an input has no usable value."""
+        missing = [
+            dependency for dependency in node.inputs
+            if result.status[dependency] in (FAILED, SKIPPED) and result.values.get(dependency) is None
+        ]
+        if not missing:
+            return False
+
+        logger.warning(f"Skipping pipeline node '{node.name}': inputs unavailable ({', '.join(missing)})")
+        result.status[node.name] = SKIPPED
+        result.timings[node.name] = 0.0
+        result.values[node.name] = self._fallback(node, None)
+        return True
+
+    @staticmethod
+    def _timed(node: PipelineNode, inputs: Dict[str, Any]) -> Tuple[Any, Optional[BaseException], float]:
+        """Run a node, returning (value, error, seconds elapsed)."""
+        start = time.perf_counter()
+        try:
+            return node.fn(**inputs), None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    @staticmethod
+    def _fallback(node: PipelineNode, error: Optional[BaseException]) -> Any:
+        """Default value of a failed or skipped node (None without a fallback)."""
+        if node.fallback is None:
+            return None
+        try:
+            return node.fallback(error)
+        except Exception as e:
+            logger.error(f"Fallback of pipeline node '{node.name}' failed: {str(e)}")
+            return None
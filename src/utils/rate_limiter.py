@@ -1,63 +1,432 @@
 """
 Rate Limiting Utility
 
-Centralized rate limiting for API calls to prevent hitting rate limits.
+Centralized token-bucket rate limiting for outbound API calls.
+
+Every service (SerpAPI, Gemini, Google Ads, page scraping) has a quota made
+of a sustained rate and a burst capacity. Buckets live in a backend: the
+in-memory backend is shared by the threads and event loops of one process,
+while the SQLite backend keeps buckets in a file guarded by SQLite's write
+lock, so every worker process on a node draws from one quota (a stand-in for
+a Redis-backed limiter).
 """
 
+import os
 import time
+import random
+import sqlite3
+import asyncio
 import logging
-from typing import Dict, Optional
+import weakref
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from .sqlite_cache import LazySingleton, SQLiteStore
 
 logger = logging.getLogger(__name__)
 
-class RateLimiter:
+DEFAULT_DB_PATH = 'rate_limits.db'  # In the data directory (see sqlite_cache)
+
+
+@dataclass
+class RateLimit:
+    """
+    Quota of a service: sustained requests per second and burst capacity.
+
+    Raises:
+        ValueError: If the rate is not positive or the burst is below one request
+    """
+    rate: float
+    burst: float = 1.0
+
+    def __post_init__(self):
+        if not self.rate > 0:
+            raise ValueError(f"Rate limit must allow a positive rate, got {self.rate}")
+        if not self.burst >= 1:
+            raise ValueError(f"Rate limit burst must be at least 1, got {self.burst}")
+
+
+DEFAULT_LIMITS: Dict[str, RateLimit] = {
+    'serpapi': RateLimit(rate=1 / 3, burst=3),  # One request per 3 seconds sustained
+    'gemini': RateLimit(rate=2.0, burst=2),
+    'google_ads': RateLimit(rate=10.0, burst=10),
+    'browser_scraping': RateLimit(rate=4.0, burst=8)  # Node-wide cap; per-host pacing is HostScheduler's job
+}
+
+
+def _refill(tokens: float, updated: float, now: float, limit: RateLimit) -> float:
+    """Tokens in a bucket after refilling it from ``updated`` to ``now``."""
+    return min(limit.burst, tokens + max(0.0, now - updated) * limit.rate)
+
+
+def _reserve(tokens: float, requested: float, limit: RateLimit) -> Tuple[float, float]:
     """
-    Centralized rate limiter for managing API request rates.
+    Try to take tokens from a refilled bucket.
+
+    Returns:
+        Tuple of (remaining tokens, seconds to wait); a zero wait means the
+        tokens were taken
     """
-    
+    if tokens >= requested:
+        return tokens - requested, 0.0
+    return tokens, (requested - tokens) / limit.rate
+
+
+class MemoryBackend:
+    """Token buckets held in process memory, guarded by a lock."""
+
     def __init__(self):
-        self.last_request_times: Dict[str, float] = {}
-        self.rate_limits = {
-            'serpapi': 1.0,  # 1 second between SerpAPI requests
-            'gemini': 0.5,   # 0.5 seconds between Gemini requests  
-            'google_ads': 0.1,  # 0.1 seconds between Google Ads requests
-            'browser_scraping': 2.0  # 2 seconds between web scraping requests
-        }
-    
-    def wait_if_needed(self, service: str) -> None:
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = Lock()
+
+    def reserve(self, service: str, limit: RateLimit, tokens: float = 1.0) -> float:
         """
-        Wait if necessary to maintain rate limits for the specified service.
-        
+        Take tokens from a service's bucket if available.
+
         Args:
-            service: The service name (e.g., 'serpapi', 'gemini', etc.)
+            service: Service name
+            limit: Quota of the service
+            tokens: Tokens needed
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until they will be available
+        """
+        with self._lock:
+            now = time.time()
+            current, updated = self._buckets.get(service, (limit.burst, now))
+            remaining, wait = _reserve(_refill(current, updated, now, limit), tokens, limit)
+            self._buckets[service] = (remaining, now)
+            return wait
+
+    def penalize(self, service: str, limit: RateLimit, seconds: float) -> None:
+        """Empty a service's bucket so no request is allowed for ``seconds``."""
+        with self._lock:
+            now = time.time()
+            current, updated = self._buckets.get(service, (limit.burst, now))
+            tokens = min(0.0, _refill(current, updated, now, limit)) - seconds * limit.rate
+            self._buckets[service] = (tokens, now)
+
+    def available(self, service: str, limit: RateLimit) -> float:
+        """Tokens currently available to a service."""
+        with self._lock:
+            now = time.time()
+            current, updated = self._buckets.get(service, (limit.burst, now))
+            return _refill(current, updated, now, limit)
+
+
+class SQLiteBackend(SQLiteStore):
+    """
+    Token buckets stored in a SQLite file shared by every process on a node.
+
+    Each update runs in a ``BEGIN IMMEDIATE`` transaction, so SQLite's write
+    lock serializes refills and withdrawals across processes.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+            service TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """,
+    )
+    timeout = 30
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        Initialize the backend.
+
+        Args:
+            db_path: Path of the shared SQLite file (relative paths live in the data directory)
+        """
+        super().__init__(db_path)
+
+    def _load(self, conn: sqlite3.Connection, service: str, limit: RateLimit, now: float) -> float:
+        """Read and refill a bucket inside a transaction."""
+        row = conn.execute(
+            "SELECT tokens, updated_at FROM rate_limit_buckets WHERE service = ?", (service,)
+        ).fetchone()
+        if row is None:
+            return limit.burst
+        return _refill(row[0], row[1], now, limit)
+
+    def _store(self, conn: sqlite3.Connection, service: str, tokens: float, now: float) -> None:
+        """Write a bucket inside a transaction."""
+        conn.execute(
+            "INSERT OR REPLACE INTO rate_limit_buckets (service, tokens, updated_at) VALUES (?, ?, ?)",
+            (service, tokens, now)
+        )
+
+    def reserve(self, service: str, limit: RateLimit, tokens: float = 1.0) -> float:
+        """
+        Take tokens from a service's bucket if available.
+
+        Args:
+            service: Service name
+            limit: Quota of the service
+            tokens: Tokens needed
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until they will be available
         """
-        if service not in self.rate_limits:
+        with self._connect(immediate=True) as conn:
+            now = time.time()
+            remaining, wait = _reserve(self._load(conn, service, limit, now), tokens, limit)
+            self._store(conn, service, remaining, now)
+            return wait
+
+    def penalize(self, service: str, limit: RateLimit, seconds: float) -> None:
+        """Empty a service's bucket so no request is allowed for ``seconds``."""
+        with self._connect(immediate=True) as conn:
+            now = time.time()
+            tokens = min(0.0, self._load(conn, service, limit, now)) - seconds * limit.rate
+            self._store(conn, service, tokens, now)
+
+    def available(self, service: str, limit: RateLimit) -> float:
+        """Tokens currently available to a service."""
+        with self._connect(immediate=True) as conn:
+            return self._load(conn, service, limit, time.time())
+
+
+class RateLimiter:
+    """
+    Centralized token-bucket rate limiter for managing API request rates.
+
+    Threads call ``wait_if_needed(service)``, coroutines ``await acquire(service)``.
+    Both draw from the same buckets; coroutines additionally queue fairly.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, RateLimit]] = None, backend=None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            limits: Quotas by service name (defaults to DEFAULT_LIMITS)
+            backend: Bucket storage (defaults to an in-memory backend)
+        """
+        self.rate_limits: Dict[str, RateLimit] = dict(limits if limits is not None else DEFAULT_LIMITS)
+        self.backend = backend if backend is not None else MemoryBackend()
+
+        # Per event loop, per service FIFO queues of waiting coroutines
+        self._async_queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = \
+            weakref.WeakKeyDictionary()
+        self._async_queues_lock = Lock()
+
+    def _get_limit(self, service: str) -> Optional[RateLimit]:
+        """Quota of a service, or None (with a warning) if it is unknown."""
+        limit = self.rate_limits.get(service)
+        if limit is None:
             logger.warning(f"Unknown service '{service}' for rate limiting")
+        return limit
+
+    def try_acquire(self, service: str, tokens: float = 1.0) -> float:
+        """
+        Take tokens without waiting.
+
+        Args:
+            service: The service name
+            tokens: Tokens needed (request cost)
+
+        Returns:
+            0 if the request may proceed, otherwise seconds to wait before retrying
+
+        Raises:
+            ValueError: If more tokens are requested than the bucket can ever hold
+        """
+        limit = self._get_limit(service)
+        if limit is None:
+            return 0.0
+        if tokens > limit.burst:
+            raise ValueError(f"{service} request of {tokens} tokens exceeds its burst of {limit.burst}")
+        return self.backend.reserve(service, limit, tokens)
+
+    def wait_if_needed(self, service: str, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Block the calling thread until the service's quota allows a request.
+
+        Args:
+            service: The service name (e.g., 'serpapi', 'gemini', etc.)
+            tokens: Tokens needed (request cost)
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the tokens were acquired, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        logged = False
+
+        while True:
+            wait = self.try_acquire(service, tokens)
+            if wait <= 0:
+                return True
+
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+
+            if not logged:
+                logger.info(f"Rate limiting {service}: waiting {wait:.2f} seconds")
+                logged = True
+            # Small jitter so waiting threads and processes don't retry in lockstep
+            time.sleep(wait + random.uniform(0, 0.05))
+
+    def _async_queue(self, service: str) -> asyncio.Lock:
+        """FIFO queue of the coroutines waiting for a service on the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._async_queues_lock:
+            queues = self._async_queues.get(loop)
+            if queues is None:
+                queues = self._async_queues[loop] = {}
+            queue = queues.get(service)
+            if queue is None:
+                queue = queues[service] = asyncio.Lock()
+            return queue
+
+    async def acquire(self, service: str, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """
+        Wait without blocking the event loop until the service's quota allows a request.
+
+        Coroutines of one event loop are served in arrival order: only the
+        head of a service's queue polls the bucket, so a steady stream of new
+        callers can't starve one that has been waiting longer.
+
+        Args:
+            service: The service name
+            tokens: Tokens needed (request cost)
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the tokens were acquired, False on timeout
+        """
+        if self._get_limit(service) is None:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        queue = self._async_queue(service)
+
+        try:
+            if deadline is None:
+                await queue.acquire()
+            else:
+                await asyncio.wait_for(queue.acquire(), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            return False
+
+        try:
+            logged = False
+            while True:
+                wait = self.try_acquire(service, tokens)
+                if wait <= 0:
+                    return True
+
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    return False
+
+                if not logged:
+                    logger.info(f"Rate limiting {service}: waiting {wait:.2f} seconds")
+                    logged = True
+                await asyncio.sleep(wait + random.uniform(0, 0.05))
+        finally:
+            queue.release()
+
+    def penalize(self, service: str, seconds: float) -> None:
+        """
+        Pause a service for every caller, e.g. after the API answered 429.
+
+        Args:
+            service: The service name
+            seconds: How long no request should be allowed
+        """
+        limit = self._get_limit(service)
+        if limit is None:
             return
-        
-        current_time = time.time()
-        last_request_time = self.last_request_times.get(service, 0)
-        min_interval = self.rate_limits[service]
-        
-        time_since_last_request = current_time - last_request_time
-        
-        if time_since_last_request < min_interval:
-            sleep_time = min_interval - time_since_last_request
-            logger.info(f"Rate limiting {service}: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_times[service] = time.time()
-    
+        logger.warning(f"Pausing {service} requests for {seconds:.1f} seconds")
+        self.backend.penalize(service, limit, seconds)
+
+    def configure(self, service: str, rate: float, burst: float = 1.0) -> None:
+        """
+        Set or update the quota of a service.
+
+        Args:
+            service: The service name
+            rate: Sustained requests per second
+            burst: Maximum requests allowed back to back
+
+        Raises:
+            ValueError: If the rate is not positive or the burst is below 1
+        """
+        self.rate_limits[service] = RateLimit(rate=rate, burst=burst)
+        logger.info(f"Rate limit for {service} set to {rate} requests/second (burst {burst})")
+
     def set_rate_limit(self, service: str, interval: float) -> None:
         """
-        Set or update the rate limit for a service.
-        
+        Set or update the rate limit for a service as a minimum interval.
+
         Args:
             service: The service name
             interval: Minimum interval between requests in seconds
+
+        Raises:
+            ValueError: If the interval is not positive
         """
-        self.rate_limits[service] = interval
-        logger.info(f"Rate limit for {service} set to {interval} seconds")
+        if not interval > 0:
+            raise ValueError(f"Rate limit interval must be positive, got {interval}")
+        self.configure(service, rate=1.0 / interval, burst=1.0)
+
+    def get_status(self, service: str) -> Dict[str, float]:
+        """Get the quota and currently available tokens of a service (for monitoring)."""
+        limit = self._get_limit(service)
+        if limit is None:
+            return {}
+        return {
+            'rate': limit.rate,
+            'burst': limit.burst,
+            'available': round(self.backend.available(service, limit), 3)
+        }
+
+
+def _limits_from_env() -> Dict[str, RateLimit]:
+    """Default quotas with RATE_LIMIT_<SERVICE>_RPS / _BURST overrides applied (invalid ones are ignored)."""
+    limits = {}
+    for service, default in DEFAULT_LIMITS.items():
+        prefix = f"RATE_LIMIT_{service.upper()}"
+        try:
+            limits[service] = RateLimit(
+                rate=float(os.getenv(f"{prefix}_RPS", default.rate)),
+                burst=float(os.getenv(f"{prefix}_BURST", default.burst))
+            )
+        except ValueError as e:
+            logger.error(f"Invalid {prefix}_RPS/_BURST, using the default quota of {service}: {str(e)}")
+            limits[service] = default
+    return limits
+
+
+def _build_rate_limiter() -> RateLimiter:
+    """Rate limiter configured from the environment (see get_rate_limiter)."""
+    backend = None
+    if os.getenv('RATE_LIMIT_BACKEND', 'memory').lower() == 'sqlite':
+        try:
+            backend = SQLiteBackend(os.getenv('RATE_LIMIT_DB_PATH', DEFAULT_DB_PATH))
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"Shared rate limit backend unavailable, using in-memory buckets: {str(e)}")
+    return RateLimiter(_limits_from_env(), backend)
+
+
+_rate_limiter = LazySingleton(_build_rate_limiter)
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide rate limiter, configured from the environment.
+
+    Environment variables:
+        RATE_LIMIT_BACKEND: 'memory' (default) or 'sqlite' to share quotas between processes
+        RATE_LIMIT_DB_PATH: SQLite file of the shared backend (default: rate_limits.db in DATA_DIR)
+        RATE_LIMIT_<SERVICE>_RPS / RATE_LIMIT_<SERVICE>_BURST: Per-service quota overrides
+    """
+    return _rate_limiter.get()
+
 
 # Global rate limiter instance
-rate_limiter = RateLimiter()
+rate_limiter = get_rate_limiter()
@@ -10,7 +10,7 @@ import json
 from typing import Dict, Any, Optional
 from urllib.parse import urlparse
 
-from .gemini_nlp_client import GeminiNLPClient
+from .gemini_nlp_client import GeminiNLPClient, get_gemini_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,14 +24,15 @@ class SearchIntentAnalyzer:
     instead of mock data, with Gemini API integration for classification.
     """
     
-    def __init__(self, gemini_api_key: str):
+    def __init__(self, gemini_api_key: str, gemini_client: Optional[GeminiNLPClient] = None):
         """
         Initialize the search intent analyzer.
         
         Args:
             gemini_api_key: Gemini API key for content analysis
+            gemini_client: Shared Gemini client (defaults to the registry's client for the key)
         """
-        self.gemini_client = GeminiNLPClient(api_key=gemini_api_key)
+        self.gemini_client = gemini_client or get_gemini_client(gemini_api_key)
     
     def classify_intent(self, keyword: str, serp_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -39,8 +40,14 @@ class SearchIntentAnalyzer:
         - Analyze actual SERP features from real SerpAPI data
         - Use Gemini API for real intent classification
         - Calculate confidence based on real signal strength
+        
+        ``serp_data`` may be a raw SerpAPI response or a shared SerpSnapshot,
+        in which case its already-fetched raw response is used.
         """
         
+        # Reuse the snapshot's raw response instead of fetching again
+        serp_data = getattr(serp_data, "raw", serp_data)
+        
         # MUST: Extract real SERP signals
         real_signals = self._extract_real_serp_signals(serp_data)
         
@@ -71,7 +78,10 @@ class SearchIntentAnalyzer:
         
         # MUST: Make real API call to Gemini
         try:
-            response = self.gemini_client.generate_content(intent_prompt)
+            response = self.gemini_client.generate_content(
+                intent_prompt,
+                validate=self._is_usable_intent_response
+            )
             classification = self._parse_real_intent_response(response)
             
             # MUST: Validate response is not mock data
@@ -175,6 +185,22 @@ class SearchIntentAnalyzer:
             logger.error(f"Error parsing intent classification: {str(e)}")
             raise ValueError(f"Failed to parse classification: {str(e)}")
     
+    def _is_usable_intent_response(self, response: str) -> bool:
+        """
+        Check that a raw Gemini response parses into a valid classification
+        (used to keep unusable responses out of the response cache).
+        
+        Args:
+            response: Raw response from Gemini API
+            
+        Returns:
+            True if the response can be used
+        """
+        try:
+            return self._is_valid_real_classification(self._parse_real_intent_response(response))
+        except ValueError:
+            return False
+    
     def _is_valid_real_classification(self, classification: Dict[str, Any]) -> bool:
         """
         Validate that classification contains real data, not mock.
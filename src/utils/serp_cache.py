@@ -0,0 +1,244 @@
+"""
+SERP Response Cache
+
+Disk-backed TTL cache for raw SerpAPI responses, shared by every SerpAPI
+caller (SerpAPIClient, SerpAPIKeywordAnalyzer and SerpCollector) so repeat
+lookups for the same query don't cost quota or rate-limit waits.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from typing import Dict, Any, Optional
+
+from .sqlite_cache import LazySingleton, SQLiteCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = 'serp_cache.db'  # In the data directory (see sqlite_cache)
+DEFAULT_TTL = 24 * 3600  # 24 hours
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class SerpCache(SQLiteCache):
+    """
+    SQLite-backed cache for raw SERP payloads.
+
+    Entries are keyed by the normalized (query, location, engine) triple plus
+    any extra request parameters that change the result set (e.g. ``num``).
+    Expired entries are ignored on read, and the least recently used entries
+    are evicted once the cache grows beyond ``max_entries``.
+    """
+
+    NAME = 'SERP cache'
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS serp_cache (
+            cache_key TEXT PRIMARY KEY,
+            query TEXT NOT NULL,
+            location TEXT,
+            engine TEXT,
+            payload TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_accessed REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_serp_cache_last_accessed ON serp_cache(last_accessed)"
+    )
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, ttl: int = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, enabled: bool = True):
+        """
+        Initialize the SERP cache.
+
+        Args:
+            db_path: Path of the SQLite cache file (relative paths live in the data directory)
+            ttl: Time-to-live of an entry in seconds
+            max_entries: Maximum number of entries kept before LRU eviction
+            enabled: When False, every lookup is a miss and nothing is stored
+        """
+        self.evictions = 0
+        super().__init__(db_path, ttl, max_entries, enabled)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize a query so trivially different spellings share an entry."""
+        return ' '.join((query or '').lower().split())
+
+    def make_key(self, query: str, location: Optional[str] = None, engine: str = 'google', **params) -> str:
+        """
+        Build the cache key for a SERP request.
+
+        Args:
+            query: Search query
+            location: Search location
+            engine: SerpAPI engine name
+            **params: Additional request parameters that affect the result
+
+        Returns:
+            Hex digest identifying the request
+        """
+        params.pop('api_key', None)
+        key_data = {
+            'q': self.normalize_query(query),
+            'location': (location or '').strip().lower(),
+            'engine': engine,
+            'params': {k: params[k] for k in sorted(params)}
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def get(self, query: str, location: Optional[str] = None, engine: str = 'google', **params) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached SERP payload.
+
+        Args:
+            query: Search query
+            location: Search location
+            engine: SerpAPI engine name
+            **params: Additional request parameters that affect the result
+
+        Returns:
+            Cached payload or None on a miss or expired entry
+        """
+        if not self.enabled:
+            return None
+
+        cache_key = self.make_key(query, location, engine, **params)
+        now = time.time()
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT payload, created_at FROM serp_cache WHERE cache_key = ?",
+                    (cache_key,)
+                ).fetchone()
+
+                if row and now - row[1] < self.ttl:
+                    conn.execute(
+                        "UPDATE serp_cache SET last_accessed = ? WHERE cache_key = ?",
+                        (now, cache_key)
+                    )
+                    self._count('hits')
+                    logger.info(f"SERP cache hit for query: {query}")
+                    return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"SERP cache read failed for query '{query}': {str(e)}")
+
+        self._count('misses')
+        return None
+
+    def set(self, query: str, payload: Dict[str, Any], location: Optional[str] = None,
+            engine: str = 'google', **params) -> None:
+        """
+        Store a SERP payload, evicting least recently used entries if needed.
+
+        Args:
+            query: Search query
+            payload: Raw SerpAPI response to store
+            location: Search location
+            engine: SerpAPI engine name
+            **params: Additional request parameters that affect the result
+        """
+        if not self.enabled or not isinstance(payload, dict):
+            return
+
+        # Never cache API error responses
+        if payload.get('error'):
+            return
+
+        cache_key = self.make_key(query, location, engine, **params)
+        now = time.time()
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO serp_cache
+                        (cache_key, query, location, engine, payload, created_at, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (cache_key, self.normalize_query(query), location, engine,
+                     json.dumps(payload), now, now)
+                )
+                self._evict(conn)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"SERP cache write failed for query '{query}': {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop expired entries and trim the cache to max_entries (LRU)."""
+        conn.execute("DELETE FROM serp_cache WHERE created_at < ?", (time.time() - self.ttl,))
+
+        count = conn.execute("SELECT COUNT(*) FROM serp_cache").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                """
+                DELETE FROM serp_cache WHERE cache_key IN (
+                    SELECT cache_key FROM serp_cache ORDER BY last_accessed ASC LIMIT ?
+                )
+                """,
+                (overflow,)
+            )
+            self._count('evictions', overflow)
+            logger.info(f"SERP cache evicted {overflow} least recently used entries")
+
+    def invalidate(self, query: str, location: Optional[str] = None, engine: str = 'google', **params) -> None:
+        """Remove a single entry from the cache."""
+        if not self.enabled:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "DELETE FROM serp_cache WHERE cache_key = ?",
+                    (self.make_key(query, location, engine, **params),)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"SERP cache invalidation failed for query '{query}': {str(e)}")
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        if not self.enabled:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM serp_cache")
+        except sqlite3.Error as e:
+            logger.warning(f"SERP cache clear failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counters and current size
+        """
+        return {
+            'enabled': self.enabled,
+            'entries': self._scalar("SELECT COUNT(*) FROM serp_cache"),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            **self._hit_stats(),
+            'evictions': self.evictions
+        }
+
+
+_serp_cache = LazySingleton(
+    lambda: SerpCache.from_env('SERP_CACHE', DEFAULT_CACHE_PATH, DEFAULT_TTL, DEFAULT_MAX_ENTRIES)
+)
+
+
+def get_serp_cache() -> SerpCache:
+    """
+    Get the process-wide SERP cache, configured from the environment.
+
+    Environment variables:
+        SERP_CACHE_PATH: SQLite file path (default: serp_cache.db in DATA_DIR)
+        SERP_CACHE_TTL: Entry lifetime in seconds (default: 86400)
+        SERP_CACHE_MAX_ENTRIES: LRU size bound (default: 5000)
+        SERP_CACHE_ENABLED: Set to 'false' to disable caching
+    """
+    return _serp_cache.get()
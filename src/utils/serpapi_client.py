@@ -4,8 +4,9 @@ SerpAPI Integration Module
 This module provides integration with SerpAPI for SERP data retrieval.
 """
 
+import asyncio
 import logging
-import time
+from threading import Lock
 from typing import Dict, Any, List, Optional
 
 try:
@@ -13,6 +14,9 @@ try:
 except ImportError:
     GoogleSearch = None
 
+from .serp_cache import SerpCache, get_serp_cache
+from .rate_limiter import RateLimiter, get_rate_limiter
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,41 +28,36 @@ class SerpAPIClient:
     This class provides methods for retrieving SERP data using SerpAPI.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Fixed search parameters (also part of the SERP cache key)
+    SEARCH_PARAMS = {"hl": "en", "gl": "us", "google_domain": "google.com"}
+    
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[SerpCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
         """
         Initialize the SerpAPI client.
 
         Args:
             api_key: SerpAPI key
+            cache: SERP response cache (defaults to the shared process-wide cache)
+            rate_limiter: Rate limiter holding the 'serpapi' quota (defaults to the shared one)
         """
         self.api_key = api_key
-        self.last_request_time = 0
-        self.min_request_interval = 3.0  # Increased to 3 seconds between requests
+        self.cache = cache if cache is not None else get_serp_cache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
 
         if not api_key:
             logger.warning("SerpAPI client initialized without API key")
         if GoogleSearch is None:
             logger.error("GoogleSearch class not found. Please install 'serpapi' package.")
     
-    def _rate_limit(self):
-        """Implement aggressive rate limiting to avoid hitting API limits."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            logger.info(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
-    
-    def get_serp_data(self, query: str, location: str = "United States") -> Dict[str, Any]:
+    def get_serp_data(self, query: str, location: str = "United States", force_refresh: bool = False) -> Dict[str, Any]:
         """
         Get SERP data for a query.
         
         Args:
             query: Search query
             location: Search location
+            force_refresh: Bypass the SERP cache and fetch a fresh result
             
         Returns:
             Dictionary containing SERP data
@@ -68,109 +67,192 @@ class SerpAPIClient:
         """
         logger.info(f"Getting SERP data for query: {query}")
         
-        # Check if GoogleSearch is available and API key is provided
-        if GoogleSearch is None or not self.api_key:
-            raise Exception("SerpAPI client not properly initialized. Please provide a valid API key and ensure 'serpapi' is installed.")
+        return self._process_results(query, self.get_raw_serp_data(query, location, force_refresh))
+    
+    def get_raw_serp_data(self, query: str, location: str = "United States", force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get the unprocessed SerpAPI response for a query.
+        
+        Cached responses are returned without touching the network or the
+        rate limiter unless ``force_refresh`` is set.
+        
+        Args:
+            query: Search query
+            location: Search location
+            force_refresh: Bypass the SERP cache and fetch a fresh result
+            
+        Returns:
+            Raw SerpAPI response dictionary
+            
+        Raises:
+            Exception: If API is not available or request fails
+        """
+        cached = self._get_cached(query, location, force_refresh)
+        if cached is not None:
+            return cached
+        
+        self._check_available()
 
-        # Apply rate limiting
-        self._rate_limit()
+        # Apply rate limiting (shared SerpAPI quota)
+        self.rate_limiter.wait_if_needed('serpapi')
 
         try:
-            # Set up search parameters
-            params = {
-                "q": query,
-                "location": location,
-                "hl": "en",
-                "gl": "us",
-                "google_domain": "google.com",
-                "api_key": self.api_key
-            }
-
-            # Always use GoogleSearch
-            search = GoogleSearch(params)
-            results = search.get_dict()
-
-            # Extract relevant data
-            organic_results = results.get("organic_results", [])
+            results = self._fetch_raw_results(query, location)
+            self.cache.set(query, results, location, "google", **self.SEARCH_PARAMS)
+            return results
             
-            # Extract SERP features
-            features = {}
-            
-            # Featured snippet
-            if "answer_box" in results:
-                features["featured_snippets"] = {
-                    "presence": "strong",
-                    "data": results["answer_box"]
-                }
-            else:
-                features["featured_snippets"] = {"presence": "none"}
-            
-            # People also ask
-            if "related_questions" in results:
-                features["people_also_ask"] = {
-                    "presence": "strong",
-                    "data": results["related_questions"],
-                    "count": len(results["related_questions"])
-                }
-            else:
-                features["people_also_ask"] = {"presence": "none"}
-            
-            # Knowledge panel
-            if "knowledge_graph" in results:
-                features["knowledge_panels"] = {
-                    "presence": "strong",
-                    "data": results["knowledge_graph"]
-                }
-            else:
-                features["knowledge_panels"] = {"presence": "none"}
-            
-            # Image pack
-            if "images_results" in results:
-                features["image_packs"] = {
-                    "presence": "strong",
-                    "data": results["images_results"],
-                    "count": len(results["images_results"])
-                }
-            else:
-                features["image_packs"] = {"presence": "none"}
+        except Exception as e:
+            raise self._request_error(query, e)
+    
+    def _get_cached(self, query: str, location: str, force_refresh: bool) -> Optional[Dict[str, Any]]:
+        """Cached raw response for a query, or None on a miss or forced refresh."""
+        if force_refresh:
+            return None
+        return self.cache.get(query, location, "google", **self.SEARCH_PARAMS)
+    
+    def _check_available(self) -> None:
+        """Raise if GoogleSearch is missing or no API key is configured."""
+        if GoogleSearch is None or not self.api_key:
+            raise Exception("SerpAPI client not properly initialized. Please provide a valid API key and ensure 'serpapi' is installed.")
+    
+    def _request_error(self, query: str, error: Exception) -> Exception:
+        """
+        Log a failed SerpAPI request and build the exception to raise.
+        
+        A 429 response pauses every SerpAPI caller sharing the rate limiter.
+        """
+        logger.error(f"Error getting SERP data: {str(error)}")
+        # Check if it's a rate limit error and pause every SerpAPI caller
+        if "429" in str(error) or "Too Many Requests" in str(error):
+            logger.warning(f"Rate limit hit for query '{query}', pausing SerpAPI requests...")
+            self.rate_limiter.penalize('serpapi', 10)
+        # Re-raise the exception instead of falling back to mock data
+        return Exception(f"Failed to get SERP data for query '{query}': {str(error)}")
+    
+    def _fetch_raw_results(self, query: str, location: str) -> Dict[str, Any]:
+        """
+        Run a single SerpAPI search and return the raw response.
+        
+        Args:
+            query: Search query
+            location: Search location
             
-            # Video results
-            if "inline_videos" in results:
-                features["video_results"] = {
-                    "presence": "strong",
-                    "data": results["inline_videos"],
-                    "count": len(results["inline_videos"])
-                }
-            else:
-                features["video_results"] = {"presence": "none"}
+        Returns:
+            Raw SerpAPI response dictionary
+        """
+        # Set up search parameters
+        params = {
+            "q": query,
+            "location": location,
+            "api_key": self.api_key,
+            **self.SEARCH_PARAMS
+        }
+
+        # Always use GoogleSearch
+        search = GoogleSearch(params)
+        return search.get_dict()
+    
+    def _process_results(self, query: str, results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a raw SerpAPI response into the normalized SERP data format.
+        
+        Args:
+            query: Search query
+            results: Raw SerpAPI response
             
-            # Compile SERP data
-            serp_data = {
-                "query": query,
-                "organic_results": organic_results,
-                "features": features,
-                "pagination": results.get("pagination", {}),
-                "search_information": results.get("search_information", {})
+        Returns:
+            Dictionary containing SERP data
+        """
+        # Extract relevant data
+        organic_results = results.get("organic_results", [])
+        
+        # Extract SERP features
+        features = {}
+        
+        # Featured snippet
+        if "answer_box" in results:
+            features["featured_snippets"] = {
+                "presence": "strong",
+                "data": results["answer_box"]
             }
+        else:
+            features["featured_snippets"] = {"presence": "none"}
+        
+        # People also ask
+        if "related_questions" in results:
+            features["people_also_ask"] = {
+                "presence": "strong",
+                "data": results["related_questions"],
+                "count": len(results["related_questions"])
+            }
+        else:
+            features["people_also_ask"] = {"presence": "none"}
+        
+        # Knowledge panel
+        if "knowledge_graph" in results:
+            features["knowledge_panels"] = {
+                "presence": "strong",
+                "data": results["knowledge_graph"]
+            }
+        else:
+            features["knowledge_panels"] = {"presence": "none"}
+        
+        # Image pack
+        if "images_results" in results:
+            features["image_packs"] = {
+                "presence": "strong",
+                "data": results["images_results"],
+                "count": len(results["images_results"])
+            }
+        else:
+            features["image_packs"] = {"presence": "none"}
+        
+        # Video results
+        if "inline_videos" in results:
+            features["video_results"] = {
+                "presence": "strong",
+                "data": results["inline_videos"],
+                "count": len(results["inline_videos"])
+            }
+        else:
+            features["video_results"] = {"presence": "none"}
+        
+        # Compile SERP data
+        serp_data = {
+            "query": query,
+            "organic_results": organic_results,
+            "features": features,
+            "pagination": results.get("pagination", {}),
+            "search_information": results.get("search_information", {})
+        }
+        
+        return serp_data
+    
+    def create_snapshot(self, query: str, location: str = "United States", force_refresh: bool = False) -> "SerpSnapshot":
+        """
+        Create a lazily-fetched SERP snapshot for a query.
+        
+        The snapshot performs at most one SerpAPI request, no matter how many
+        analyzers read from it.
+        
+        Args:
+            query: Search query
+            location: Search location
+            force_refresh: Bypass the SERP cache for the snapshot's fetch
             
-            return serp_data
-            
-        except Exception as e:
-            logger.error(f"Error getting SERP data: {str(e)}")
-            # Check if it's a rate limit error and wait longer
-            if "429" in str(e) or "Too Many Requests" in str(e):
-                logger.warning(f"Rate limit hit for query '{query}', waiting 10 seconds...")
-                time.sleep(10)
-            # Re-raise the exception instead of falling back to mock data
-            raise Exception(f"Failed to get SERP data for query '{query}': {str(e)}")
+        Returns:
+            SerpSnapshot bound to this client
+        """
+        return SerpSnapshot(self, query, location, force_refresh)
     
-    def get_competitors(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_competitors(self, query: str, limit: int = 10, snapshot: Optional["SerpSnapshot"] = None) -> List[Dict[str, Any]]:
         """
         Get competitors for a query.
         
         Args:
             query: Search query
             limit: Maximum number of competitors to return
+            snapshot: Optional pre-fetched SERP snapshot to read from
             
         Returns:
             List of competitor data
@@ -182,39 +264,53 @@ class SerpAPIClient:
         
         try:
             # Get SERP data
-            serp_data = self.get_serp_data(query)
-            
-            # Extract organic results
-            organic_results = serp_data.get("organic_results", [])
+            serp_data = snapshot.data if snapshot is not None else self.get_serp_data(query)
             
-            # Convert to competitor format
-            competitors = []
-            for i, result in enumerate(organic_results):
-                if i >= limit:
-                    break
-                    
-                competitor = {
-                    "url": result.get("link", ""),
-                    "title": result.get("title", ""),
-                    "snippet": result.get("snippet", ""),
-                    "position": i + 1,
-                    "domain": self._extract_domain(result.get("link", ""))
-                }
-                
-                competitors.append(competitor)
-            
-            return competitors
+            return self.extract_competitors(serp_data, limit)
             
         except Exception as e:
             logger.error(f"Error getting competitors: {str(e)}")
             raise Exception(f"Failed to get competitors for query '{query}': {str(e)}")
     
-    def get_serp_features(self, query: str) -> Dict[str, Any]:
+    def extract_competitors(self, serp_data: Dict[str, Any], limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Convert the organic results of processed SERP data to competitor format.
+        
+        Args:
+            serp_data: SERP data as returned by get_serp_data
+            limit: Maximum number of competitors to return
+            
+        Returns:
+            List of competitor data
+        """
+        # Extract organic results
+        organic_results = serp_data.get("organic_results", [])
+        
+        # Convert to competitor format
+        competitors = []
+        for i, result in enumerate(organic_results):
+            if i >= limit:
+                break
+                
+            competitor = {
+                "url": result.get("link", ""),
+                "title": result.get("title", ""),
+                "snippet": result.get("snippet", ""),
+                "position": i + 1,
+                "domain": self._extract_domain(result.get("link", ""))
+            }
+            
+            competitors.append(competitor)
+        
+        return competitors
+    
+    def get_serp_features(self, query: str, snapshot: Optional["SerpSnapshot"] = None) -> Dict[str, Any]:
         """
         Get SERP features for a query.
         
         Args:
             query: Search query
+            snapshot: Optional pre-fetched SERP snapshot to read from
             
         Returns:
             Dictionary of SERP features
@@ -226,7 +322,7 @@ class SerpAPIClient:
         
         try:
             # Get SERP data
-            serp_data = self.get_serp_data(query)
+            serp_data = snapshot.data if snapshot is not None else self.get_serp_data(query)
             
             # Extract features
             features = serp_data.get("features", {})
@@ -258,3 +354,183 @@ class SerpAPIClient:
                 if len(parts) > 2:
                     return parts[2]
             return ""
+
+
+class SerpSnapshot:
+    """
+    Per-request SERP snapshot shared across analyzers.
+    
+    The first access to ``raw`` or ``data`` performs the SerpAPI request; every
+    later access (from any thread) reuses the same response. A failed fetch is
+    remembered as well, so consumers don't retry a paid request that already
+    failed for this keyword.
+    """
+    
+    def __init__(self, client: SerpAPIClient, query: str, location: str = "United States",
+                 force_refresh: bool = False):
+        """
+        Initialize the snapshot.
+        
+        Args:
+            client: SerpAPI client used for the single fetch
+            query: Search query
+            location: Search location
+            force_refresh: Bypass the SERP cache for the fetch
+        """
+        self.client = client
+        self.query = query
+        self.location = location
+        self.force_refresh = force_refresh
+        self._raw = None
+        self._data = None
+        self._error = None
+        self._lock = Lock()
+    
+    def _ensure_fetched(self):
+        """Fetch the SERP once, caching either the result or the error."""
+        with self._lock:
+            if self._data is None and self._error is None:
+                try:
+                    self._raw = self.client.get_raw_serp_data(self.query, self.location, self.force_refresh)
+                    self._data = self.client._process_results(self.query, self._raw)
+                except Exception as e:
+                    self._error = e
+        
+        if self._error is not None:
+            raise self._error
+    
+    @property
+    def fetched(self) -> bool:
+        """Whether the SerpAPI request has already been made."""
+        return self._data is not None or self._error is not None
+    
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """Raw SerpAPI response (the format SearchIntentAnalyzer expects)."""
+        self._ensure_fetched()
+        return self._raw
+    
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Processed SERP data (the format returned by get_serp_data)."""
+        self._ensure_fetched()
+        return self._data
+
+
+class AsyncSerpAPIClient:
+    """
+    Asyncio front end of SerpAPIClient.
+    
+    Shares the wrapped client's cache and rate limiter, but waits for the
+    'serpapi' quota with ``await rate_limiter.acquire()`` and runs the blocking
+    SerpAPI request in the loop's executor, so one event loop can overlap the
+    SERP fetches of many keyword pipelines.
+    """
+    
+    def __init__(self, client: Optional[SerpAPIClient] = None, api_key: Optional[str] = None):
+        """
+        Initialize the async client.
+        
+        Args:
+            client: Synchronous client to wrap (created from ``api_key`` if omitted)
+            api_key: SerpAPI key, used when no client is given
+        """
+        self.client = client if client is not None else SerpAPIClient(api_key=api_key)
+    
+    async def get_raw_serp_data(self, query: str, location: str = "United States",
+                                force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get the unprocessed SerpAPI response for a query.
+        
+        Args:
+            query: Search query
+            location: Search location
+            force_refresh: Bypass the SERP cache and fetch a fresh result
+            
+        Returns:
+            Raw SerpAPI response dictionary
+            
+        Raises:
+            Exception: If API is not available or request fails
+        """
+        client = self.client
+        loop = asyncio.get_running_loop()
+        
+        # The cache is a local SQLite file, cheap enough to read inline
+        cached = client._get_cached(query, location, force_refresh)
+        if cached is not None:
+            return cached
+        
+        client._check_available()
+        
+        await client.rate_limiter.acquire('serpapi')
+        
+        try:
+            results = await loop.run_in_executor(None, client._fetch_raw_results, query, location)
+        except Exception as e:
+            raise client._request_error(query, e)
+        
+        client.cache.set(query, results, location, "google", **client.SEARCH_PARAMS)
+        return results
+    
+    async def get_serp_data(self, query: str, location: str = "United States",
+                            force_refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get processed SERP data for a query.
+        
+        Args:
+            query: Search query
+            location: Search location
+            force_refresh: Bypass the SERP cache and fetch a fresh result
+            
+        Returns:
+            Dictionary containing SERP data
+            
+        Raises:
+            Exception: If API is not available or request fails
+        """
+        logger.info(f"Getting SERP data for query: {query}")
+        
+        raw = await self.get_raw_serp_data(query, location, force_refresh)
+        return self.client._process_results(query, raw)
+    
+    async def get_competitors(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get competitors for a query.
+        
+        Args:
+            query: Search query
+            limit: Maximum number of competitors to return
+            
+        Returns:
+            List of competitor data
+            
+        Raises:
+            Exception: If API request fails
+        """
+        try:
+            serp_data = await self.get_serp_data(query)
+            return self.client.extract_competitors(serp_data, limit)
+        except Exception as e:
+            logger.error(f"Error getting competitors: {str(e)}")
+            raise Exception(f"Failed to get competitors for query '{query}': {str(e)}")
+    
+    async def get_serp_features(self, query: str) -> Dict[str, Any]:
+        """
+        Get SERP features for a query.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Dictionary of SERP features
+            
+        Raises:
+            Exception: If API request fails
+        """
+        try:
+            serp_data = await self.get_serp_data(query)
+            return serp_data.get("features", {})
+        except Exception as e:
+            logger.error(f"Error getting SERP features: {str(e)}")
+            raise Exception(f"Failed to get SERP features for query '{query}': {str(e)}")
@@ -9,31 +9,23 @@ import requests
 from typing import Dict, Any, List, Optional
 import random
 
+from .serp_cache import SerpCache, get_serp_cache
+from .rate_limiter import RateLimiter, get_rate_limiter
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SerpAPIKeywordAnalyzer:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[SerpCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
         self.api_key = api_key or os.getenv('SERPAPI_KEY')
+        self.cache = cache if cache is not None else get_serp_cache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
         self.base_url = "https://serpapi.com/search"
-        self.last_request_time = 0
-        self.min_request_interval = 3.0  # Increased to 3 seconds between requests
         
         if not self.api_key:
             raise Exception("SerpAPI key not provided. Please set SERPAPI_KEY environment variable.")
 
-    def _rate_limit(self):
-        """Implement aggressive rate limiting to avoid hitting API limits."""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            logger.info(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
-
     def get_keyword_metrics(self, seed_keywords: List[str]) -> List[Dict[str, Any]]:
         """
         Get keyword metrics for a list of seed keywords.
@@ -128,23 +120,27 @@ class SerpAPIKeywordAnalyzer:
             logger.error(f"Error analyzing keyword {keyword}: {str(e)}")
             raise Exception(f"Failed to analyze keyword '{keyword}': {str(e)}")
     
-    def _get_serp_data(self, keyword: str) -> Dict[str, Any]:
-        """Get SERP data from SerpAPI with aggressive rate limiting."""
-        self._rate_limit()
-        
-        params = {
-            "engine": "google",
-            "q": keyword,
-            "api_key": self.api_key,
-            "num": 20,
-            "hl": "en",
-            "gl": "us"
-        }
+    def _get_serp_data(self, keyword: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """Get SERP data from the SERP cache or SerpAPI with aggressive rate limiting."""
+        search_params = {"num": 20, "hl": "en", "gl": "us"}
+        
+        data = None if force_refresh else self.cache.get(keyword, None, "google", **search_params)
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
+            if data is None:
+                self.rate_limiter.wait_if_needed('serpapi')
+                
+                params = {
+                    "engine": "google",
+                    "q": keyword,
+                    "api_key": self.api_key,
+                    **search_params
+                }
+                
+                response = requests.get(self.base_url, params=params, timeout=15)
+                response.raise_for_status()
+                data = response.json()
+                self.cache.set(keyword, data, None, "google", **search_params)
             
             return {
                 "organic_results": data.get("organic_results", []),
@@ -157,9 +153,9 @@ class SerpAPIKeywordAnalyzer:
                 "is_real_data": True
             }
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
-                logger.warning(f"Rate limit hit for keyword '{keyword}', waiting longer...")
-                time.sleep(10)  # Wait 10 seconds if we hit rate limit
+            if e.response is not None and e.response.status_code == 429:
+                logger.warning(f"Rate limit hit for keyword '{keyword}', pausing SerpAPI requests...")
+                self.rate_limiter.penalize('serpapi', 10)  # Every SerpAPI caller waits 10 seconds
                 raise e
             else:
                 raise e
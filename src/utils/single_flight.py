@@ -0,0 +1,141 @@
+"""
+Single-Flight Request Coalescing
+
+Deduplicates concurrent calls for the same key: the first caller (the
+leader) runs the computation while later callers with the same key wait for
+it and share its result or error. Events emitted by the computation (progress
+updates, partial results) are fanned out to every caller's listener, and late
+joiners get the events emitted so far replayed before any newer one, so each
+caller can keep its own status display or stream up to date.
+"""
+
+import logging
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[..., None]
+
+
+class _Subscriber:
+    """A caller's listener; live events are held back while its replay runs."""
+
+    def __init__(self, listener: Listener, replaying: bool):
+        self.listener = listener
+        self.replaying = replaying
+        self.pending: List[Tuple[Any, ...]] = []
+        self.lock = Lock()
+
+    def deliver(self, event: Tuple[Any, ...]):
+        """Deliver a live event, or hold it until the replay has finished."""
+        with self.lock:
+            if self.replaying:
+                self.pending.append(event)
+                return
+        SingleFlight._notify(self.listener, event)
+
+    def replay(self, events: List[Tuple[Any, ...]]):
+        """Deliver the events emitted before the caller joined, then those held back meanwhile."""
+        while True:
+            for event in events:
+                SingleFlight._notify(self.listener, event)
+            with self.lock:
+                if not self.pending:
+                    self.replaying = False
+                    return
+                events, self.pending = self.pending, []
+
+
+class _Call:
+    """State of one in-flight computation."""
+
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.listeners: List[_Subscriber] = []
+        self.events: List[Tuple[Any, ...]] = []
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls by key (threads only; nothing is cached once
+    a call finishes).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = Lock()
+
+    def do(self, key: Hashable, fn: Callable[[Listener], Any],
+           listener: Optional[Listener] = None) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` for a key, or wait for the call already running for it.
+
+        Args:
+            key: Deduplication key
+            fn: Computation, called with an ``emit(*event)`` function
+            listener: Optional callable receiving every event as ``listener(*event)``
+
+        Returns:
+            Tuple of (result, shared), where shared is True for callers that
+            joined another caller's computation
+
+        Raises:
+            Exception: Whatever ``fn`` raised, for the leader and every waiter
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+            # Registered together with its replay snapshot: each event is either replayed or live
+            subscriber = _Subscriber(listener, replaying=not leader) if listener is not None else None
+            if subscriber is not None:
+                call.listeners.append(subscriber)
+            replay = [] if leader else list(call.events)
+
+        if not leader:
+            if subscriber is not None:
+                subscriber.replay(replay)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        def emit(*event):
+            with self._lock:
+                call.events.append(event)
+                subscribers = list(call.listeners)
+            for subscriber in subscribers:
+                subscriber.deliver(event)
+
+        try:
+            call.result = fn(emit)
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.waiters:
+                    logger.info(f"Shared in-flight result with {call.waiters} concurrent caller(s)")
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
+
+    @staticmethod
+    def _notify(listener: Listener, event: Tuple[Any, ...]):
+        """Deliver an event, never letting a listener break the computation."""
+        try:
+            listener(*event)
+        except Exception as e:
+            logger.warning(f"Single-flight listener failed on event '{event[0] if event else ''}': {str(e)}")
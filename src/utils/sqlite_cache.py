@@ -0,0 +1,187 @@
+"""
+SQLite Cache Base
+
+Shared plumbing of the node-local SQLite stores (SERP, page and LLM caches
+and the shared rate-limit buckets): where their files live, connection
+handling, schema creation, environment configuration and the lazily built
+process-wide instances.
+
+Files live in the data directory, DATA_DIR or data/ at the repository root,
+rather than in whatever directory the process was started from. Relative
+paths (e.g. SERP_CACHE_PATH=serp_cache.db) are resolved inside it.
+"""
+
+import os
+import sqlite3
+import logging
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Callable, Dict, Generic, Optional, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data'
+)
+
+T = TypeVar('T')
+
+
+def get_data_dir() -> str:
+    """Directory holding the local SQLite files (DATA_DIR, default: data/ at the repository root)."""
+    return os.getenv('DATA_DIR') or DEFAULT_DATA_DIR
+
+
+def resolve_path(db_path: str) -> str:
+    """Resolve a SQLite file path against the data directory (absolute paths are kept)."""
+    if db_path == ':memory:':
+        return db_path
+    return os.path.join(get_data_dir(), db_path)
+
+
+class SQLiteStore:
+    """
+    A SQLite file with a schema, opened with one short-lived connection per operation.
+    """
+
+    # Statements creating the store's tables and indexes (IF NOT EXISTS)
+    SCHEMA: Sequence[str] = ()
+    timeout = 10  # Seconds to wait for another connection's write lock
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the store, creating its file and schema.
+
+        Args:
+            db_path: Path of the SQLite file (relative paths live in the data directory)
+
+        Raises:
+            sqlite3.Error, OSError: If the file cannot be created
+        """
+        self.db_path = resolve_path(db_path)
+        self._init_db()
+
+    @contextmanager
+    def _connect(self, immediate: bool = False):
+        """
+        Open a connection whose transaction commits on success and is always closed.
+
+        Args:
+            immediate: Take the write lock up front (BEGIN IMMEDIATE), so a
+                read-modify-write is serialized across processes
+        """
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        """Create the data directory and the store's schema."""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+
+class SQLiteCache(SQLiteStore):
+    """
+    Base of the TTL caches: a SQLiteStore that disables itself instead of
+    failing when its file is unusable, with hit/miss counters.
+    """
+
+    NAME = 'cache'  # Used in log messages
+
+    def __init__(self, db_path: str, ttl: int, max_entries: int, enabled: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: Path of the SQLite cache file (relative paths live in the data directory)
+            ttl: Time-to-live of an entry in seconds
+            max_entries: Maximum number of entries kept before eviction
+            enabled: When False, every lookup is a miss and nothing is stored
+        """
+        self.db_path = resolve_path(db_path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.enabled:
+            try:
+                self._init_db()
+            except (sqlite3.Error, OSError) as e:
+                logger.error(f"Failed to initialize {self.NAME} at {self.db_path}: {str(e)}")
+                self.enabled = False
+
+    @classmethod
+    def from_env(cls, prefix: str, default_path: str, default_ttl: int, default_max_entries: int):
+        """
+        Build a cache from <prefix>_PATH, _TTL, _MAX_ENTRIES and _ENABLED.
+
+        Args:
+            prefix: Environment variable prefix, e.g. 'SERP_CACHE'
+            default_path: File name used when <prefix>_PATH is unset
+            default_ttl: Entry lifetime used when <prefix>_TTL is unset
+            default_max_entries: Size bound used when <prefix>_MAX_ENTRIES is unset
+        """
+        return cls(
+            db_path=os.getenv(f"{prefix}_PATH", default_path),
+            ttl=int(os.getenv(f"{prefix}_TTL", default_ttl)),
+            max_entries=int(os.getenv(f"{prefix}_MAX_ENTRIES", default_max_entries)),
+            enabled=os.getenv(f"{prefix}_ENABLED", 'true').lower() != 'false'
+        )
+
+    def _count(self, counter: str, amount: int = 1):
+        """Increment a statistics counter."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _scalar(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run a COUNT-style query for stats(), returning 0 when disabled or on error."""
+        if not self.enabled:
+            return 0
+        try:
+            with self._connect() as conn:
+                return conn.execute(sql, params).fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def _hit_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate, shared by every cache's stats()."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total * 100, 2) if total else 0.0
+        }
+
+
+class LazySingleton(Generic[T]):
+    """Process-wide instance built by a factory on first use (double-checked under a lock)."""
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = Lock()
+
+    def get(self) -> T:
+        """Return the instance, building it on the first call."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
@@ -0,0 +1,168 @@
+"""
+Authenticated User Cache
+
+In-process TTL cache of user rows for token_required, so authenticated
+requests do not query the users table just to check that the account still
+exists and is active.
+
+Entries are keyed by user ID plus a per-user version. Invalidating a user
+bumps the version instead of only deleting the entry, so a request that read
+the row before the change and stores it afterwards files it under the old
+version, where it is never read. Entries are bounded by a short TTL (other
+processes only see a change once their entry expires) and an LRU size limit.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .sqlite_cache import LazySingleton
+
+DEFAULT_TTL = 30  # seconds
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class UserCache:
+    """
+    Size-bounded TTL cache of user column values, keyed by (user_id, version).
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES, enabled: bool = True):
+        """
+        Initialize the user cache.
+
+        Args:
+            ttl: Time-to-live of an entry in seconds
+            max_entries: Maximum number of entries kept before LRU eviction
+            enabled: When False, every lookup is a miss and nothing is stored
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+
+        self._entries: 'OrderedDict[Tuple[Hashable, int], Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._versions: Dict[Hashable, int] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, user_id: Hashable) -> int:
+        """Current version of a user's entry (read it before loading the user)."""
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def get(self, user_id: Hashable, version: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up a user's cached column values.
+
+        Args:
+            user_id: ID of the user
+            version: Version returned by version()
+
+        Returns:
+            Column values, or None on a miss or expired entry
+        """
+        if not self.enabled:
+            return None
+
+        key = (user_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, user_id: Hashable, version: int, values: Dict[str, Any]) -> None:
+        """
+        Store a user's column values under the version read before loading them.
+
+        Args:
+            user_id: ID of the user
+            version: Version returned by version() before the user was loaded
+            values: Column values of the user row
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if version != self._versions.get(user_id, 0):
+                return  # Invalidated while the row was being loaded
+            self._entries[(user_id, version)] = (time.monotonic(), dict(values))
+            self._entries.move_to_end((user_id, version))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def update(self, user_id: Hashable, **values: Any) -> None:
+        """
+        Change fields of a user's current entry in place, keeping its expiry.
+
+        Used for writes this process makes without an ORM update (e.g. usage
+        counters queued on the write-behind queue).
+        """
+        with self._lock:
+            key = (user_id, self._versions.get(user_id, 0))
+            entry = self._entries.get(key)
+            if entry:
+                self._entries[key] = (entry[0], {**entry[1], **values})
+
+    def invalidate(self, user_id: Hashable) -> None:
+        """Drop a user's entry and bump their version."""
+        with self._lock:
+            version = self._versions.get(user_id, 0)
+            self._entries.pop((user_id, version), None)
+            self._versions[user_id] = version + 1
+
+    def clear(self) -> None:
+        """Remove every entry (versions are kept, so in-flight loads stay discarded)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counters and current size
+        """
+        with self._lock:
+            entries = len(self._entries)
+        total = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': entries,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total * 100, 2) if total else 0.0
+        }
+
+
+def _build_user_cache() -> UserCache:
+    """User cache configured from the environment (see get_user_cache)."""
+    return UserCache(
+        ttl=float(os.getenv('USER_CACHE_TTL', DEFAULT_TTL)),
+        max_entries=int(os.getenv('USER_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)),
+        enabled=os.getenv('USER_CACHE_ENABLED', 'true').lower() != 'false'
+    )
+
+
+_user_cache = LazySingleton(_build_user_cache)
+
+
+def get_user_cache() -> UserCache:
+    """
+    Get the process-wide user cache, configured from the environment.
+
+    Environment variables:
+        USER_CACHE_TTL: Entry lifetime in seconds (default: 30)
+        USER_CACHE_MAX_ENTRIES: LRU size bound (default: 10000)
+        USER_CACHE_ENABLED: Set to 'false' to disable caching
+    """
+    return _user_cache.get()
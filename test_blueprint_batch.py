@@ -0,0 +1,116 @@
+"""
+Unit tests for batch blueprint generation.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models.blueprint import DatabaseManager
+from src.routes.blueprints import blueprint_routes
+from src.services.blueprint_jobs import BlueprintJobManager
+
+
+class FakeGenerator:
+    """Generates minimal blueprints, failing for keywords containing 'fail'."""
+
+    def generate_blueprint(self, keyword, user_id, project_id=None, progress_callback=None,
+                           section_callback=None, force_refresh=False):
+        time.sleep(0.05)
+        if 'fail' in keyword:
+            raise Exception('SERP unavailable')
+        return {
+            'keyword': keyword,
+            'competitor_analysis': {},
+            'heading_structure': {},
+            'topic_clusters': {},
+            'generation_metadata': {'generation_time': 1}
+        }
+
+    def validate_blueprint_data(self, blueprint_data):
+        return True
+
+
+class BlueprintBatchTestCase(unittest.TestCase):
+    """Tests for POST /api/blueprints/batch and batch progress."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.db = DatabaseManager(f"sqlite:///{self.db_path}")
+        self.db.init_tables()
+
+        self.jobs = BlueprintJobManager(self.db.get_session, max_workers=1, batch_workers=3,
+                                        generator_factory=FakeGenerator)
+        app = Flask(__name__)
+        app.register_blueprint(blueprint_routes)
+        app.config['BLUEPRINT_JOB_MANAGER'] = self.jobs
+        self.client = app.test_client()
+
+        env = patch.dict(os.environ, {'SERPAPI_KEY': 'test', 'GEMINI_API_KEY': 'test'})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def tearDown(self):
+        self.jobs.shutdown()
+        self.db.close_engine()
+        os.remove(self.db_path)
+
+    def _post(self, body, user='user-1'):
+        return self.client.post('/api/blueprints/batch', json=body, headers={'X-User-ID': user})
+
+    def test_batch_progress_and_results(self):
+        response = self._post({'keywords': ['SEO tips', 'seo tips!', 'link building', 'fail fast']})
+        self.assertEqual(response.status_code, 202)
+        batch = response.get_json()
+        # Keywords normalizing to the same value are generated once
+        self.assertEqual([item['keyword'] for item in batch['items']], ['SEO tips', 'link building', 'fail fast'])
+
+        self.jobs.shutdown()
+        status = self.client.get(batch['status_url'], headers={'X-User-ID': 'user-1'}).get_json()
+
+        self.assertEqual(status['status'], 'completed_with_errors')
+        self.assertEqual(status['counts'], {'queued': 0, 'generating': 0, 'completed': 2, 'failed': 1})
+        failed = [item for item in status['items'] if item['status'] == 'failed']
+        self.assertEqual(failed[0]['keyword'], 'fail fast')
+        self.assertIn('SERP unavailable', failed[0]['error'])
+        self.assertTrue(all(item['result_url'].endswith(item['blueprint_id']) for item in status['items']))
+
+    def test_pruned_items_keep_their_final_status(self):
+        batch = self._post({'keywords': ['seo tips', 'fail fast']}).get_json()
+        self.jobs.shutdown()
+
+        # Age the finished jobs past the retention window (the batch itself is recent)
+        with self.jobs._lock:
+            for item in batch['items']:
+                self.jobs._progress[item['blueprint_id']]['updated_at'] -= 2 * self.jobs.progress_retention
+            self.jobs._prune_progress()
+        self.assertIsNone(self.jobs.get_progress(batch['items'][0]['blueprint_id']))
+
+        status = self.client.get(batch['status_url'], headers={'X-User-ID': 'user-1'}).get_json()
+        self.assertEqual(status['status'], 'completed_with_errors')
+        self.assertEqual(status['counts'], {'queued': 0, 'generating': 0, 'completed': 1, 'failed': 1})
+        self.assertIn('SERP unavailable', [item for item in status['items'] if item['status'] == 'failed'][0]['error'])
+
+    def test_batch_is_private_to_its_user(self):
+        batch = self._post({'keywords': 'seo tips\nlink building'}).get_json()
+
+        response = self.client.get(batch['status_url'], headers={'X-User-ID': 'user-2'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_batches_are_rejected(self):
+        self.assertEqual(self._post({'keywords': []}).status_code, 400)
+        self.assertEqual(self._post({'keywords': [1, 2]}).status_code, 400)
+        with patch.dict(os.environ, {'BLUEPRINT_BATCH_MAX_KEYWORDS': '2'}):
+            self.assertEqual(self._post({'keywords': ['a', 'b', 'c']}).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
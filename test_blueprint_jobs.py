@@ -0,0 +1,135 @@
+"""
+Unit tests for background blueprint jobs.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models.blueprint import Blueprint, DatabaseManager
+from src.routes.blueprints import blueprint_routes
+from src.services.blueprint_jobs import BlueprintJobManager
+from src.services.blueprint_storage import BlueprintStorageService
+
+
+class FakeGenerator:
+    """Generates minimal blueprints, failing for keywords containing 'fail'."""
+
+    proceed = None  # Optional threading.Event the generation waits for
+
+    def generate_blueprint(self, keyword, user_id, project_id=None, progress_callback=None,
+                           section_callback=None, force_refresh=False):
+        if progress_callback:
+            progress_callback('competitors', 20)
+        if self.proceed is not None:
+            self.proceed.wait(5)
+        if 'fail' in keyword:
+            raise Exception('SERP unavailable')
+        return {
+            'keyword': keyword,
+            'competitor_analysis': {'top_competitors': []},
+            'heading_structure': {'h1': keyword.title()},
+            'topic_clusters': {},
+            'generation_metadata': {'generation_time': 1}
+        }
+
+    def validate_blueprint_data(self, blueprint_data):
+        return True
+
+
+class BlueprintJobManagerTestCase(unittest.TestCase):
+    """Tests for BlueprintJobManager and async generation through the route."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.db = DatabaseManager(f"sqlite:///{self.db_path}")
+        self.db.init_tables()
+        self.session = self.db.get_session()
+
+    def tearDown(self):
+        self.session.close()
+        self.db.close_engine()
+        os.remove(self.db_path)
+
+    def _manager(self, **kwargs):
+        jobs = BlueprintJobManager(self.db.get_session, max_workers=2, generator_factory=FakeGenerator, **kwargs)
+        self.addCleanup(jobs.shutdown)
+        return jobs
+
+    def _status(self, blueprint_id):
+        self.session.expire_all()
+        return self.session.get(Blueprint, blueprint_id).status
+
+    def test_job_completes_blueprint_row(self):
+        proceed = threading.Event()
+        jobs = self._manager()
+        with patch.object(FakeGenerator, 'proceed', proceed):
+            blueprint_id = jobs.submit('content marketing', 'user-1')
+            self.assertEqual(self._status(blueprint_id), 'generating')
+            proceed.set()
+            jobs.shutdown()
+
+        self.assertEqual(jobs.get_progress(blueprint_id)['status'], 'completed')
+        self.assertEqual(jobs.get_progress(blueprint_id)['progress'], 100)
+        blueprint = BlueprintStorageService(self.session).get_blueprint(blueprint_id, 'user-1')
+        self.assertEqual(blueprint['status'], 'completed')
+        self.assertEqual(blueprint['heading_structure'], {'h1': 'Content Marketing'})
+
+    def test_failed_job_marks_row_and_progress(self):
+        jobs = self._manager()
+        blueprint_id = jobs.submit('fail fast', 'user-1')
+
+        jobs.shutdown()
+        progress = jobs.get_progress(blueprint_id)
+        self.assertEqual(progress['status'], 'failed')
+        self.assertIn('SERP unavailable', progress['error'])
+        self.assertEqual(self._status(blueprint_id), 'failed')
+
+    def test_orphaned_rows_are_failed_at_startup(self):
+        stale = datetime.utcnow() - timedelta(hours=2)
+        self.session.add_all([
+            Blueprint(id='orphan', keyword='seo', user_id='user-1', status='generating',
+                      created_at=stale, updated_at=stale),
+            Blueprint(id='running-elsewhere', keyword='seo tips', user_id='user-1', status='generating'),
+            Blueprint(id='done', keyword='link building', user_id='user-1', status='completed',
+                      created_at=stale, updated_at=stale)
+        ])
+        self.session.commit()
+
+        self._manager(orphan_grace=3600)
+
+        self.assertEqual(self._status('orphan'), 'failed')
+        self.assertEqual(self._status('running-elsewhere'), 'generating')
+        self.assertEqual(self._status('done'), 'completed')
+
+    def test_async_flag_strings_are_parsed(self):
+        jobs = self._manager()
+        app = Flask(__name__)
+        app.register_blueprint(blueprint_routes)
+        app.config['BLUEPRINT_JOB_MANAGER'] = jobs
+        app.config['BLUEPRINT_GENERATOR'] = FakeGenerator()
+        app.db_session = self.session
+        client = app.test_client()
+
+        with patch.dict(os.environ, {'SERPAPI_KEY': 'test', 'GEMINI_API_KEY': 'test'}):
+            response = client.post('/api/blueprints/generate', json={'keyword': 'seo', 'async': 'false'})
+            self.assertEqual(response.status_code, 201)
+
+            response = client.post('/api/blueprints/generate', json={'keyword': 'seo', 'async': 'true'})
+            self.assertEqual(response.status_code, 202)
+
+            response = client.post('/api/blueprints/generate?async=1', json={'keyword': 'seo'})
+            self.assertEqual(response.status_code, 202)
+
+
+if __name__ == '__main__':
+    unittest.main()
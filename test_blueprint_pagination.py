@@ -0,0 +1,89 @@
+"""
+Unit tests for keyset pagination of blueprint listings.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from flask import Flask
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models.blueprint import Blueprint, DatabaseManager
+from src.routes.blueprints import blueprint_routes
+from src.services.blueprint_storage import BlueprintStorageService
+
+
+class BlueprintPaginationTestCase(unittest.TestCase):
+    """Tests for BlueprintStorageService.list_user_blueprints_page and GET /api/blueprints."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.db = DatabaseManager(f"sqlite:///{self.db_path}")
+        self.db.init_tables()
+        self.session = self.db.get_session()
+
+        # Pairs of blueprints share a timestamp so ties are ordered by id
+        base = datetime(2025, 1, 1)
+        for i in range(7):
+            self.session.add(Blueprint(
+                id=f"bp-{i:02d}", keyword=f"keyword {i}", user_id='user-1', status='completed',
+                competitor_analysis={'payload': 'x' * 100}, created_at=base + timedelta(hours=i // 2)
+            ))
+        self.session.add(Blueprint(id='other', keyword='other', user_id='user-2', created_at=base))
+        self.session.commit()
+
+        app = Flask(__name__)
+        app.register_blueprint(blueprint_routes)
+        app.db_session = self.session
+        self.client = app.test_client()
+
+    def tearDown(self):
+        self.session.close()
+        self.db.close_engine()
+        os.remove(self.db_path)
+
+    def test_pages_cover_every_blueprint_once_in_order(self):
+        storage = BlueprintStorageService(self.session)
+        seen, cursor = [], None
+        while True:
+            page = storage.list_user_blueprints_page('user-1', limit=3, cursor=cursor)
+            seen.extend(bp['id'] for bp in page['blueprints'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, [f"bp-{i:02d}" for i in reversed(range(7))])
+
+    def test_summary_query_skips_json_columns(self):
+        storage = BlueprintStorageService(self.session)
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(self.db.engine, 'before_cursor_execute', listener)
+        self.addCleanup(event.remove, self.db.engine, 'before_cursor_execute', listener)
+
+        storage.list_user_blueprints_page('user-1', limit=3)
+
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn('competitor_analysis', statements[0])
+
+    def test_route_returns_next_cursor(self):
+        headers = {'X-User-ID': 'user-1'}
+        first = self.client.get('/api/blueprints?limit=4', headers=headers).get_json()
+        self.assertEqual(len(first['blueprints']), 4)
+
+        second = self.client.get(f"/api/blueprints?limit=4&cursor={first['next_cursor']}", headers=headers).get_json()
+        self.assertEqual([bp['id'] for bp in second['blueprints']], ['bp-02', 'bp-01', 'bp-00'])
+        self.assertIsNone(second['next_cursor'])
+
+        response = self.client.get('/api/blueprints?cursor=not-a-cursor', headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Unit tests for full-text blueprint search.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models.blueprint import Blueprint, DatabaseManager
+from src.services.blueprint_storage import BlueprintStorageService
+from src.services import blueprint_search
+from src.services.blueprint_search import BlueprintSearchIndex, build_search_index, extract_document
+
+
+def blueprint_data(keyword, h2_titles=(), clusters=None):
+    return {
+        'keyword': keyword,
+        'competitor_analysis': {'top_competitors': []},
+        'heading_structure': {
+            'h1': f"Complete Guide to {keyword.title()}",
+            'h2_sections': [{'title': title, 'h3_subsections': ['Ignored Subsection']} for title in h2_titles]
+        },
+        'topic_clusters': {'primary_cluster': [keyword], 'secondary_clusters': clusters or {}},
+        'content_insights': {'common_sections': ['pricing']}
+    }
+
+
+class BlueprintSearchTestCase(unittest.TestCase):
+    """Tests for BlueprintSearchIndex and BlueprintStorageService.search_blueprints."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.db = DatabaseManager(f"sqlite:///{self.db_path}")
+        self.db.init_tables()
+        build_search_index(self.db.engine)
+        self.session = self.db.get_session()
+        self.storage = BlueprintStorageService(self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.db.close_engine()
+        os.remove(self.db_path)
+
+    def _keywords(self, results):
+        return [result['keyword'] for result in results]
+
+    def test_extract_document_fields(self):
+        keyword, headings, topics = extract_document('seo', blueprint_data('seo', ['Link Building'], {'local_search': []}))
+
+        self.assertEqual(keyword, 'seo')
+        self.assertIn('Link Building', headings)
+        self.assertNotIn('Ignored Subsection', headings)
+        self.assertIn('local search', topics)
+        self.assertIn('pricing', topics)
+
+    def test_search_matches_headings_and_topics_ranked_by_field(self):
+        self.storage.save_blueprint(blueprint_data('content marketing', ['Email Newsletters']), 'user-1')
+        self.storage.save_blueprint(blueprint_data('email marketing'), 'user-1')
+        self.storage.save_blueprint(blueprint_data('link building', clusters={'outreach_tools': []}), 'user-1')
+        self.storage.save_blueprint(blueprint_data('email outreach'), 'user-2')
+
+        # Keyword matches rank above heading matches; prefixes match whole words
+        self.assertEqual(self._keywords(self.storage.search_blueprints('user-1', 'emai')),
+                         ['email marketing', 'content marketing'])
+        self.assertEqual(self._keywords(self.storage.search_blueprints('user-1', 'outreach')), ['link building'])
+        self.assertEqual(self.storage.search_blueprints('user-1', 'nothing matches'), [])
+
+    def test_index_follows_completion_and_delete(self):
+        blueprint_id = self.storage.create_pending_blueprint('keyword research', 'user-1')
+        self.assertEqual(self._keywords(self.storage.search_blueprints('user-1', 'keyword')), ['keyword research'])
+
+        self.storage.complete_blueprint(blueprint_id, blueprint_data('keyword research', ['Search Volume Tools']))
+        self.assertEqual(len(self.storage.search_blueprints('user-1', 'volume')), 1)
+
+        self.storage.delete_blueprint(blueprint_id, 'user-1')
+        self.assertEqual(self.storage.search_blueprints('user-1', 'keyword'), [])
+
+    def test_existing_blueprints_are_backfilled(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        db = DatabaseManager(f"sqlite:///{path}")
+        self.addCleanup(db.close_engine)
+        db.init_tables()
+        session = db.get_session()
+        self.addCleanup(session.close)
+
+        # Rows written before the index existed
+        session.add(Blueprint(keyword='technical seo', user_id='user-1', status='completed',
+                              heading_structure={'h1': 'Crawl Budget Guide'}))
+        session.commit()
+
+        self.assertTrue(build_search_index(db.engine))
+        storage = BlueprintStorageService(session)
+        self.assertEqual(self._keywords(storage.search_blueprints('user-1', 'crawl')), ['technical seo'])
+
+    def test_build_indexes_only_missing_blueprints(self):
+        self.storage.save_blueprint(blueprint_data('content marketing'), 'user-1')
+        # Written by a process that could not see the index
+        self.session.add(Blueprint(keyword='email marketing', user_id='user-1', status='completed'))
+        self.session.commit()
+        self.assertEqual(self._keywords(self.storage.search_blueprints('user-1', 'marketing')), ['content marketing'])
+
+        self.assertTrue(build_search_index(self.db.engine))
+        self.assertEqual(sorted(self._keywords(self.storage.search_blueprints('user-1', 'marketing'))),
+                         ['content marketing', 'email marketing'])
+
+        self.assertTrue(build_search_index(self.db.engine, rebuild=True))
+        self.assertEqual(len(self.storage.search_blueprints('user-1', 'marketing')), 2)
+
+    def test_unavailable_index_is_rechecked(self):
+        fd, path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        db = DatabaseManager(f"sqlite:///{path}")
+        self.addCleanup(db.close_engine)
+        db.init_tables()
+        session = db.get_session()
+        self.addCleanup(session.close)
+
+        # A failed build is not remembered as permanent
+        with mock.patch.object(blueprint_search, '_backfill', side_effect=RuntimeError('database is locked')):
+            self.assertFalse(build_search_index(db.engine))
+        self.assertTrue(build_search_index(db.engine))
+        self.assertTrue(BlueprintStorageService(session).search_index.available)
+
+        # An index missing at first probe is found once built elsewhere and the retry delay passes
+        with db.engine.begin() as connection:
+            for statement in blueprint_search.DROP_STATEMENTS['sqlite']:
+                connection.exec_driver_sql(statement)
+        blueprint_search._ready_engines.pop(db.engine)
+        self.assertFalse(BlueprintStorageService(session).search_index.available)
+        with db.engine.begin() as connection:
+            for statement in blueprint_search.SQLITE_SCHEMA:
+                connection.exec_driver_sql(statement)
+        self.assertFalse(BlueprintStorageService(session).search_index.available)
+        with mock.patch.object(blueprint_search, 'READY_RETRY_SECONDS', 0):
+            self.assertTrue(BlueprintStorageService(session).search_index.available)
+
+    def test_like_fallback_without_index(self):
+        self.storage.save_blueprint(blueprint_data('content marketing'), 'user-1')
+        self.storage.search_index.available = False
+
+        self.assertEqual(self._keywords(self.storage.search_blueprints('user-1', 'market')), ['content marketing'])
+        self.assertIsNone(BlueprintSearchIndex.search(self.storage.search_index, 'user-1', 'market'))
+
+
+if __name__ == '__main__':
+    unittest.main()
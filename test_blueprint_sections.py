@@ -0,0 +1,83 @@
+"""
+Unit tests for on-demand loading of blueprint payload sections.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+from flask import Flask
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models.blueprint import Blueprint, DatabaseManager
+from src.routes.blueprints import blueprint_routes
+from src.services.blueprint_storage import BlueprintStorageService
+
+
+class BlueprintSectionsTestCase(unittest.TestCase):
+    """Tests for deferred payload columns and GET /api/blueprints/<id>?sections=."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.db = DatabaseManager(f"sqlite:///{self.db_path}")
+        self.db.init_tables()
+        self.session = self.db.get_session()
+
+        self.session.add(Blueprint(
+            id='bp-1', keyword='seo tips', user_id='user-1', status='completed',
+            competitor_analysis={'top_competitors': []}, heading_structure={'h1': 'SEO Tips'},
+            topic_clusters={'primary_cluster': ['seo']}, serp_features={}, content_insights={}
+        ))
+        self.session.commit()
+        self.session.expunge_all()
+
+        app = Flask(__name__)
+        app.register_blueprint(blueprint_routes)
+        app.db_session = self.session
+        self.client = app.test_client()
+
+        # Create the search index before counting statements
+        BlueprintStorageService(self.session)
+        self.statements = []
+        listener = lambda conn, cursor, statement, *args: self.statements.append(statement)
+        event.listen(self.db.engine, 'before_cursor_execute', listener)
+        self.addCleanup(event.remove, self.db.engine, 'before_cursor_execute', listener)
+
+    def tearDown(self):
+        self.session.close()
+        self.db.close_engine()
+        os.remove(self.db_path)
+
+    def test_requested_sections_load_in_one_query(self):
+        blueprint = BlueprintStorageService(self.session).get_blueprint('bp-1', 'user-1', ['heading_structure'])
+
+        self.assertEqual(blueprint['heading_structure'], {'h1': 'SEO Tips'})
+        self.assertNotIn('competitor_analysis', blueprint)
+        self.assertEqual(len(self.statements), 1)
+        self.assertIn('heading_structure', self.statements[0])
+        self.assertNotIn('competitor_analysis', self.statements[0])
+
+    def test_full_blueprint_loads_every_section(self):
+        blueprint = BlueprintStorageService(self.session).get_blueprint('bp-1', 'user-1')
+
+        self.assertEqual(len(self.statements), 1)
+        for field in Blueprint.PAYLOAD_FIELDS:
+            self.assertIn(field, blueprint)
+
+    def test_route_sections_parameter(self):
+        headers = {'X-User-ID': 'user-1'}
+        response = self.client.get('/api/blueprints/bp-1?sections=topic_clusters', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['topic_clusters'], {'primary_cluster': ['seo']})
+        self.assertNotIn('heading_structure', response.get_json())
+
+        response = self.client.get('/api/blueprints/bp-1?sections=passwords', headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Unit tests for incrementally maintained user blueprint stats.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models.blueprint import Blueprint, DatabaseManager, UserBlueprintStats
+from src.services.blueprint_storage import BlueprintStorageService
+
+
+def blueprint_data(keyword):
+    return {
+        'keyword': keyword,
+        'competitor_analysis': {'top_competitors': []},
+        'heading_structure': {'h1': keyword},
+        'topic_clusters': {'primary_cluster': [keyword]},
+        'generation_metadata': {'generation_time': 12}
+    }
+
+
+class BlueprintStatsTestCase(unittest.TestCase):
+    """Tests for the user_blueprint_stats aggregate."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.db = DatabaseManager(f"sqlite:///{self.db_path}")
+        self.db.init_tables()
+        self.session = self.db.get_session()
+        self.storage = BlueprintStorageService(self.session)
+
+    def tearDown(self):
+        self.session.close()
+        self.db.close_engine()
+        os.remove(self.db_path)
+
+    def test_stats_follow_every_blueprint_change(self):
+        first = self.storage.save_blueprint(blueprint_data('seo tips'), 'user-1')
+        pending = self.storage.create_pending_blueprints(['link building', 'keyword research'], 'user-1')
+        self.storage.complete_blueprint(pending[0], blueprint_data('link building'))
+        self.storage.update_blueprint_status(pending[1], 'user-1', 'failed')
+        self.storage.update_blueprint_status(first, 'user-1', 'exported')
+
+        stats = self.storage.get_user_stats('user-1')
+        self.assertEqual(stats['total_blueprints'], 3)
+        self.assertEqual(stats['completed_blueprints'], 1)
+        self.assertEqual(stats['recent_blueprints'], 3)
+
+        self.storage.delete_blueprint(pending[0], 'user-1')
+        stats = self.storage.get_user_stats('user-1')
+        self.assertEqual(stats['total_blueprints'], 2)
+        self.assertEqual(stats['completed_blueprints'], 0)
+        self.assertEqual(stats['success_rate'], 0)
+
+        latest = self.session.query(Blueprint.created_at).filter(Blueprint.id == pending[1]).scalar()
+        self.assertEqual(stats['latest_blueprint_date'], latest.isoformat())
+
+    def test_missing_stats_row_is_rebuilt_from_blueprints(self):
+        # Blueprints written before the stats table existed
+        self.session.add_all([
+            Blueprint(keyword='old one', user_id='user-2', status='completed', created_at=datetime(2024, 1, 1)),
+            Blueprint(keyword='old two', user_id='user-2', status='failed', created_at=datetime(2024, 2, 1))
+        ])
+        self.session.commit()
+
+        stats = self.storage.get_user_stats('user-2')
+        self.assertEqual(stats['total_blueprints'], 2)
+        self.assertEqual(stats['completed_blueprints'], 1)
+        self.assertEqual(stats['recent_blueprints'], 0)
+        self.assertEqual(stats['latest_blueprint_date'], '2024-02-01T00:00:00')
+        self.assertIsNotNone(self.session.get(UserBlueprintStats, 'user-2'))
+
+    def test_stats_read_is_a_key_lookup_plus_index_count(self):
+        self.storage.save_blueprint(blueprint_data('seo tips'), 'user-1')
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(self.db.engine, 'before_cursor_execute', listener)
+        self.addCleanup(event.remove, self.db.engine, 'before_cursor_execute', listener)
+
+        self.storage.get_user_stats('user-1')
+
+        self.assertEqual(len(statements), 2)
+        self.assertIn('user_blueprint_stats', statements[0])
+        self.assertFalse(any('competitor_analysis' in statement for statement in statements))
+
+
+if __name__ == '__main__':
+    unittest.main()
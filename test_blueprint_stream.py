@@ -0,0 +1,113 @@
+"""
+Unit tests for streaming blueprint sections over Server-Sent Events.
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import unittest
+
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models.blueprint import DatabaseManager
+from src.routes.blueprints import blueprint_routes
+from src.services.blueprint_jobs import BlueprintJobManager
+from src.services.blueprint_generator import BlueprintGeneratorService
+
+
+class FakeGenerator:
+    """Emits every pipeline section with a delay, like the real pipeline."""
+
+    def generate_blueprint(self, keyword, user_id, project_id=None, progress_callback=None,
+                           section_callback=None, force_refresh=False):
+        blueprint = {'keyword': keyword, 'generation_metadata': {'generation_time': 1}}
+        for index, (section, field) in enumerate(BlueprintGeneratorService.SECTION_FIELDS.items()):
+            time.sleep(0.1)
+            progress_callback(section, 10 + index * 15)
+            data = {'section': section}
+            section_callback(section, data)
+            blueprint[field] = data
+        return blueprint
+
+    def validate_blueprint_data(self, blueprint_data):
+        return True
+
+
+def parse_events(body):
+    """Parse an SSE body into (event, data) tuples, skipping comments."""
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n') if not line.startswith(':'))
+        if lines:
+            events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+class BlueprintStreamTestCase(unittest.TestCase):
+    """Tests for GET /api/blueprints/<id>/stream."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.db = DatabaseManager(f"sqlite:///{self.db_path}")
+        self.db.init_tables()
+
+        self.jobs = BlueprintJobManager(self.db.get_session, max_workers=1,
+                                        generator_factory=FakeGenerator)
+        app = Flask(__name__)
+        app.register_blueprint(blueprint_routes)
+        app.config['BLUEPRINT_JOB_MANAGER'] = self.jobs
+        app.db_session = self.db.get_session()
+        self.app = app
+        self.client = app.test_client()
+
+    def tearDown(self):
+        self.jobs.shutdown()
+        self.app.db_session.close()
+        self.db.close_engine()
+        os.remove(self.db_path)
+
+    def test_sections_stream_while_job_runs(self):
+        blueprint_id = self.jobs.submit('seo tips', 'user-1')
+        start = time.monotonic()
+
+        response = self.client.get(f'/api/blueprints/{blueprint_id}/stream',
+                                   headers={'X-User-ID': 'user-1'}, buffered=False)
+        chunks = iter(response.response)
+        first_section = next(chunk for chunk in chunks if b'event: section' in chunk)
+        first_section_at = time.monotonic() - start
+        self.assertFalse(self.app.db_session.in_transaction())  # No connection held while streaming
+        body = first_section.decode() + b''.join(chunks).decode()
+
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        self.assertLess(first_section_at, 0.35)
+        events = parse_events(body)
+        sections = [data['section'] for event, data in events if event == 'section']
+        self.assertEqual(sections, list(BlueprintGeneratorService.SECTION_FIELDS))
+        self.assertEqual(events[-1], ('done', {'status': 'completed', 'blueprint_id': blueprint_id, 'error': None}))
+
+    def test_finished_blueprint_is_sent_from_storage(self):
+        blueprint_id = self.jobs.submit('seo tips', 'user-1')
+        self.jobs.shutdown()
+        self.app.db_session.expire_all()
+
+        body = self.client.get(f'/api/blueprints/{blueprint_id}/stream',
+                               headers={'X-User-ID': 'user-1'}).get_data(as_text=True)
+        events = parse_events(body)
+
+        self.assertEqual(len([event for event, _ in events if event == 'section']), 5)
+        self.assertEqual(events[-1][1]['status'], 'completed')
+
+    def test_other_users_blueprints_are_not_streamed(self):
+        blueprint_id = self.jobs.submit('seo tips', 'user-1')
+
+        response = self.client.get(f'/api/blueprints/{blueprint_id}/stream', headers={'X-User-ID': 'user-2'})
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
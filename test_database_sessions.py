@@ -0,0 +1,79 @@
+"""
+Unit tests for shared engines and request-scoped database sessions.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask, current_app, jsonify
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models import get_database_session
+from src.models.blueprint import Blueprint, DatabaseManager, get_database_manager, get_engine
+
+
+class DatabaseSessionsTestCase(unittest.TestCase):
+    """Tests for get_engine, get_database_manager and DatabaseManager.init_app."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.url = f"sqlite:///{self.db_path}"
+        with patch.dict(os.environ, {'DB_POOL_SIZE': '3', 'DB_MAX_OVERFLOW': '2'}):
+            self.db = DatabaseManager(self.url)
+        self.db.init_tables()
+
+    def tearDown(self):
+        self.db.close_engine()
+        os.remove(self.db_path)
+
+    def test_engine_is_shared_per_url(self):
+        self.assertIs(get_engine(self.url), self.db.engine)
+        self.assertIs(DatabaseManager(self.url).engine, self.db.engine)
+        self.assertIs(get_database_manager(self.url), get_database_manager(self.url))
+        self.assertEqual(self.db.engine.pool.size(), 3)
+
+        with patch.dict(os.environ, {'DATABASE_URL': self.url}):
+            first, second = get_database_session(), get_database_session()
+        self.assertIsNot(first, second)
+        self.assertIs(first.get_bind(), second.get_bind())
+        first.close()
+        second.close()
+
+    def test_sessions_are_lazy_and_end_with_the_request(self):
+        app = Flask(__name__)
+        self.db.init_app(app)
+
+        @app.route('/health')
+        def health():
+            return jsonify({'status': 'ok'})
+
+        @app.route('/write/<keyword>')
+        def write(keyword):
+            current_app.db_session.add(Blueprint(keyword=keyword, user_id='user-1'))
+            if keyword == 'boom':
+                current_app.db_session.flush()
+                raise RuntimeError('failed after flush')
+            return jsonify({'open': self.db.Session.registry.has()})
+
+        client = app.test_client()
+        client.get('/health')
+        self.assertFalse(self.db.Session.registry.has())
+
+        self.assertTrue(client.get('/write/seo').get_json()['open'])
+        self.assertFalse(self.db.Session.registry.has())
+
+        app.config['PROPAGATE_EXCEPTIONS'] = False
+        self.assertEqual(client.get('/write/boom').status_code, 500)
+
+        session = self.db.get_session()
+        self.assertEqual([row.keyword for row in session.query(Blueprint.keyword)], ['seo'])
+        session.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Unit tests for the host-aware scraping scheduler.
+"""
+
+import time
+import threading
+import unittest
+
+from src.utils.host_scheduler import HostScheduler, registrable_domain, parse_retry_after
+
+
+class HostSchedulerTestCase(unittest.TestCase):
+    """Tests for HostScheduler."""
+
+    def test_registrable_domain(self):
+        self.assertEqual(registrable_domain('https://en.wikipedia.org/wiki/SEO'), 'wikipedia.org')
+        self.assertEqual(registrable_domain('https://www.bbc.co.uk/news'), 'bbc.co.uk')
+        self.assertEqual(registrable_domain('https://hubspot.com'), 'hubspot.com')
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('30'), 30.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+
+    def test_different_hosts_do_not_wait_for_each_other(self):
+        """Only repeat requests to the same host are spaced out."""
+        scheduler = HostScheduler(requests_per_second=2, jitter=0, max_concurrency=4)
+        dispatched = {}
+        start = time.monotonic()
+
+        def request(url):
+            with scheduler.slot(url):
+                dispatched[url] = time.monotonic() - start
+
+        threads = [threading.Thread(target=request, args=(url,))
+                   for url in ['https://a.com/1', 'https://b.com/1', 'https://a.com/2']]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLess(dispatched['https://b.com/1'], 0.2)
+        self.assertGreaterEqual(dispatched['https://a.com/2'], 0.45)
+
+    def test_throttle_backs_off_host(self):
+        """A 429 blocks the host for the Retry-After delay; success resets the level."""
+        scheduler = HostScheduler(jitter=0)
+        scheduler.report('https://a.com/page', 429, '5')
+
+        status = scheduler.get_host_status('a.com')
+        self.assertEqual(status['backoff_level'], 1)
+        self.assertGreater(status['ready_in'], 4)
+        self.assertEqual(scheduler.get_host_status('b.com')['ready_in'], 0)
+
+        scheduler.report('https://a.com/page', 200)
+        self.assertEqual(scheduler.get_host_status('a.com')['backoff_level'], 0)
+
+    def test_idle_hosts_are_pruned(self):
+        """Settled hosts are forgotten; busy, refilling and backing-off hosts are kept."""
+        scheduler = HostScheduler(requests_per_second=100, jitter=0, prune_interval=0)
+        for index in range(20):
+            with scheduler.slot(f"https://site{index}.com/"):
+                pass
+        scheduler.report('https://throttled.com/', 429, '60')
+        busy = scheduler.acquire('https://busy.com/')
+        time.sleep(0.05)
+
+        with scheduler.slot('https://last.com/'):
+            pass
+
+        self.assertEqual(set(scheduler._hosts), {'throttled.com', 'busy.com', 'last.com'})
+        scheduler.release(busy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Unit tests for the single-pass lxml extraction engine.
+"""
+
+import unittest
+
+from src.utils.html_extractor import lxml_available, extract_page
+from src.utils.page_cache import PageCache
+from src.utils.browser_content_scraper import BrowserContentScraper
+
+PAGES = [
+    """<html><head><title> Guide </title><meta property="og:description" content=" Summary "></head>
+    <body><header><h1>Site name</h1></header>
+    <div class="x"><h2>Hello <b>World</b></h2><p>text <!-- note --> tail</p>
+    <a href="/a">A</a><a href="#top">skip</a><a href="https://other.com" title="Other"></a>
+    <img src="pixel.png" width="1" height="1"><img data-src="/big.png" alt=" Big "></div>
+    <script>var x = 1;</script></body></html>""",
+    "<html><body><div>" + "word " * 100 + "</div><section>" + "more text " * 10
+    + "<div class='main-content'>inner</div></section></body></html>",
+    "<html><body><div>" + "<p>This paragraph is long enough.</p>" * 60 + "</div><div>short</div></body></html>",
+    "<?xml version='1.0' encoding='utf-8'?><html><body><main>Main <span>text</span><nav>menu</nav>after</main></body></html>",
+]
+
+
+@unittest.skipUnless(lxml_available(), "lxml not installed")
+class HtmlExtractorTestCase(unittest.TestCase):
+    """The lxml engine must produce the same fields as the BeautifulSoup path."""
+
+    def setUp(self):
+        cache = PageCache(enabled=False)
+        self.lxml_scraper = BrowserContentScraper(page_cache=cache, engine='lxml')
+        self.bs4_scraper = BrowserContentScraper(page_cache=cache, engine='bs4')
+
+    def test_matches_beautifulsoup_extraction(self):
+        for html in PAGES:
+            with self.subTest(html=html[:40]):
+                self.assertEqual(
+                    self.lxml_scraper._extract_page(html, 'https://example.com/page'),
+                    self.bs4_scraper._extract_page(html, 'https://example.com/page')
+                )
+
+    def test_removed_subtrees_and_fallbacks(self):
+        result = extract_page(PAGES[0], 'https://example.com/page')
+
+        self.assertEqual(result['title'], 'Guide')
+        self.assertEqual(result['description'], 'Summary')
+        self.assertEqual([h['text'] for h in result['headings']], ['HelloWorld'])
+        self.assertEqual([l['text'] for l in result['links']['all']], ['A', 'Other'])
+        self.assertEqual(result['images'], [{'alt': 'Big', 'src': 'https://example.com/big.png'}])
+
+    def test_unparseable_document_returns_none(self):
+        self.assertIsNone(extract_page('   ', 'https://example.com'))
+
+
+if __name__ == '__main__':
+    unittest.main()
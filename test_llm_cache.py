@@ -0,0 +1,136 @@
+"""
+Unit tests for the Gemini response cache.
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.utils.llm_cache import LLMCache
+from src.utils.gemini_nlp_client import AsyncGeminiNLPClient, GeminiNLPClient
+
+ANALYSIS_JSON = '{"entities": [], "sentiment": {"score": 0.1, "magnitude": 0.2}, "categories": [], "language": "en"}'
+
+
+class LLMCacheTestCase(unittest.TestCase):
+    """Tests for LLMCache and its use by GeminiNLPClient."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.cache = LLMCache(db_path=self.db_path)
+        self.client = GeminiNLPClient(cache=self.cache)
+        self.model = MagicMock()
+        self.client.client = MagicMock()
+        self.client.client.GenerativeModel.return_value = self.model
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def test_key_ignores_whitespace_but_not_model(self):
+        self.assertEqual(self.cache.make_key('m', 'a  b\n c'), self.cache.make_key('m', 'a b c'))
+        self.assertNotEqual(self.cache.make_key('m1', 'a b c'), self.cache.make_key('m2', 'a b c'))
+
+    def test_repeat_prompt_is_served_from_cache(self):
+        self.model.generate_content.return_value = MagicMock(text='outline')
+
+        self.assertEqual(self.client.generate_content('Create an outline'), 'outline')
+        self.assertEqual(self.client.generate_content('  Create an   outline '), 'outline')
+        self.assertEqual(self.model.generate_content.call_count, 1)
+
+    def test_opt_out_always_calls_model(self):
+        self.model.generate_content.return_value = MagicMock(text='fresh')
+
+        self.client.generate_content('Create an outline', use_cache=False)
+        self.client.generate_content('Create an outline', use_cache=False)
+
+        self.assertEqual(self.model.generate_content.call_count, 2)
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_async_client_shares_cache_with_sync_client(self):
+        self.model.generate_content_async = AsyncMock(return_value=MagicMock(text=ANALYSIS_JSON))
+        async_client = AsyncGeminiNLPClient(self.client)
+
+        async def main():
+            return await asyncio.gather(*(async_client.analyze_text(f'Page {i}') for i in range(3)))
+
+        results = asyncio.run(main())
+        self.assertEqual([result['sentiment']['score'] for result in results], [0.1] * 3)
+        self.assertEqual(self.model.generate_content_async.await_count, 3)
+
+        self.client.analyze_text('Page 1')
+        self.model.generate_content.assert_not_called()
+
+    def test_only_parseable_analyses_are_cached(self):
+        self.model.generate_content.return_value = MagicMock(text='not json')
+        self.client.analyze_text('Some page text')
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+        self.model.generate_content.return_value = MagicMock(text=ANALYSIS_JSON)
+        self.client.analyze_text('Some page text')
+        result = self.client.analyze_text('Some page text')
+
+        self.assertEqual(result['sentiment']['score'], 0.1)
+        self.assertEqual(self.model.generate_content.call_count, 2)
+
+    def test_responses_failing_validation_are_not_cached(self):
+        def is_json(text):
+            return text.startswith('{')
+
+        self.model.generate_content.return_value = MagicMock(text='Sorry, here is an outline')
+        self.assertEqual(self.client.generate_content('Outline as JSON', validate=is_json), 'Sorry, here is an outline')
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+        # An unusable entry cached without a validator is replaced, not served
+        self.client.generate_content('Outline as JSON')
+        self.model.generate_content.return_value = MagicMock(text='{"h1": "Title"}')
+        self.assertEqual(self.client.generate_content('Outline as JSON', validate=is_json), '{"h1": "Title"}')
+        self.assertEqual(self.client.generate_content('Outline as JSON', validate=is_json), '{"h1": "Title"}')
+        self.assertEqual(self.model.generate_content.call_count, 3)
+
+    def test_batch_analysis_uses_one_request_and_fills_gaps(self):
+        batch_response = (
+            '[{"document": 1, "entities": [{"name": "seo", "type": "OTHER", "salience": 0.9}], '
+            '"sentiment": {"score": 0.3, "magnitude": 0.1}, "categories": [], "language": "en"}]'
+        )
+        self.model.generate_content.side_effect = [
+            MagicMock(text=batch_response),  # Batched request only covers document 1
+            MagicMock(text=ANALYSIS_JSON)    # Document 2 is analyzed on its own
+        ]
+
+        results = self.client.analyze_content_batch(['first page text', 'second page text'])
+
+        self.assertEqual(self.model.generate_content.call_count, 2)
+        self.assertEqual(results[0]['entities'][0]['name'], 'seo')
+        self.assertEqual(results[1]['sentiment']['score'], 0.1)
+
+        # Both documents are now cached individually
+        self.model.generate_content.side_effect = None
+        self.client.analyze_content_batch(['first page text', 'second page text'])
+        self.client.analyze_text('first page text')
+        self.assertEqual(self.model.generate_content.call_count, 2)
+
+
+
+class GeminiRegistryTestCase(unittest.TestCase):
+    """Tests for the process-wide Gemini client registry."""
+
+    def test_one_client_across_import_paths(self):
+        # The analyzers are also imported with src/ on sys.path (routes/api.py)
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+        self.addCleanup(sys.path.remove, sys.path[0])
+        import competitor_analysis_real
+        import content_analyzer_enhanced_real
+        from src.services import blueprint_generator
+
+        self.assertNotIn('utils.gemini_nlp_client', sys.modules)
+        client = blueprint_generator.get_gemini_client('test-key')
+        self.assertIs(competitor_analysis_real.get_gemini_client('test-key'), client)
+        self.assertIs(content_analyzer_enhanced_real.get_gemini_client('test-key'), client)
+
+
+if __name__ == '__main__':
+    unittest.main()
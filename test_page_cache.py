@@ -0,0 +1,160 @@
+"""
+Unit tests for the scraped page cache and its use by BrowserContentScraper.
+"""
+
+import os
+import time
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.utils.page_cache import PageCache, normalize_url
+from src.utils.host_scheduler import HostScheduler
+from src.utils.browser_content_scraper import BrowserContentScraper
+
+HTML = """
+<html><head><title>SEO Guide</title><meta name="description" content="All about SEO"></head>
+<body><main><h1>What is SEO</h1><p>Search engine optimization explained in detail.</p></main></body></html>
+"""
+
+
+def make_response(status_code=200, text=HTML, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    return response
+
+
+class PageCacheTestCase(unittest.TestCase):
+    """Tests for PageCache and the scraper integration."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.cache = PageCache(db_path=self.db_path, ttl=3600)
+        self.scraper = BrowserContentScraper(
+            scheduler=HostScheduler(requests_per_second=1000, burst=100, jitter=0),
+            page_cache=self.cache
+        )
+        self.scraper.session = MagicMock()
+
+    def tearDown(self):
+        os.remove(self.db_path)
+
+    def test_normalize_url(self):
+        self.assertEqual(
+            normalize_url('HTTPS://Example.com:443/guide?b=2&utm_source=x&a=1#top'),
+            'https://example.com/guide?a=1&b=2'
+        )
+        self.assertEqual(normalize_url('http://example.com'), 'http://example.com/')
+
+    def test_fresh_entry_is_served_without_request(self):
+        self.scraper.session.get.return_value = make_response()
+
+        first = self.scraper.scrape_content('https://example.com/guide')
+        second = self.scraper.scrape_content('https://EXAMPLE.com/guide#intro')
+
+        self.assertEqual(self.scraper.session.get.call_count, 1)
+        self.assertEqual(second['title'], 'SEO Guide')
+        self.assertEqual(second['main_content'], first['main_content'])
+        self.assertTrue(second['from_cache'])
+
+    def test_stale_entry_is_revalidated_with_conditional_get(self):
+        self.scraper.session.get.return_value = make_response(headers={'ETag': '"v1"'})
+        self.scraper.scrape_content('https://example.com/guide')
+
+        self.cache.ttl = 0
+        self.scraper.session.get.return_value = make_response(status_code=304, text='')
+        result = self.scraper.scrape_content('https://example.com/guide')
+
+        headers = self.scraper.session.get.call_args.kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(result['title'], 'SEO Guide')
+        self.assertTrue(result['from_cache'])
+
+    def test_concurrent_scrapes_of_one_url_share_a_fetch(self):
+        def slow_get(url, headers=None, timeout=None):
+            time.sleep(0.2)
+            return make_response()
+        self.scraper.session.get.side_effect = slow_get
+
+        results = self.scraper.scrape_many([
+            'https://example.com/guide?utm_source=a', 'https://EXAMPLE.com/guide', 'https://example.com/other'
+        ])
+
+        self.assertEqual(self.scraper.session.get.call_count, 2)
+        self.assertEqual([result['title'] for result in results], ['SEO Guide'] * 3)
+
+    def test_failures_are_negatively_cached_until_expiry(self):
+        response = make_response(status_code=404, text='')
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+        self.scraper.session.get.return_value = response
+
+        self.scraper.scrape_content('https://example.com/missing')
+        skipped = self.scraper.scrape_content('https://example.com/missing')
+
+        self.assertEqual(self.scraper.session.get.call_count, 1)
+        self.assertTrue(skipped['failed'])
+        self.assertIn('Previously failed', skipped['error'])
+
+        self.cache.record_failure('https://example.com/missing', 'gone', 404, kind='not_found')
+        with self.cache._connect() as conn:
+            conn.execute("UPDATE scrape_failures SET expires_at = 0")
+        self.assertIsNone(self.cache.get_failure('https://example.com/missing'))
+
+    def test_retry_sets_user_agent_per_request(self):
+        self.scraper.session.headers = {'User-Agent': 'shared-agent'}
+        self.scraper.session.get.side_effect = [requests.exceptions.Timeout('read timeout'), make_response()]
+
+        with patch('src.utils.browser_content_scraper.time.sleep'):
+            result = self.scraper.scrape_content('https://example.com/slow')
+
+        self.assertEqual(result['title'], 'SEO Guide')
+        first, retry = self.scraper.session.get.call_args_list
+        self.assertNotIn('User-Agent', first.kwargs['headers'])
+        self.assertIn('User-Agent', retry.kwargs['headers'])
+        self.assertGreater(retry.kwargs['timeout'], first.kwargs['timeout'])
+        # The session shared by concurrent workers is left untouched
+        self.assertEqual(self.scraper.session.headers, {'User-Agent': 'shared-agent'})
+
+    def test_unreadable_entry_is_a_miss(self):
+        self.cache.set('https://example.com/seo', {'title': 'SEO'})
+        with self.cache._connect() as conn:
+            conn.execute("UPDATE scraped_pages SET result = 'not json'")
+
+        self.assertIsNone(self.cache.get('https://example.com/seo'))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_eviction_drops_least_recently_used_page(self):
+        self.cache.max_entries = 2
+        self.cache.set('https://example.com/a', {'title': 'A'})
+        time.sleep(0.01)
+        self.cache.set('https://example.com/b', {'title': 'B'})
+        time.sleep(0.01)
+        self.cache.get('https://example.com/a')  # Read, not revalidated
+        self.cache.set('https://example.com/c', {'title': 'C'})
+
+        self.assertIsNotNone(self.cache.get('https://example.com/a'))
+        self.assertIsNone(self.cache.get('https://example.com/b'))
+
+    def test_files_without_last_accessed_are_upgraded(self):
+        with self.cache._connect() as conn:
+            conn.execute("DROP TABLE scraped_pages")
+            conn.execute("""
+                CREATE TABLE scraped_pages (
+                    url_key TEXT PRIMARY KEY, url TEXT NOT NULL, result TEXT NOT NULL, content_hash TEXT,
+                    etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, validated_at REAL NOT NULL
+                )
+            """)
+
+        cache = PageCache(db_path=self.db_path, ttl=3600)
+        self.assertTrue(cache.enabled)
+        cache.set('https://example.com/seo', {'title': 'SEO'})
+        self.assertEqual(cache.get('https://example.com/seo')['result'], {'title': 'SEO'})
+
+
+if __name__ == '__main__':
+    unittest.main()
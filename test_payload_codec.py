@@ -0,0 +1,114 @@
+"""
+Unit tests for the blueprint payload codec.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models.blueprint import Blueprint, DatabaseManager
+from src.services.blueprint_storage import BlueprintStorageService
+from src.utils.payload_codec import PayloadCodec, PayloadDecodeError, is_encoded, train_dictionary, zstd_available
+
+PAYLOAD = {
+    'top_competitors': [{'url': f"https://example{i}.com/", 'title': 'Content Marketing Guide',
+                         'entities': ['content', 'marketing', 'seo'] * 10} for i in range(10)]
+}
+
+
+class PayloadCodecTestCase(unittest.TestCase):
+    """Tests for PayloadCodec encoding and decoding."""
+
+    def test_gzip_round_trip_is_tagged_and_smaller(self):
+        codec = PayloadCodec('gzip')
+        encoded = codec.encode(PAYLOAD)
+
+        self.assertTrue(is_encoded(encoded))
+        self.assertEqual(encoded['_codec'], 'gzip')
+        self.assertEqual(encoded['v'], 1)
+        self.assertLess(len(encoded['data']), len(str(PAYLOAD)) / 2)
+        self.assertEqual(codec.decode(encoded), PAYLOAD)
+
+    def test_plain_values_pass_through(self):
+        codec = PayloadCodec('gzip')
+        self.assertEqual(codec.decode(PAYLOAD), PAYLOAD)
+        self.assertIsNone(codec.encode(None))
+        self.assertEqual(PayloadCodec('none').encode(PAYLOAD), PAYLOAD)
+
+    def test_any_codec_decodes_other_encodings(self):
+        encoded = PayloadCodec('gzip').encode(PAYLOAD)
+        self.assertEqual(PayloadCodec('none').decode(encoded), PAYLOAD)
+
+    def test_zstd_fallback_uses_gzip_level(self):
+        with patch('src.utils.payload_codec.zstandard', None):
+            codec = PayloadCodec('zstd', level=19)
+
+        self.assertEqual((codec.algorithm, codec.level), ('gzip', 6))
+        self.assertEqual(codec.decode(codec.encode(PAYLOAD)), PAYLOAD)
+
+    @unittest.skipUnless(zstd_available(), 'zstandard not installed')
+    def test_zstd_dictionary_round_trip(self):
+        samples = [{'competitor': i, 'entities': ['content', 'marketing', str(i)]} for i in range(200)]
+        codec = PayloadCodec('zstd', dictionary=train_dictionary(samples, size=4096))
+        encoded = codec.encode(PAYLOAD)
+
+        self.assertEqual(encoded['dict'], codec.dictionary_id)
+        self.assertEqual(codec.decode(encoded), PAYLOAD)
+        with self.assertRaises(PayloadDecodeError):
+            PayloadCodec('zstd').decode(encoded)
+
+
+class PayloadStorageTestCase(unittest.TestCase):
+    """Tests for transparent payload encoding in BlueprintStorageService."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.db = DatabaseManager(f"sqlite:///{self.db_path}")
+        self.db.init_tables()
+        self.session = self.db.get_session()
+
+    def tearDown(self):
+        self.session.close()
+        self.db.close_engine()
+        os.remove(self.db_path)
+
+    def test_stored_payloads_are_compressed_and_read_back(self):
+        storage = BlueprintStorageService(self.session, codec=PayloadCodec('gzip'))
+        blueprint_id = storage.save_blueprint({
+            'keyword': 'content marketing',
+            'competitor_analysis': PAYLOAD,
+            'heading_structure': {'h1': 'Content Marketing'},
+            'topic_clusters': {'primary_cluster': ['content']}
+        }, 'user-1')
+
+        row = self.session.query(Blueprint.competitor_analysis).filter(Blueprint.id == blueprint_id).one()
+        self.assertTrue(is_encoded(row.competitor_analysis))
+
+        blueprint = storage.get_blueprint(blueprint_id, 'user-1')
+        self.assertEqual(blueprint['competitor_analysis'], PAYLOAD)
+        self.assertIsNone(blueprint['serp_features'])
+
+    def test_undecodable_payload_is_an_error_not_a_missing_blueprint(self):
+        storage = BlueprintStorageService(self.session, codec=PayloadCodec('gzip'))
+        blueprint_id = storage.save_blueprint({
+            'keyword': 'content marketing',
+            'competitor_analysis': PAYLOAD,
+            'heading_structure': {'h1': 'Content Marketing'},
+            'topic_clusters': {'primary_cluster': ['content']}
+        }, 'user-1')
+        self.session.query(Blueprint).filter(Blueprint.id == blueprint_id).update(
+            {'competitor_analysis': {'_codec': 'gzip', 'v': 1, 'data': 'bm90IGd6aXA='}})
+        self.session.commit()
+
+        with self.assertRaises(PayloadDecodeError):
+            storage.get_blueprint(blueprint_id, 'user-1')
+        self.assertIsNotNone(storage.get_blueprint(blueprint_id, 'user-1', sections=['heading_structure']))
+
+
+if __name__ == '__main__':
+    unittest.main()
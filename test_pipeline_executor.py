@@ -0,0 +1,70 @@
+"""
+Unit tests for the dependency-graph pipeline executor.
+"""
+
+import time
+import unittest
+
+from src.utils.pipeline_executor import PipelineExecutor, PipelineNode
+
+
+def slow(value, delay=0.2):
+    def fn(**inputs):
+        time.sleep(delay)
+        return value
+    return fn
+
+
+def fail(**inputs):
+    raise RuntimeError('boom')
+
+
+class PipelineExecutorTestCase(unittest.TestCase):
+    """Tests for PipelineExecutor."""
+
+    def test_independent_nodes_overlap(self):
+        pipeline = PipelineExecutor([
+            PipelineNode('a', slow(1)),
+            PipelineNode('b', slow(2)),
+            PipelineNode('sum', lambda a, b: a + b, inputs=('a', 'b'))
+        ])
+        start = time.monotonic()
+
+        result = pipeline.run()
+
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertEqual(result.values['sum'], 3)
+        self.assertEqual(set(result.timings), {'a', 'b', 'sum'})
+        self.assertEqual(result.degraded, [])
+
+    def test_failure_degrades_only_dependents(self):
+        result = PipelineExecutor([
+            PipelineNode('a', fail, fallback=lambda error: 0),
+            PipelineNode('b', fail),
+            PipelineNode('c', slow(5, 0)),
+            PipelineNode('from_a', lambda a: a + 1, inputs=('a',)),
+            PipelineNode('from_b', lambda b: b, inputs=('b',), fallback=lambda error: 'default'),
+            PipelineNode('from_c', lambda c: c * 2, inputs=('c',))
+        ]).run()
+
+        self.assertEqual(result.status, {
+            'a': 'failed', 'b': 'failed', 'c': 'completed',
+            'from_a': 'degraded', 'from_b': 'skipped', 'from_c': 'completed'
+        })
+        self.assertEqual(result.values['from_a'], 1)
+        self.assertEqual(result.values['from_b'], 'default')
+        self.assertEqual(result.values['from_c'], 10)
+        self.assertEqual(result.errors, {'a': 'boom', 'b': 'boom'})
+
+    def test_invalid_graphs_are_rejected(self):
+        with self.assertRaises(ValueError):
+            PipelineExecutor([PipelineNode('a', slow(1), inputs=('missing',))])
+        with self.assertRaises(ValueError):
+            PipelineExecutor([
+                PipelineNode('a', slow(1), inputs=('b',)),
+                PipelineNode('b', slow(1), inputs=('a',))
+            ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Unit tests for the token-bucket rate limiter.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+import multiprocessing
+from unittest.mock import patch
+
+from src.utils.rate_limiter import RateLimiter, RateLimit, SQLiteBackend
+
+
+def _take_tokens(db_path, count, results):
+    """Take tokens from a shared bucket in a separate process."""
+    limiter = RateLimiter({'api': RateLimit(rate=0.001, burst=5)}, SQLiteBackend(db_path))
+    results.put(sum(1 for _ in range(count) if limiter.try_acquire('api') == 0))
+
+
+class RateLimiterTestCase(unittest.TestCase):
+    """Tests for RateLimiter and its backends."""
+
+    def test_burst_then_sustained_rate(self):
+        limiter = RateLimiter({'api': RateLimit(rate=10, burst=3)})
+
+        self.assertEqual([limiter.try_acquire('api') for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(limiter.try_acquire('api'), 0.1, places=1)
+
+    def test_threads_share_one_quota(self):
+        limiter = RateLimiter({'api': RateLimit(rate=20, burst=1)})
+        start = time.monotonic()
+
+        threads = [threading.Thread(target=limiter.wait_if_needed, args=('api',)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # One token up front, then four more at 20 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+
+    def test_async_acquire_does_not_block_event_loop(self):
+        limiter = RateLimiter({'api': RateLimit(rate=10, burst=1)})
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        async def main():
+            await asyncio.gather(limiter.acquire('api'), limiter.acquire('api'), ticker())
+
+        asyncio.run(main())
+        self.assertEqual(len(ticks), 5)
+
+    def test_async_waiters_are_served_in_arrival_order(self):
+        limiter = RateLimiter({'api': RateLimit(rate=50, burst=1)})
+        order = []
+
+        async def waiter(index):
+            await limiter.acquire('api')
+            order.append(index)
+
+        async def main():
+            tasks = []
+            for index in range(5):
+                tasks.append(asyncio.ensure_future(waiter(index)))
+                await asyncio.sleep(0)
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        self.assertEqual(order, [0, 1, 2, 3, 4])
+
+    def test_async_acquire_timeout_while_queued(self):
+        limiter = RateLimiter({'api': RateLimit(rate=1, burst=1)})
+
+        async def main():
+            await limiter.acquire('api')
+            return await asyncio.gather(limiter.acquire('api', timeout=0.05), limiter.acquire('api', timeout=0.05))
+
+        self.assertEqual(asyncio.run(main()), [False, False])
+
+    def test_penalize_and_timeout(self):
+        limiter = RateLimiter({'api': RateLimit(rate=100, burst=5)})
+        limiter.penalize('api', 1.0)
+
+        self.assertFalse(limiter.wait_if_needed('api', timeout=0.1))
+        self.assertTrue(limiter.wait_if_needed('unknown'))
+
+    def test_invalid_quotas_are_rejected(self):
+        for rate, burst in ((0, 1), (-1, 1), (1, 0.5)):
+            with self.assertRaises(ValueError):
+                RateLimit(rate=rate, burst=burst)
+
+        limiter = RateLimiter({'api': RateLimit(rate=10, burst=3)})
+        with self.assertRaises(ValueError):
+            limiter.configure('api', rate=0)
+        with self.assertRaises(ValueError):
+            limiter.set_rate_limit('api', 0)
+        with self.assertRaises(ValueError):
+            limiter.try_acquire('api', tokens=4)  # Could never be satisfied
+        with self.assertRaises(ValueError):
+            limiter.wait_if_needed('api', tokens=4)
+
+    def test_invalid_env_quota_falls_back_to_default(self):
+        from src.utils import rate_limiter
+
+        with patch.dict(os.environ, {'RATE_LIMIT_SERPAPI_RPS': '0', 'RATE_LIMIT_GEMINI_BURST': 'lots'}):
+            limits = rate_limiter._limits_from_env()
+
+        self.assertEqual(limits['serpapi'], rate_limiter.DEFAULT_LIMITS['serpapi'])
+        self.assertEqual(limits['gemini'], rate_limiter.DEFAULT_LIMITS['gemini'])
+
+    def test_one_limiter_across_import_paths(self):
+        # The legacy modules are also imported with src/ on sys.path (routes/api.py, app_enhanced.py)
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+        self.addCleanup(sys.path.remove, sys.path[0])
+        import serp_collector
+        import src.serp_collector
+        from src.utils import rate_limiter
+
+        self.assertNotIn('utils.rate_limiter', sys.modules)
+        self.assertIs(serp_collector.get_rate_limiter(), rate_limiter.get_rate_limiter())
+        self.assertIs(src.serp_collector.get_rate_limiter(), rate_limiter.get_rate_limiter())
+
+    def test_sqlite_backend_shares_quota_between_processes(self):
+        fd, db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        try:
+            SQLiteBackend(db_path)
+            results = multiprocessing.Queue()
+            processes = [
+                multiprocessing.Process(target=_take_tokens, args=(db_path, 5, results)) for _ in range(3)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+            # Only the burst of 5 tokens is available across all processes
+            self.assertEqual(sum(results.get() for _ in processes), 5)
+        finally:
+            os.remove(db_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,7 +13,8 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Add src directory to path
+# Add src directory to path (and the repo root, for src.utils)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 print("🔄 Testing Real Data Integration Migration")
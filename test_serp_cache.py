@@ -0,0 +1,97 @@
+"""
+Unit tests for the disk-backed SERP response cache.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.utils.serp_cache import SerpCache
+
+
+class SerpCacheTestCase(unittest.TestCase):
+    """Tests for SerpCache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = SerpCache(db_path=os.path.join(self.temp_dir, 'serp_cache.db'), ttl=60, max_entries=3)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_miss_then_hit(self):
+        """A stored payload is returned for the same normalized query."""
+        self.assertIsNone(self.cache.get('content marketing', 'United States'))
+
+        self.cache.set('content marketing', {'organic_results': [{'link': 'https://a.com'}]}, 'United States')
+        cached = self.cache.get('  Content   Marketing ', 'united states')
+
+        self.assertEqual(cached['organic_results'][0]['link'], 'https://a.com')
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_extra_params_are_part_of_key(self):
+        """Requests with different result counts don't share entries."""
+        self.cache.set('seo', {'organic_results': []}, None, 'google', num=10)
+        self.assertIsNone(self.cache.get('seo', None, 'google', num=20))
+        self.assertIsNotNone(self.cache.get('seo', None, 'google', num=10))
+
+    def test_expired_entries_are_ignored(self):
+        """Entries older than the TTL are treated as misses."""
+        self.cache.ttl = 0.05
+        self.cache.set('seo', {'organic_results': []})
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get('seo'))
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted past max_entries."""
+        for query in ['a', 'b', 'c']:
+            self.cache.set(query, {'q': query})
+            time.sleep(0.01)
+
+        self.cache.get('a')  # Touch 'a' so 'b' becomes the oldest
+        time.sleep(0.01)
+        self.cache.set('d', {'q': 'd'})
+
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertEqual(self.cache.stats()['entries'], 3)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_error_payloads_are_not_cached(self):
+        """SerpAPI error responses are never stored."""
+        self.cache.set('seo', {'error': 'Invalid API key'})
+        self.assertIsNone(self.cache.get('seo'))
+
+    def test_invalidate(self):
+        """Invalidated entries are refetched."""
+        self.cache.set('seo', {'organic_results': []})
+        self.cache.invalidate('seo')
+        self.assertIsNone(self.cache.get('seo'))
+
+    def test_relative_paths_live_in_data_dir(self):
+        """Cache files default to DATA_DIR rather than the working directory."""
+        data_dir = os.path.join(self.temp_dir, 'data')
+        with mock.patch.dict(os.environ, {'DATA_DIR': data_dir, 'SERP_CACHE_TTL': '120', 'SERP_CACHE_ENABLED': 'true'}):
+            cache = SerpCache.from_env('SERP_CACHE', 'serp_cache.db', 60, 10)
+
+        self.assertEqual(cache.db_path, os.path.join(data_dir, 'serp_cache.db'))
+        self.assertTrue(os.path.exists(cache.db_path))
+        self.assertEqual(cache.ttl, 120)
+
+    def test_unusable_path_disables_cache(self):
+        """A cache whose file cannot be created turns itself off instead of failing."""
+        blocker = os.path.join(self.temp_dir, 'not_a_dir')
+        open(blocker, 'w').close()
+
+        cache = SerpCache(db_path=os.path.join(blocker, 'serp_cache.db'))
+        self.assertFalse(cache.enabled)
+        self.assertIsNone(cache.get('seo'))
+        self.assertEqual(cache.stats()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Unit tests for concurrent SERP collection in SerpCollector.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import serp_collector
+from serp_collector import SerpCollector
+from src.utils.rate_limiter import RateLimiter, RateLimit
+from src.utils.serp_cache import SerpCache
+
+
+class FakeSearch:
+    """Stand-in for GoogleSearch with a fixed latency per query."""
+
+    delays = {}
+
+    def __init__(self, params):
+        self.query = params['q']
+
+    def get_dict(self):
+        time.sleep(self.delays.get(self.query, 0.1))
+        return {"organic_results": [{"position": 1, "link": f"https://{self.query}.com/", "title": self.query}]}
+
+
+class SerpCollectorTestCase(unittest.TestCase):
+    """Tests for SerpCollector.collect_serp_data."""
+
+    def setUp(self):
+        patcher = patch.object(serp_collector, 'GoogleSearch', FakeSearch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with patch.dict(os.environ, {'SERPAPI_API_KEY': 'test'}):
+            self.collector = SerpCollector(
+                cache=SerpCache(enabled=False),
+                rate_limiter=RateLimiter({'serpapi': RateLimit(rate=100, burst=100)}),
+                concurrency=4,
+                keyword_timeout=0.5
+            )
+        FakeSearch.delays = {}
+
+    def test_keywords_are_collected_concurrently(self):
+        keywords = [f"kw{i}" for i in range(8)]
+        start = time.monotonic()
+
+        results = asyncio.run(self.collector.collect_serp_data(keywords))
+
+        # Eight 0.1s calls, four at a time
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertEqual(results["top_urls"], [f"https://kw{i}.com/" for i in range(8)])
+
+    def test_timeout_only_empties_slow_keyword(self):
+        FakeSearch.delays = {'slow': 2}
+        results = {}
+
+        async def main():
+            results.update(self.collector._create_empty_results_structure(['fast', 'slow']))
+            task = asyncio.ensure_future(self.collector.collect_serp_data(['slow', 'fast'], results=results))
+            await asyncio.sleep(0.3)
+            # The fast keyword is visible before the batch finishes
+            self.assertEqual(len(results["serp_data"].get('fast', [])), 1)
+            await task
+
+        asyncio.run(main())
+        self.assertEqual(results["serp_data"]['slow'], [])
+        self.assertEqual(results["top_urls"], ["https://fast.com/"])
+
+
+if __name__ == '__main__':
+    unittest.main()
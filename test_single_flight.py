@@ -0,0 +1,97 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+
+import time
+import threading
+import unittest
+
+from src.utils.single_flight import SingleFlight
+
+
+class SingleFlightTestCase(unittest.TestCase):
+    """Tests for SingleFlight."""
+
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.calls = 0
+
+    def _slow(self, value, error=None):
+        def fn(report):
+            self.calls += 1
+            report('progress', 'working', 50)
+            time.sleep(0.2)
+            if error:
+                raise error
+            return value
+        return fn
+
+    def _run_concurrently(self, key, fn, count, progress=None):
+        outcomes = [None] * count
+
+        def worker(index):
+            try:
+                callback = (lambda *event: progress.append((index,) + event)) if progress is not None else None
+                outcomes[index] = self.flight.do(key, fn, callback)
+            except Exception as e:
+                outcomes[index] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.01)
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_concurrent_callers_share_one_call(self):
+        progress = []
+        outcomes = self._run_concurrently('seo tips', self._slow('blueprint'), 4, progress)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(sorted(outcomes), [('blueprint', False)] + [('blueprint', True)] * 3)
+        # Every caller saw the leader's events, late joiners by replay
+        self.assertEqual(sorted(progress), [(index, 'progress', 'working', 50) for index in range(4)])
+        self.assertEqual(self.flight.in_flight(), 0)
+
+    def test_late_joiner_gets_replay_before_live_events(self):
+        joinable, replaying, live_sent = threading.Event(), threading.Event(), threading.Event()
+        seen = []
+
+        def fn(report):
+            report('a')
+            report('b')
+            joinable.set()
+            replaying.wait(5)
+            report('c')  # Emitted while the joiner is still replaying 'a'
+            live_sent.set()
+            return 'done'
+
+        def listener(event):
+            seen.append(event)
+            if event == 'a':
+                replaying.set()
+                live_sent.wait(1)
+
+        leader = threading.Thread(target=self.flight.do, args=('seo tips', fn))
+        leader.start()
+        joinable.wait(5)
+        self.assertEqual(self.flight.do('seo tips', fn, listener), ('done', True))
+        leader.join()
+
+        self.assertEqual(seen, ['a', 'b', 'c'])
+
+    def test_errors_reach_every_caller_and_are_not_remembered(self):
+        outcomes = self._run_concurrently('seo tips', self._slow(None, ValueError('boom')), 3)
+
+        self.assertTrue(all(isinstance(outcome, ValueError) for outcome in outcomes))
+        self.assertEqual(self.flight.do('seo tips', lambda report: 'retry'), ('retry', False))
+
+    def test_different_keys_run_separately(self):
+        self._run_concurrently('a', self._slow(1), 1)
+        self._run_concurrently('b', self._slow(2), 1)
+        self.assertEqual(self.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
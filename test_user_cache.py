@@ -0,0 +1,114 @@
+"""
+Unit tests for cached user lookups in token_required.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models.user import User, db
+from src.routes.auth import auth_bp
+from src.utils import auth
+from src.utils.user_cache import UserCache
+
+PASSWORD = 'Secret-pass1'
+
+
+class UserCacheTestCase(unittest.TestCase):
+    """Tests for UserCache and its use by token_required and the auth routes."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.app = Flask(__name__)
+        self.app.config.update(SQLALCHEMY_DATABASE_URI=f"sqlite:///{self.db_path}", JWT_SECRET_KEY='test')
+        db.init_app(self.app)
+        self.app.register_blueprint(auth_bp)
+
+        self.cache = UserCache(ttl=60)
+        patcher = patch.object(auth, 'get_user_cache', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with self.app.app_context():
+            db.create_all()
+            user = User(username='ada', email='ada@example.com')
+            user.set_password(PASSWORD)
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+            self.token = auth.TokenManager.generate_access_token(user.id)
+
+            self.user_queries = []
+            listener = lambda conn, cursor, statement, *args: self.user_queries.append(statement) \
+                if 'FROM users' in statement else None
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            self.addCleanup(event.remove, db.engine, 'before_cursor_execute', listener)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.engine.dispose()
+        os.remove(self.db_path)
+
+    def _me(self):
+        return self.client.get('/api/auth/me', headers={'Authorization': f"Bearer {self.token}"})
+
+    def test_cache_versions_ttl_and_size(self):
+        cache = UserCache(ttl=60, max_entries=2)
+        version = cache.version(1)
+        cache.invalidate(1)
+        cache.set(1, version, {'id': 1})  # Loaded before the invalidation
+        self.assertIsNone(cache.get(1, cache.version(1)))
+
+        for user_id in (1, 2, 3):
+            cache.set(user_id, cache.version(user_id), {'id': user_id})
+        self.assertIsNone(cache.get(1, cache.version(1)))
+        self.assertEqual(cache.get(3, cache.version(3)), {'id': 3})
+
+        cache.ttl = 0
+        self.assertIsNone(cache.get(3, cache.version(3)))
+
+    def test_steady_state_makes_no_identity_queries(self):
+        self.assertEqual(self._me().status_code, 200)
+        self.assertEqual(len(self.user_queries), 1)
+
+        for _ in range(3):
+            self.assertEqual(self._me().get_json()['user']['username'], 'ada')
+        self.assertEqual(len(self.user_queries), 1)
+
+    def test_profile_and_password_changes_invalidate(self):
+        headers = {'Authorization': f"Bearer {self.token}"}
+        self._me()
+        response = self.client.put('/api/auth/me', json={'first_name': 'Ada'}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._me().get_json()['user']['first_name'], 'Ada')
+
+        response = self.client.post('/api/auth/change-password', headers=headers,
+                                    json={'current_password': PASSWORD, 'new_password': 'Newer-pass2'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post('/api/auth/change-password', headers=headers,
+                                    json={'current_password': PASSWORD, 'new_password': 'Other-pass3'})
+        self.assertEqual(response.status_code, 401)  # Checked against the new hash, not a cached one
+
+    def test_deactivation_and_logout_invalidate(self):
+        self._me()
+        self.client.post('/api/auth/logout', headers={'Authorization': f"Bearer {self.token}"})
+        queries = len(self.user_queries)
+        self._me()
+        self.assertEqual(len(self.user_queries), queries + 1)
+
+        with self.app.app_context():
+            db.session.get(User, self.user_id).deactivate()
+        self.assertEqual(self._me().get_json()['code'], 'ACCOUNT_DEACTIVATED')
+
+
+if __name__ == '__main__':
+    unittest.main()
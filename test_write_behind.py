@@ -0,0 +1,127 @@
+"""
+Unit tests for the SQLite performance profile and the write-behind queue.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.models.blueprint import Blueprint, DatabaseManager, UserBlueprintStats
+from src.models.user import User
+from src.services.blueprint_storage import BlueprintStorageService
+from src.services.write_behind import WriteBehindQueue
+
+
+class WriteBehindTestCase(unittest.TestCase):
+    """Tests for create_database_engine pragmas and WriteBehindQueue."""
+
+    def setUp(self):
+        # Blueprint tables only (as init_tables creates them); users live in their own database
+        fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.db = DatabaseManager(f"sqlite:///{self.db_path}")
+        self.db.init_tables()
+        fd, self.users_path = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        self.users_engine = create_engine(f"sqlite:///{self.users_path}")
+        User.__table__.create(bind=self.users_engine)
+        self.users_session_factory = sessionmaker(bind=self.users_engine)
+
+        self.session = self.db.get_session()
+        self.storage = BlueprintStorageService(self.session)
+        self.blueprint_ids = self.storage.create_pending_blueprints(['seo', 'ppc', 'email'], 'user-1')
+        self.users_session = self.users_session_factory()
+        self.users_session.execute(User.__table__.insert(), [
+            {'id': 1, 'username': 'ada', 'email': 'ada@example.com', 'password_hash': 'x',
+             'is_active': True, 'is_verified': False, 'subscription_tier': 'free',
+             'api_calls_used': 0, 'api_calls_limit': 100}
+        ])
+        self.users_session.commit()
+
+        self.queue = WriteBehindQueue(self.db.get_session, self.users_session_factory, flush_interval=0.05)
+        self.statements = []
+        listener = lambda conn, cursor, statement, *args: self.statements.append(statement)
+        event.listen(self.users_engine, 'before_cursor_execute', listener)
+        self.addCleanup(event.remove, self.users_engine, 'before_cursor_execute', listener)
+        self.commits = []
+        on_commit = lambda conn: self.commits.append(conn.engine)
+        for engine in (self.db.engine, self.users_engine):
+            event.listen(engine, 'commit', on_commit)
+            self.addCleanup(event.remove, engine, 'commit', on_commit)
+
+    def tearDown(self):
+        self.queue.close()
+        self.session.close()
+        self.users_session.close()
+        self.db.close_engine()
+        self.users_engine.dispose()
+        for path in (self.db_path, self.users_path):
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+    def test_sqlite_profile_pragmas(self):
+        with self.db.engine.connect() as connection:
+            self.assertEqual(connection.execute(text('PRAGMA journal_mode')).scalar(), 'wal')
+            self.assertEqual(connection.execute(text('PRAGMA synchronous')).scalar(), 1)  # NORMAL
+            self.assertEqual(connection.execute(text('PRAGMA busy_timeout')).scalar(), 5000)
+
+    def test_writes_coalesce_into_one_transaction_per_database(self):
+        first, second, third = self.blueprint_ids
+        self.queue.update_blueprint_status(first, 'user-1', 'failed')
+        self.queue.update_blueprint_status(first, 'user-1', 'completed')  # Last status wins
+        self.queue.update_blueprint_status(second, 'user-1', 'failed')
+        self.queue.update_blueprint_status(third, 'intruder', 'failed')  # Not the owner
+        for _ in range(5):
+            self.queue.increment_api_usage(1)
+
+        self.assertTrue(self.queue.flush(timeout=5))
+        self.assertEqual(self.queue.pending(), 0)
+        self.assertEqual(self.commits.count(self.db.engine), 1)
+        self.assertEqual(self.commits.count(self.users_engine), 1)
+        self.assertEqual(sum(statement.startswith('UPDATE users') for statement in self.statements), 1)
+
+        self.session.expire_all()
+        statuses = dict(self.session.query(Blueprint.id, Blueprint.status))
+        self.assertEqual([statuses[i] for i in self.blueprint_ids], ['completed', 'failed', 'generating'])
+        self.assertEqual(self.users_session.get(User, 1).api_calls_used, 5)
+        self.assertEqual(self.session.get(UserBlueprintStats, 'user-1').completed_blueprints, 1)
+
+    def test_failing_usage_writes_never_drop_statuses(self):
+        # Usage counters pointed at the blueprint database, which has no users table
+        self.queue.close()
+        self.queue = WriteBehindQueue(self.db.get_session, self.db.get_session, flush_interval=0.01, max_retries=2)
+        self.queue.update_blueprint_status(self.blueprint_ids[0], 'user-1', 'completed')
+        self.queue.increment_api_usage(1)
+
+        with self.assertLogs('src.services.write_behind', level='ERROR'):
+            self.assertTrue(self.queue.flush(timeout=5))
+
+        self.session.expire_all()
+        self.assertEqual(self.session.get(Blueprint, self.blueprint_ids[0]).status, 'completed')
+        self.assertEqual(self.queue.pending(), 0)
+
+    def test_usage_needs_a_users_database(self):
+        queue = WriteBehindQueue(self.db.get_session)
+        self.addCleanup(queue.close)
+        self.assertFalse(queue.accepts_usage)
+        with self.assertRaises(RuntimeError):
+            queue.increment_api_usage(1)
+
+    def test_close_flushes_pending_writes(self):
+        self.queue.flush_interval = 60
+        self.queue.increment_api_usage(1, amount=3)
+        self.queue.close(timeout=5)
+
+        self.users_session.expire_all()
+        self.assertEqual(self.users_session.get(User, 1).api_calls_used, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()